@@ -0,0 +1,105 @@
+"""Benchmark of the Hitnet stereo matcher throughput for each bundled model
+and a set of execution provider and session configurations."""
+
+import time
+
+from argparse import ArgumentParser
+from pathlib import Path
+
+import numpy as np
+
+from mynd.geometry import HitnetSessionConfig, create_hitnet_batch_matcher
+from mynd.image import Image, PixelFormat
+from mynd.utils.containers import Pair
+
+
+MODEL_DIRECTORY: Path = (
+    Path(__file__).parents[2] / "resources" / "hitnet_models"
+)
+
+
+def create_session_configs(
+    providers: list[str], threads: list[int]
+) -> dict[str, HitnetSessionConfig]:
+    """Creates the session configurations to benchmark, keyed by label."""
+
+    configs: dict[str, HitnetSessionConfig] = dict()
+    for provider in providers:
+        if provider != "cpu":
+            configs[provider] = HitnetSessionConfig(provider=provider)
+            continue
+
+        for count in threads:
+            configs[f"cpu-{count or 'default'}"] = HitnetSessionConfig(
+                provider="cpu", intra_op_threads=count
+            )
+
+    return configs
+
+
+def create_stereo_pairs(
+    count: int, height: int, width: int, seed: int = 0
+) -> list[Pair[Image]]:
+    """Creates random stereo pairs with the given image size."""
+
+    generator: np.random.Generator = np.random.default_rng(seed)
+    return [
+        Pair(
+            *[
+                Image.from_array(
+                    generator.integers(
+                        0, 256, size=(height, width, 3), dtype=np.uint8
+                    ),
+                    PixelFormat.RGB,
+                )
+                for _ in range(2)
+            ]
+        )
+        for _ in range(count)
+    ]
+
+
+def main():
+    """Runs the Hitnet throughput benchmark."""
+    parser = ArgumentParser(
+        description="benchmarks the Hitnet stereo matcher throughput",
+    )
+    parser.add_argument("--models", type=Path, default=MODEL_DIRECTORY)
+    parser.add_argument("--providers", nargs="+", default=["cpu"])
+    parser.add_argument("--threads", type=int, nargs="+", default=[0])
+    parser.add_argument("--pairs", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--height", type=int, default=1024)
+    parser.add_argument("--width", type=int, default=1360)
+    arguments = parser.parse_args()
+
+    pairs: list[Pair[Image]] = create_stereo_pairs(
+        arguments.pairs, arguments.height, arguments.width
+    )
+    configs: dict[str, HitnetSessionConfig] = create_session_configs(
+        arguments.providers, arguments.threads
+    )
+
+    for path in sorted(arguments.models.glob("*.onnx")):
+        for label, config in configs.items():
+            start: float = time.perf_counter()
+            matcher = create_hitnet_batch_matcher(path, config)
+            load_seconds: float = time.perf_counter() - start
+
+            for _ in range(arguments.warmup):
+                matcher(pairs[:1])
+
+            start: float = time.perf_counter()
+            matcher(pairs)
+            seconds: float = time.perf_counter() - start
+
+            print(
+                f"{path.stem:>24} {label:>12}:",
+                f"{len(pairs) / seconds:8.2f} pairs/s,",
+                f"{1000.0 * seconds / len(pairs):8.1f} ms/pair,",
+                f"{load_seconds:6.2f} s load",
+            )
+
+
+if __name__ == "__main__":
+    main()
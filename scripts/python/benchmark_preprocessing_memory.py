@@ -0,0 +1,124 @@
+"""Benchmark of the peak memory of point cloud preprocessing and RANSAC
+registration, comparing the zero-copy path with the legacy copying path."""
+
+import copy
+import multiprocessing
+import resource
+
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+
+import open3d
+import numpy as np
+
+from mynd.registration.feature_registrators import (
+    create_correspondence_validators,
+    create_fpfh_extractor,
+    create_point_to_point_estimator,
+    create_ransac_convergence_criteria,
+    register_features_ransac,
+)
+from mynd.registration.pipeline_builder import build_point_cloud_processor
+
+
+PREPROCESSOR: dict = {
+    "downsample": {"spacing": 0.10},
+    "estimate_normals": {"radius": 0.10, "neighbours": 30},
+}
+
+
+def create_cloud(count: int, seed: int = 0) -> open3d.geometry.PointCloud:
+    """Creates a random colored point cloud on a wavy surface."""
+    generator = np.random.default_rng(seed)
+    points: np.ndarray = generator.uniform(0.0, 20.0, size=(count, 3))
+    points[:, 2] = np.sin(points[:, 0]) + np.cos(points[:, 1])
+
+    cloud = open3d.geometry.PointCloud(open3d.utility.Vector3dVector(points))
+    cloud.colors = open3d.utility.Vector3dVector(generator.random((count, 3)))
+    return cloud
+
+
+def preprocess_copying(cloud: open3d.geometry.PointCloud):
+    """Preprocesses a point cloud the way the legacy processors did, with a
+    deep copy before every stage."""
+    downsampled = copy.deepcopy(cloud).voxel_down_sample(voxel_size=0.10)
+    estimated = copy.deepcopy(downsampled)
+    estimated.estimate_normals()
+    return estimated
+
+
+def register_copying(source, target, **arguments):
+    """Registers with RANSAC after deep copying the point clouds, the way the
+    legacy registrator did."""
+    return register_features_ransac(
+        copy.deepcopy(source), copy.deepcopy(target), **arguments
+    )
+
+
+def peak_memory_megabytes() -> float:
+    """Returns the peak resident set size of the process in megabytes."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(mode: str, count: int) -> tuple[float, float]:
+    """Measures the peak memory of preprocessing and registration in a fresh
+    process, relative to the peak after creating the input point clouds."""
+
+    source = create_cloud(count, seed=0)
+    target = create_cloud(count, seed=1)
+    baseline: float = peak_memory_megabytes()
+
+    if mode == "copy":
+        preprocessor = preprocess_copying
+        registrator = register_copying
+    else:
+        preprocessor = build_point_cloud_processor(PREPROCESSOR)
+        registrator = register_features_ransac
+
+    source_pre = preprocessor(source)
+    target_pre = preprocessor(target)
+    preprocessed: float = peak_memory_megabytes()
+
+    registrator(
+        source_pre,
+        target_pre,
+        feature_extractor=create_fpfh_extractor(radius=0.5, neighbours=50),
+        estimation_method=create_point_to_point_estimator(),
+        validators=create_correspondence_validators(distance_threshold=0.1),
+        convergence_criteria=create_ransac_convergence_criteria(
+            max_iteration=1000, confidence=0.99
+        ),
+        distance_threshold=0.1,
+    )
+    registered: float = peak_memory_megabytes()
+
+    return preprocessed - baseline, registered - baseline
+
+
+def main():
+    """Runs the preprocessing memory benchmark."""
+    parser = ArgumentParser(
+        description="benchmarks the peak memory of point cloud preprocessing",
+    )
+    parser.add_argument("--points", type=int, nargs="+", default=[1000000])
+    arguments = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+
+    print(f"{'points':>10} {'mode':>10} {'preprocess MB':>14} {'peak MB':>10}")
+    for count in arguments.points:
+        for mode in ["copy", "zero-copy"]:
+            # NOTE: Each measurement runs in a fresh process, since the peak
+            # resident set size can not be reset within a process
+            with ProcessPoolExecutor(1, mp_context=context) as executor:
+                preprocessed, registered = executor.submit(
+                    measure, mode, count
+                ).result()
+
+            print(
+                f"{count:>10} {mode:>10}",
+                f"{preprocessed:>14.1f} {registered:>10.1f}",
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+"""Benchmark suite for the registration pipelines. Registers synthetic point
+clouds with known transformations at several sizes, or a recorded pair of
+point clouds, with each pipeline configuration and writes a JSON report with
+the wall time, peak memory and transformation error of every stage."""
+
+import json
+import multiprocessing
+import platform
+import resource
+import subprocess
+import time
+
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+import open3d
+
+# NOTE: Some report memory bugs if numpy is import before open3d
+import numpy as np
+
+from mynd.io import read_config, read_point_cloud
+from mynd.registration import (
+    RegistrationPipeline,
+    RegistrationResult,
+    apply_registration_pipeline,
+    build_registration_pipeline,
+)
+
+
+CONFIGS: list[Path] = [
+    Path("config/register_fast.toml"),
+    Path("config/register_lowres.toml"),
+    Path("config/register_highres.toml"),
+]
+
+POINT_COUNTS: list[int] = [100_000, 1_000_000, 5_000_000, 20_000_000]
+
+# Synthetic survey area in meters, where the target covers the first part and
+# the source the last part of the area along the x-axis
+AREA: tuple[float, float] = (60.0, 30.0)
+TARGET_SPAN: tuple[float, float] = (0.0, 40.0)
+SOURCE_SPAN: tuple[float, float] = (15.0, 55.0)
+
+
+def create_terrain(
+    generator: np.random.Generator, bumps: int = 40
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Creates the parameters of a random terrain, i.e. gaussian bumps on top
+    of a wavy seabed."""
+    centers: np.ndarray = generator.uniform((0.0, 0.0), AREA, size=(bumps, 2))
+    heights: np.ndarray = generator.uniform(-1.0, 1.0, size=bumps)
+    widths: np.ndarray = generator.uniform(0.5, 3.0, size=bumps)
+    return centers, heights, widths
+
+
+def sample_terrain(
+    terrain: tuple[np.ndarray, np.ndarray, np.ndarray],
+    span: tuple[float, float],
+    count: int,
+    generator: np.random.Generator,
+    noise: float = 0.005,
+) -> open3d.geometry.PointCloud:
+    """Samples a colored point cloud from a terrain within a span along the
+    x-axis. The terrain is evaluated in chunks to bound the memory usage."""
+
+    centers, heights, widths = terrain
+
+    points: np.ndarray = np.empty((count, 3))
+    points[:, 0] = generator.uniform(*span, size=count)
+    points[:, 1] = generator.uniform(0.0, AREA[1], size=count)
+
+    for start in range(0, count, 1_000_000):
+        chunk: np.ndarray = points[start : start + 1_000_000]
+        x, y = chunk[:, 0], chunk[:, 1]
+
+        z: np.ndarray = 0.3 * np.sin(0.4 * x) * np.cos(0.3 * y)
+        for center, height, width in zip(centers, heights, widths):
+            squared: np.ndarray = (x - center[0]) ** 2 + (y - center[1]) ** 2
+            z += height * np.exp(-squared / (2.0 * width**2))
+
+        chunk[:, 2] = z + generator.normal(0.0, noise, size=len(chunk))
+
+    shades: np.ndarray = 0.5 + 0.5 * np.sin(2.0 * points[:, :2]).prod(axis=1)
+    colors: np.ndarray = np.stack(
+        [shades, 0.5 * shades + 0.25, 1.0 - shades], axis=1
+    )
+
+    cloud = open3d.geometry.PointCloud(open3d.utility.Vector3dVector(points))
+    cloud.colors = open3d.utility.Vector3dVector(colors)
+    return cloud
+
+
+def create_transformation(generator: np.random.Generator) -> np.ndarray:
+    """Creates a random rigid transformation with a moderate rotation."""
+
+    angles: np.ndarray = generator.uniform(-10.0, 10.0, size=3)
+    transformation: np.ndarray = np.identity(4)
+    transformation[:3, :3] = open3d.geometry.get_rotation_matrix_from_xyz(
+        np.radians(angles)
+    )
+    transformation[:3, 3] = generator.uniform(-2.0, 2.0, size=3)
+    return transformation
+
+
+def create_synthetic_pair(
+    count: int, seed: int
+) -> tuple[open3d.geometry.PointCloud, open3d.geometry.PointCloud, np.ndarray]:
+    """Creates a source and target point cloud of a terrain, where the source
+    is moved by a random transformation. Returns the source, the target, and
+    the transformation that registers the source to the target."""
+
+    generator = np.random.default_rng(seed)
+    terrain: tuple = create_terrain(generator)
+
+    target = sample_terrain(terrain, TARGET_SPAN, count, generator)
+    source = sample_terrain(terrain, SOURCE_SPAN, count, generator)
+
+    transformation: np.ndarray = create_transformation(generator)
+    source.transform(np.linalg.inv(transformation))
+
+    return source, target, transformation
+
+
+def peak_memory_megabytes() -> float:
+    """Returns the peak resident set size of the process in megabytes."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def compute_transformation_error(
+    estimate: np.ndarray, reference: np.ndarray | None
+) -> dict:
+    """Computes the translation and rotation error of an estimated
+    transformation with respect to a reference transformation."""
+
+    if reference is None:
+        return {"translation_error": None, "rotation_error_deg": None}
+
+    difference: np.ndarray = np.linalg.inv(reference) @ estimate
+    cosine: float = np.clip((np.trace(difference[:3, :3]) - 1.0) / 2.0, -1, 1)
+
+    return {
+        "translation_error": float(np.linalg.norm(difference[:3, 3])),
+        "rotation_error_deg": float(np.degrees(np.arccos(cosine))),
+    }
+
+
+def run_benchmark(
+    config_path: Path,
+    count: int | None,
+    seed: int,
+    recorded: tuple[Path, Path] | None = None,
+    reference: Path | None = None,
+) -> dict:
+    """Runs a single benchmark in a fresh process and returns its record."""
+
+    config: dict = read_config(config_path).unwrap().get("registration")
+    pipeline: RegistrationPipeline = build_registration_pipeline(config)
+
+    stage_names: list[str] = [config.get("aligner").get("name")] + [
+        refiner.get("name") for refiner in config.get("refiner", list())
+    ]
+
+    start: float = time.perf_counter()
+    if recorded is None:
+        source, target, transformation = create_synthetic_pair(count, seed)
+    else:
+        source = read_point_cloud(recorded[0]).unwrap()
+        target = read_point_cloud(recorded[1]).unwrap()
+        transformation = None if reference is None else np.loadtxt(reference)
+
+    record: dict = {
+        "config": str(config_path),
+        "source_points": len(source.points),
+        "target_points": len(target.points),
+        "seed": seed if recorded is None else None,
+        "input_seconds": time.perf_counter() - start,
+        "input_peak_rss_mb": peak_memory_megabytes(),
+        "stages": list(),
+    }
+
+    stage_start: float = time.perf_counter()
+
+    def stage_callback(
+        source: open3d.geometry.PointCloud,
+        target: open3d.geometry.PointCloud,
+        result: RegistrationResult,
+    ) -> None:
+        """Records the statistics of a pipeline stage."""
+        nonlocal stage_start
+        now: float = time.perf_counter()
+
+        position: int = len(record["stages"])
+        record["stages"].append(
+            {
+                "name": stage_names[position],
+                "seconds": now - stage_start,
+                "peak_rss_mb": peak_memory_megabytes(),
+                "source_points": len(source.points),
+                "target_points": len(target.points),
+                "fitness": result.fitness,
+                "inlier_rmse": result.inlier_rmse,
+                **compute_transformation_error(
+                    result.transformation, transformation
+                ),
+            }
+        )
+        stage_start = now
+
+    start: float = time.perf_counter()
+    result: RegistrationResult = apply_registration_pipeline(
+        pipeline, source=source, target=target, callback=stage_callback
+    )
+
+    record["seconds"] = time.perf_counter() - start
+    record["peak_rss_mb"] = peak_memory_megabytes()
+    record.update(
+        compute_transformation_error(result.transformation, transformation)
+    )
+    return record
+
+
+def create_metadata() -> dict:
+    """Creates the metadata of a benchmark report."""
+
+    try:
+        revision: str | None = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision: str | None = None
+
+    return {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "revision": revision,
+        "python": platform.python_version(),
+        "open3d": open3d.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": multiprocessing.cpu_count(),
+    }
+
+
+def compare_reports(report: dict, baseline: dict) -> None:
+    """Prints the relative change of the wall time and peak memory of each run
+    with respect to a baseline report."""
+
+    def run_key(run: dict) -> tuple:
+        return run.get("config"), run.get("source_points"), run.get("seed")
+
+    baseline_runs: dict = {run_key(run): run for run in baseline.get("runs")}
+
+    print()
+    print(f"{'config':>32} {'points':>10} {'time':>8} {'memory':>8}")
+    for run in report.get("runs"):
+        previous: dict | None = baseline_runs.get(run_key(run))
+        if previous is None or "error" in run or "error" in previous:
+            continue
+
+        time_ratio: float = run.get("seconds") / previous.get("seconds")
+        memory_ratio: float = run.get("peak_rss_mb") / previous.get(
+            "peak_rss_mb"
+        )
+        print(
+            f"{run.get('config'):>32} {run.get('source_points'):>10}",
+            f"{time_ratio:>7.2f}x {memory_ratio:>7.2f}x",
+        )
+
+
+def main():
+    """Runs the registration benchmark suite."""
+    parser = ArgumentParser(description="benchmarks registration pipelines")
+    parser.add_argument("--configs", type=Path, nargs="+", default=CONFIGS)
+    parser.add_argument("--points", type=int, nargs="+", default=POINT_COUNTS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--recorded",
+        type=Path,
+        nargs=2,
+        metavar=("SOURCE", "TARGET"),
+        help="recorded point clouds to use instead of synthetic ones",
+    )
+    parser.add_argument(
+        "--reference",
+        type=Path,
+        help="text file with the reference transformation of recorded clouds",
+    )
+    parser.add_argument(
+        "--output", type=Path, default=Path("registration_benchmark.json")
+    )
+    parser.add_argument("--baseline", type=Path, help="report to compare with")
+    arguments = parser.parse_args()
+
+    counts: list[int | None] = (
+        [None] if arguments.recorded else arguments.points
+    )
+
+    context = multiprocessing.get_context("spawn")
+
+    report: dict = {"metadata": create_metadata(), "runs": list()}
+    for config_path in arguments.configs:
+        for count in counts:
+            # NOTE: Each run is executed in a fresh process, since the peak
+            # resident set size can not be reset within a process
+            with ProcessPoolExecutor(1, mp_context=context) as executor:
+                future = executor.submit(
+                    run_benchmark,
+                    config_path,
+                    count,
+                    arguments.seed,
+                    arguments.recorded,
+                    arguments.reference,
+                )
+                try:
+                    record: dict = future.result()
+                except Exception as error:
+                    record: dict = {
+                        "config": str(config_path),
+                        "source_points": count,
+                        "seed": arguments.seed,
+                        "error": repr(error),
+                    }
+
+            report["runs"].append(record)
+
+            # NOTE: The report is written after each run, so completed runs
+            # are kept if a large run is killed
+            arguments.output.write_text(
+                json.dumps(report, indent=2, sort_keys=True)
+            )
+
+            if "error" in record:
+                print(f"{config_path} {count}: {record.get('error')}")
+                continue
+
+            for stage in record.get("stages"):
+                print(
+                    f"{config_path.stem:>16} {record.get('source_points'):>10}",
+                    f"{stage.get('name'):>24} {stage.get('seconds'):8.2f} s",
+                    f"{stage.get('peak_rss_mb'):8.0f} MB",
+                    f"{stage.get('translation_error') or 0.0:8.4f} m",
+                    f"{stage.get('rotation_error_deg') or 0.0:8.4f} deg",
+                )
+
+    print(f"report written to {arguments.output}")
+
+    if arguments.baseline is not None:
+        compare_reports(report, json.loads(arguments.baseline.read_text()))
+
+
+if __name__ == "__main__":
+    main()
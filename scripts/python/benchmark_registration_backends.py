@@ -0,0 +1,93 @@
+"""Benchmark comparing the legacy and tensor registration backends on a pair
+of point clouds, e.g. dense clouds exported from two dives."""
+
+import copy
+import time
+
+from argparse import ArgumentParser
+from pathlib import Path
+
+import numpy as np
+
+from mynd.io import read_config, read_point_cloud
+from mynd.registration import (
+    RegistrationPipeline,
+    RegistrationResult,
+    apply_registration_pipeline,
+    build_registration_pipeline,
+)
+
+
+BACKENDS: list[str] = ["legacy", "tensor"]
+
+
+def build_pipeline(config: dict, backend: str) -> RegistrationPipeline | None:
+    """Builds the registration pipeline for a backend, or returns none if the
+    configuration is not supported by the backend."""
+    config: dict = copy.deepcopy(config)
+    config["backend"] = backend
+    try:
+        return build_registration_pipeline(config)
+    except NotImplementedError as error:
+        print(f"skipping {backend} backend: {error}")
+        return None
+
+
+def main():
+    """Runs the registration backend benchmark."""
+    parser = ArgumentParser(
+        description="benchmarks the legacy and tensor registration backends",
+    )
+    parser.add_argument("config", type=Path, help="registration config")
+    parser.add_argument("source", type=Path, help="source point cloud")
+    parser.add_argument("target", type=Path, help="target point cloud")
+    parser.add_argument("--repeats", type=int, default=3)
+    arguments = parser.parse_args()
+
+    config: dict = read_config(arguments.config).unwrap().get("registration")
+    source = read_point_cloud(arguments.source).unwrap()
+    target = read_point_cloud(arguments.target).unwrap()
+
+    print(f"source: {len(source.points)} points")
+    print(f"target: {len(target.points)} points")
+
+    transformations: dict[str, np.ndarray] = dict()
+    for backend in BACKENDS:
+        pipeline: RegistrationPipeline | None = build_pipeline(config, backend)
+        if pipeline is None:
+            continue
+
+        durations: list[float] = list()
+        for _ in range(arguments.repeats):
+            start: float = time.perf_counter()
+            result: RegistrationResult = apply_registration_pipeline(
+                pipeline, source=source, target=target
+            )
+            durations.append(time.perf_counter() - start)
+
+        transformations[backend] = result.transformation
+
+        print(
+            f"{backend:>8}: {np.median(durations):8.2f} s (median),",
+            f"fitness {result.fitness:.4f},",
+            f"rmse {result.inlier_rmse:.4f}",
+        )
+
+    if len(transformations) == len(BACKENDS):
+        difference: np.ndarray = np.linalg.inv(
+            transformations["legacy"]
+        ) @ transformations.get("tensor")
+        print(
+            "backend difference:",
+            f"translation {np.linalg.norm(difference[:3, 3]):.4f},",
+            f"rotation {np.degrees(np.arccos(_clip_trace(difference))):.4f} deg",
+        )
+
+
+def _clip_trace(transformation: np.ndarray) -> float:
+    """Returns the cosine of the rotation angle of a transformation."""
+    return np.clip((np.trace(transformation[:3, :3]) - 1.0) / 2.0, -1.0, 1.0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Benchmark of the remap throughput with floating-point and fixed-point pixel
+maps for a set of image sizes and pixel types."""
+
+import time
+
+from argparse import ArgumentParser
+from collections.abc import Callable
+
+import numpy as np
+
+from mynd.geometry import PixelMap, remap_image_pixels
+from mynd.image import Image, PixelFormat
+
+
+IMAGE_TYPES: dict[str, tuple[np.dtype, int, PixelFormat]] = {
+    "rgb8": (np.uint8, 3, PixelFormat.RGB),
+    "range32": (np.float32, 1, PixelFormat.X),
+    "normal32": (np.float32, 3, PixelFormat.XYZ),
+}
+
+
+def create_pixel_map(height: int, width: int) -> PixelMap:
+    """Creates a pixel map with a radial distortion of the image."""
+
+    rows, columns = np.indices((height, width), dtype=np.float32)
+    center: np.ndarray = np.array([width / 2.0, height / 2.0], np.float32)
+    offsets: np.ndarray = np.stack((columns, rows), axis=-1) - center
+    radii: np.ndarray = np.sum(offsets**2, axis=-1, keepdims=True)
+    scale: np.ndarray = 1.0 + 1e-7 * radii
+    return PixelMap((center + offsets * scale).astype(np.float32))
+
+
+def create_image(height: int, width: int, image_type: str) -> Image:
+    """Creates a random image of the given type."""
+
+    dtype, channels, pixel_format = IMAGE_TYPES.get(image_type)
+    generator: np.random.Generator = np.random.default_rng(0)
+    data: np.ndarray = generator.random((height, width, channels)) * 255.0
+    return Image.from_array(data.astype(dtype), pixel_format)
+
+
+def measure(function: Callable[[], None], repeats: int) -> float:
+    """Returns the median duration of a function in seconds."""
+
+    durations: list[float] = list()
+    for _ in range(repeats):
+        start: float = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+
+    return float(np.median(durations))
+
+
+def main():
+    """Runs the remap throughput benchmark."""
+    parser = ArgumentParser(
+        description="benchmarks remap throughput per megapixel",
+    )
+    parser.add_argument(
+        "--sizes", nargs="+", default=["1024x1360", "2048x2448"]
+    )
+    parser.add_argument(
+        "--types", nargs="+", default=list(IMAGE_TYPES), choices=IMAGE_TYPES
+    )
+    parser.add_argument("--repeats", type=int, default=20)
+    arguments = parser.parse_args()
+
+    for size in arguments.sizes:
+        height, width = [int(value) for value in size.split("x")]
+        megapixels: float = height * width / 1e6
+
+        pixel_map: PixelMap = create_pixel_map(height, width)
+
+        start: float = time.perf_counter()
+        pixel_map.to_fixed_point()
+        conversion: float = time.perf_counter() - start
+
+        print(f"{size}: {1000.0 * conversion:.1f} ms fixed-point conversion")
+
+        for image_type in arguments.types:
+            image: Image = create_image(height, width, image_type)
+
+            for fixed_point in (False, True):
+                seconds: float = measure(
+                    lambda: remap_image_pixels(
+                        image, pixel_map, fixed_point=fixed_point
+                    ),
+                    arguments.repeats,
+                )
+                label: str = "fixed" if fixed_point else "float"
+                print(
+                    f"{size:>12} {image_type:>9} {label:>6}:",
+                    f"{megapixels / seconds:8.1f} MP/s,",
+                    f"{1000.0 * seconds / megapixels:7.2f} ms/MP",
+                )
+
+
+if __name__ == "__main__":
+    main()
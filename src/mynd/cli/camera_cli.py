@@ -9,10 +9,18 @@ import click
 from mynd.backend import metashape
 
 from mynd.collections import GroupID, CameraGroup
+from mynd.geometry import (
+    HitnetSessionConfig,
+    RectificationCache,
+    set_rectification_cache,
+)
 from mynd.image import ImageType
 
 from mynd.tasks.export_cameras import export_camera_group
-from mynd.tasks.export_stereo import export_stereo_geometry
+from mynd.tasks.export_stereo import (
+    ExportStereoGeometryConfig,
+    export_stereo_geometry,
+)
 
 from mynd.utils.filesystem import (
     Resource,
@@ -30,11 +38,24 @@ IMAGE_FILE_PATTERN: str = "*.tiff"
 
 
 @click.group()
+@click.option(
+    "--rectification-cache",
+    type=Path,
+    default=None,
+    help="directory for persisting stereo rectification maps",
+)
 @click.pass_context
-def camera_cli(context: click.Context) -> None:
+def camera_cli(
+    context: click.Context, rectification_cache: Path | None
+) -> None:
     """CLI for camera specific tasks."""
     context.ensure_object(dict)
 
+    # NOTE: Rectification maps are expensive to invert, so they are reused
+    # across tasks on the same stereo rig when a cache directory is given
+    if rectification_cache is not None:
+        set_rectification_cache(RectificationCache(rectification_cache))
+
 
 @dataclass
 class ExportCameraBundle:
@@ -136,6 +157,68 @@ def retrieve_camera_group(target_label: str) -> Result[CameraGroup, str]:
     default=False,
     help="save geometry samples",
 )
+@click.option(
+    "--provider",
+    type=click.Choice(["cuda", "cpu"]),
+    show_default=True,
+    default="cuda",
+    help="matcher execution provider",
+)
+@click.option(
+    "--intra-op-threads",
+    type=int,
+    show_default=True,
+    default=0,
+    help="matcher threads per operator, zero for the runtime default",
+)
+@click.option(
+    "--inter-op-threads",
+    type=int,
+    show_default=True,
+    default=0,
+    help="matcher threads across operators, zero for the runtime default",
+)
+@click.option(
+    "--optimization",
+    type=click.Choice(["disabled", "basic", "extended", "all"]),
+    show_default=True,
+    default="all",
+    help="matcher graph optimization level",
+)
+@click.option(
+    "--disable-memory-arena",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    help="disable the matcher memory arena",
+)
+@click.option(
+    "--optimized-model",
+    type=Path,
+    default=None,
+    help="cache file for the optimized matcher graph",
+)
+@click.option(
+    "--loaders",
+    type=int,
+    show_default=True,
+    default=4,
+    help="image loading and rectification threads",
+)
+@click.option(
+    "--writers",
+    type=int,
+    show_default=True,
+    default=4,
+    help="range and normal map writing threads",
+)
+@click.option(
+    "--prefetch",
+    type=int,
+    show_default=True,
+    default=8,
+    help="camera pairs each export stage can hold ahead of the next",
+)
 def export_stereo(
     source: Path,
     destination: Path,
@@ -143,6 +226,15 @@ def export_stereo(
     target: str,
     visualize: bool,
     save_samples: bool,
+    provider: str,
+    intra_op_threads: int,
+    inter_op_threads: int,
+    optimization: str,
+    disable_memory_arena: bool,
+    optimized_model: Path | None,
+    loaders: int,
+    writers: int,
+    prefetch: int,
 ) -> None:
     """Export stereo ranges and normals."""
 
@@ -155,6 +247,20 @@ def export_stereo(
     assert matcher.exists(), f"matcher does not exist: {matcher}"
     assert matcher.is_file(), f"matcher is not a file: {matcher}"
 
+    session: HitnetSessionConfig = HitnetSessionConfig(
+        provider=provider,
+        intra_op_threads=intra_op_threads,
+        inter_op_threads=inter_op_threads,
+        optimization=optimization,
+        memory_arena=not disable_memory_arena,
+        optimized_model=optimized_model,
+    )
+    pipelining: ExportStereoGeometryConfig.Pipelining = (
+        ExportStereoGeometryConfig.Pipelining(
+            loaders=loaders, writers=writers, depth=prefetch
+        )
+    )
+
     metashape.load_project(source).unwrap()
 
     groups: dict[str, GroupID] = {
@@ -177,6 +283,8 @@ def export_stereo(
                     matcher,
                     visualize,
                     save_samples,
+                    session=session,
+                    pipelining=pipelining,
                 )
 
             pass
@@ -29,6 +29,28 @@ def registration() -> None:
     default=False,
     help="force result saving",
 )
+@click.option(
+    "--executor",
+    type=click.Choice(["sequential", "thread", "process"]),
+    default="sequential",
+    help="batch executor",
+)
+@click.option("--workers", type=int, help="number of batch workers")
+@click.option(
+    "--memory",
+    "cache_budget",
+    type=float,
+    default=0.0,
+    help="point cloud cache budget in gigabytes, split evenly between loaded "
+    "and preprocessed point clouds, caching is disabled by default",
+)
+@click.option(
+    "--no-resume",
+    "no_resume",
+    is_flag=True,
+    default=False,
+    help="register every pair again, ignoring stored results",
+)
 def register(
     source: Path,
     destination: Path,
@@ -37,6 +59,10 @@ def register(
     reference: str | None = None,
     visualize: bool = False,
     force_export: bool = False,
+    executor: str = "sequential",
+    workers: int | None = None,
+    cache_budget: float = 0.0,
+    no_resume: bool = False,
 ) -> None:
     """Register groups of cameras to each other."""
 
@@ -50,5 +76,15 @@ def register(
     assert source != destination, "source and destination cannot be the same"
 
     invoke_registration(
-        source, destination, config, cache, reference, visualize, force_export
+        source,
+        destination,
+        config,
+        cache,
+        reference,
+        visualize,
+        force_export,
+        executor=executor,
+        workers=workers,
+        cache_budget=cache_budget,
+        resume=not no_resume,
     )
@@ -2,17 +2,28 @@
 
 from pathlib import Path
 
+import numpy as np
+
 from mynd.backend import metashape
 from mynd.collections import GroupID
 from mynd.geometry import PointCloudLoader
 from mynd.io import read_config
 
-from mynd.registration import RegistrationBatch
+from mynd.registration import PointCloudCache, PreprocessingCache
+from mynd.registration import FeatureStore, RegistrationBatch
+from mynd.registration import ResultStore, compute_config_hash
+from mynd.registration import compute_file_fingerprint
 from mynd.registration import RegistrationPipeline, build_registration_pipeline
 from mynd.registration import (
+    OverlapSummary,
     RegistrationIndex,
+    compute_fpfh_descriptor,
+    compute_overlap_summary,
     generate_indices_cascade,
+    generate_indices_descriptor,
     generate_indices_one_way,
+    generate_indices_overlap,
+    order_indices_by_reuse,
 )
 
 from mynd.tasks.registration import register_groups
@@ -29,6 +40,10 @@ def invoke_registration(
     reference: str | None = None,
     visualize: bool = False,
     force_export: bool = False,
+    executor: str = "sequential",
+    workers: int | None = None,
+    cache_budget: float = 0.0,
+    resume: bool = True,
 ) -> None:
     """Invokes a registration task - Prepares point cloud loaders, selects a reference,
     builds registration batch and pipeline."""
@@ -44,29 +59,67 @@ def invoke_registration(
 
     config: dict = read_config(config_file).unwrap()
 
+    feature_store: FeatureStore = FeatureStore(cache / "features")
     pipeline: RegistrationPipeline = build_registration_pipeline(
-        config.get("registration")
+        config.get("registration"), feature_store=feature_store
     )
-    batch: RegistrationBatch = RegistrationBatch[GroupID](point_cloud_loaders)
 
-    INDEX_STRATEGY: str = "one-way"
+    for line in pipeline.plan.describe().splitlines():
+        logger.info(line)
+
+    # NOTE: Preprocessed point clouds are only reused while the input point
+    # clouds are alive, so preprocessing is cached along with the inputs, and
+    # the memory budget is split evenly between the two caches
+    cloud_cache: PointCloudCache | None = None
+    preprocessing_cache: PreprocessingCache | None = None
+    if cache_budget > 0.0:
+        budget: int = int(cache_budget * 1e9) // 2
+        cloud_cache = PointCloudCache[GroupID](budget=budget)
+        preprocessing_cache = PreprocessingCache(budget=budget)
+
+    # NOTE: Pairwise results are stored as they are completed, and pairs with
+    # unchanged inputs and pipeline config are skipped when a batch is resumed
+    result_store: ResultStore = ResultStore(
+        cache / "results",
+        pipeline=compute_config_hash(config.get("registration")),
+        resume=resume,
+    )
+    fingerprints: dict[GroupID, str] = compute_input_fingerprints(
+        point_cloud_loaders, cache
+    )
 
-    match INDEX_STRATEGY:
-        case "one-way":
-            indices: list[RegistrationIndex] = generate_indices_one_way(
-                reference_group, batch.keys()
-            )
-        case "cascade":
-            indices: list[RegistrationIndex] = generate_indices_cascade(
-                batch.keys()
-            )
-        case _:
-            raise NotImplementedError
+    batch: RegistrationBatch = RegistrationBatch[GroupID](
+        point_cloud_loaders,
+        cache=cloud_cache,
+        preprocessing=preprocessing_cache,
+        store=result_store,
+        fingerprints=fingerprints,
+        # NOTE: Only the transformations and information matrices are used
+        # downstream, so correspondence sets are not kept for the results
+        correspondences=0,
+    )
+
+    indices: list[RegistrationIndex] = generate_registration_indices(
+        batch, reference_group, config.get("indices", dict())
+    )
+
+    indices: list[RegistrationIndex] = order_indices_by_reuse(indices)
 
     batch_result: RegistrationBatch.Result = register_groups(
-        batch, indices, pipeline, reference=reference_group, visualize=visualize
+        batch,
+        indices,
+        pipeline,
+        reference=reference_group,
+        visualize=visualize,
+        executor=executor,
+        workers=workers,
     ).unwrap()
 
+    logger.info(f"Feature store hits:   {feature_store.statistics.hits}")
+    logger.info(f"Feature store misses: {feature_store.statistics.misses}")
+    logger.info(f"Resumed pairs:        {result_store.statistics.hits}")
+    logger.info(f"Stored pairs:         {result_store.statistics.saved}")
+
     metashape.apply_registration_results(
         batch_result.target, batch_result.sources
     )
@@ -87,6 +140,87 @@ def retrieve_point_clouds(cache: Path) -> dict[GroupID, PointCloudLoader]:
     return loaders
 
 
+def generate_registration_indices(
+    batch: RegistrationBatch,
+    reference: GroupID,
+    config: dict,
+) -> list[RegistrationIndex]:
+    """Generates registration indices with the configured strategy. The overlap
+    strategy only pairs groups whose coarse voxel occupancies overlap, and the
+    descriptor strategy pairs each group with its most similar groups."""
+
+    strategy: str = config.get("strategy", "one-way")
+
+    match strategy:
+        case "one-way":
+            indices: list[RegistrationIndex] = generate_indices_one_way(
+                reference, batch.keys()
+            )
+        case "cascade":
+            indices: list[RegistrationIndex] = generate_indices_cascade(
+                batch.keys()
+            )
+        case "overlap":
+            summaries: dict[GroupID, OverlapSummary] = {
+                group: compute_overlap_summary(
+                    batch.load(group).unwrap(), config.get("voxel_size", 1.0)
+                )
+                for group in batch.keys()
+            }
+            indices: list[RegistrationIndex] = generate_indices_overlap(
+                summaries, threshold=config.get("threshold", 0.1)
+            )
+
+            cascade_count: int = len(summaries) * (len(summaries) - 1) // 2
+            logger.info(
+                f"Overlap indices: {len(indices)} of {cascade_count} pairs"
+            )
+        case "descriptor":
+            descriptors: dict[GroupID, np.ndarray] = {
+                group: compute_fpfh_descriptor(
+                    batch.load(group).unwrap(),
+                    voxel_size=config.get("voxel_size", 1.0),
+                    radius=config.get("radius", 5.0),
+                )
+                for group in batch.keys()
+            }
+            indices: list[RegistrationIndex] = generate_indices_descriptor(
+                descriptors,
+                count=config.get("candidates", 5),
+                max_distance=config.get("max_distance", np.inf),
+            )
+
+            logger.info(
+                f"Descriptor indices: {len(indices)} pairs for "
+                f"{len(descriptors)} groups"
+            )
+        case _:
+            raise NotImplementedError(f"invalid index strategy: {strategy}")
+
+    return indices
+
+
+def compute_input_fingerprints(
+    loaders: dict[GroupID, PointCloudLoader],
+    cache: Path,
+) -> dict[GroupID, str]:
+    """Computes fingerprints for the input point clouds from their exported
+    files, without loading them. Groups without an exported file are left
+    without a fingerprint, so their pairs are always registered."""
+
+    fingerprints: dict[GroupID, str] = dict()
+    for group in loaders:
+        # NOTE: Dense point clouds are exported to the cache by group label
+        path: Path = cache / f"{group.label}.ply"
+
+        try:
+            fingerprints[group] = compute_file_fingerprint(path)
+        except OSError as error:
+            logger.warning(f"failed to fingerprint {group}: {error}")
+
+    return fingerprints
+
+
 def select_registration_reference(
     reference_label: str, loaders: dict[GroupID, PointCloudLoader]
 ) -> GroupID:
@@ -1,7 +1,11 @@
 """Package with geometric functionality including camera calibration, 
 disparity, range and normal map estimation, and geometric image transformations."""
 
-from .hitnet import create_hitnet_matcher
+from .hitnet import (
+    HitnetSessionConfig,
+    create_hitnet_batch_matcher,
+    create_hitnet_matcher,
+)
 
 from .image_transformations import (
     PixelMap,
@@ -14,11 +18,13 @@ from .point_cloud import (
     PointCloud,
     PointCloudLoader,
     PointCloudProcessor,
+    TensorPointCloud,
 )
 
 from .point_cloud_processors import (
     downsample_point_cloud,
     estimate_point_cloud_normals,
+    convert_to_tensor_point_cloud,
     create_downsampler,
     create_normal_estimator,
 )
@@ -29,13 +35,23 @@ from .range_maps import (
     compute_normals_from_range,
 )
 
+from .rectification_cache import (
+    RectificationCache,
+    compute_calibration_hash,
+    get_rectification_cache,
+    load_stereo_rectification,
+    set_rectification_cache,
+)
+
 from .stereo_geometry import (
     StereoGeometry,
     compute_stereo_geometry,
+    compute_stereo_geometry_from_disparities,
     distort_stereo_geometry,
+    rectify_stereo_images,
 )
 
-from .stereo_matcher import StereoMatcher
+from .stereo_matcher import StereoBatchMatcher, StereoMatcher
 
 from .stereo_rectification import (
     StereoRectificationTransforms,
@@ -46,8 +62,12 @@ from .stereo_rectification import (
     rectify_image_pair,
 )
 
+from .voxel_pyramid import VoxelPyramid, build_voxel_pyramid
+
 
 __all__ = [
+    "HitnetSessionConfig",
+    "create_hitnet_batch_matcher",
     "create_hitnet_matcher",
     # ...
     "PixelMap",
@@ -58,9 +78,11 @@ __all__ = [
     "PointCloud",
     "PointCloudLoader",
     "PointCloudProcessor",
+    "TensorPointCloud",
     # ...
     "downsample_point_cloud",
     "estimate_point_cloud_normals",
+    "convert_to_tensor_point_cloud",
     "create_downsampler",
     "create_normal_estimator",
     # ...
@@ -68,10 +90,19 @@ __all__ = [
     "compute_points_from_range",
     "compute_normals_from_range",
     # ...
+    "RectificationCache",
+    "compute_calibration_hash",
+    "get_rectification_cache",
+    "load_stereo_rectification",
+    "set_rectification_cache",
+    # ...
     "StereoGeometry",
     "compute_stereo_geometry",
+    "compute_stereo_geometry_from_disparities",
     "distort_stereo_geometry",
+    "rectify_stereo_images",
     # ...
+    "StereoBatchMatcher",
     "StereoMatcher",
     # ...
     "StereoRectificationTransforms",
@@ -80,4 +111,7 @@ __all__ = [
     "compute_rectifying_image_transforms",
     "compute_stereo_rectification",
     "rectify_image_pair",
+    # ...
+    "VoxelPyramid",
+    "build_voxel_pyramid",
 ]
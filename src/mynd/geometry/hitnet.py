@@ -1,19 +1,18 @@
 """Module for functionality related to Hitnet disparity estimation model."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import NamedTuple
 
 import cv2
 import numpy as np
-import torch
 import onnxruntime as onnxrt
 
-from mynd.image import Image, PixelFormat, flip_image
+from mynd.image import Image, PixelFormat
 from mynd.utils.containers import Pair
 from mynd.utils.result import Ok, Err, Result
 
-from .stereo_matcher import StereoMatcher
+from .stereo_matcher import StereoBatchMatcher, StereoMatcher
 
 
 class Argument(NamedTuple):
@@ -55,8 +54,64 @@ class HitnetModel:
         batch, channels, height, width = tensor_argument.shape
         return (height, width)
 
+    @property
+    def batch_size(self) -> int | None:
+        """Returns the fixed batch size of the model, or none if the model
+        accepts batches of any size."""
+        batch: int | str | None = self.inputs[0].shape[0]
+        return batch if isinstance(batch, int) else None
+
+
+@dataclass
+class HitnetInputBuffer:
+    """Class representing a preallocated NCHW input tensor for a Hitnet model.
+    The buffer grows to the largest batch it has been used for, and is reused
+    for smaller batches."""
+
+    tensor: np.ndarray = field(
+        default_factory=lambda: np.empty((0, 2, 0, 0), dtype=np.float32)
+    )
+
+    def reserve(self, count: int, height: int, width: int) -> np.ndarray:
+        """Returns a view of the buffer with room for a batch of inputs."""
+        capacity, channels, rows, columns = self.tensor.shape
+        if count > capacity or (rows, columns) != (height, width):
+            self.tensor = np.empty(
+                (max(count, capacity), channels, height, width),
+                dtype=np.float32,
+            )
+        return self.tensor[:count]
+
+
+PROVIDERS: tuple[str] = ("cuda", "cpu")
 
-def load_hitnet(path: Path) -> Result[HitnetModel, str]:
+OPTIMIZATION_LEVELS: dict[str, onnxrt.GraphOptimizationLevel] = {
+    "disabled": onnxrt.GraphOptimizationLevel.ORT_DISABLE_ALL,
+    "basic": onnxrt.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+    "extended": onnxrt.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+    "all": onnxrt.GraphOptimizationLevel.ORT_ENABLE_ALL,
+}
+
+
+@dataclass(frozen=True)
+class HitnetSessionConfig:
+    """Class representing the execution provider and session options for a
+    Hitnet model. Thread counts of zero leave the choice to ONNX Runtime. If
+    an optimized model path is given, the optimized graph is saved there on
+    the first load and loaded from there afterwards. Optimized graphs can be
+    specific to the provider and hardware they were created with."""
+
+    provider: str = "cuda"
+    intra_op_threads: int = 0
+    inter_op_threads: int = 0
+    optimization: str = "all"
+    memory_arena: bool = True
+    optimized_model: Path | None = None
+
+
+def load_hitnet(
+    path: Path, config: HitnetSessionConfig = HitnetSessionConfig()
+) -> Result[HitnetModel, str]:
     """Loads a Hitnet model from an ONNX file."""
 
     if not path.exists():
@@ -64,22 +119,30 @@ def load_hitnet(path: Path) -> Result[HitnetModel, str]:
     if not path.suffix == ".onnx":
         return Err(f"model path is not an ONNX file: {path}")
 
-    providers: list = [
-        (
-            "CUDAExecutionProvider",
-            {
-                "device_id": torch.cuda.current_device(),
-                "user_compute_stream": str(
-                    torch.cuda.current_stream().cuda_stream
-                ),
-            },
+    # NOTE: The config is validated before the providers are created, so
+    # that invalid configs are rejected without querying devices
+    try:
+        sess_options: onnxrt.SessionOptions = create_hitnet_session_options(
+            config
         )
-    ]
-
-    sess_options: onnxrt.SessionOptions = onnxrt.SessionOptions()
+        providers: list = _create_providers(config)
+    except (NotImplementedError, ValueError) as error:
+        return Err(str(error))
+
+    model_path: Path = path
+    if config.optimized_model is not None:
+        if config.optimized_model.exists():
+            # NOTE: The cached graph is already optimized, so we skip the
+            # optimization when loading it
+            model_path: Path = config.optimized_model
+            sess_options.graph_optimization_level = OPTIMIZATION_LEVELS.get(
+                "disabled"
+            )
+        else:
+            sess_options.optimized_model_filepath = str(config.optimized_model)
 
     session: onnxrt.InferenceSession = onnxrt.InferenceSession(
-        str(path),
+        str(model_path),
         sess_options=sess_options,
         providers=providers,
     )
@@ -89,56 +152,151 @@ def load_hitnet(path: Path) -> Result[HitnetModel, str]:
     return Ok(HitnetModel(session=session))
 
 
-def create_hitnet_matcher(path: Path) -> StereoMatcher:
+def create_hitnet_session_options(
+    config: HitnetSessionConfig,
+) -> onnxrt.SessionOptions:
+    """Creates ONNX Runtime session options from a session config."""
+
+    if config.optimization not in OPTIMIZATION_LEVELS:
+        raise NotImplementedError(
+            f"invalid optimization level - valid options are: "
+            f"{tuple(OPTIMIZATION_LEVELS)}"
+        )
+
+    sess_options: onnxrt.SessionOptions = onnxrt.SessionOptions()
+    sess_options.intra_op_num_threads = config.intra_op_threads
+    sess_options.inter_op_num_threads = config.inter_op_threads
+    sess_options.graph_optimization_level = OPTIMIZATION_LEVELS.get(
+        config.optimization
+    )
+    sess_options.enable_cpu_mem_arena = config.memory_arena
+
+    # NOTE: Inter-op threads are only used when independent nodes are run in
+    # parallel
+    if config.inter_op_threads > 1:
+        sess_options.execution_mode = onnxrt.ExecutionMode.ORT_PARALLEL
+
+    return sess_options
+
+
+def _create_providers(config: HitnetSessionConfig) -> list:
+    """Creates the execution providers for a session config. Raises a value
+    error if the provider is not available on this host."""
+
+    names: dict[str, str] = {
+        "cuda": "CUDAExecutionProvider",
+        "cpu": "CPUExecutionProvider",
+    }
+
+    if config.provider not in names:
+        raise NotImplementedError(
+            f"invalid execution provider - valid options are: {PROVIDERS}"
+        )
+
+    name: str = names.get(config.provider)
+    if name not in onnxrt.get_available_providers():
+        raise ValueError(f"execution provider is not available: {name}")
+
+    if config.provider == "cpu":
+        return [name]
+
+    # NOTE: Torch is only required to share the CUDA device and stream, so
+    # that CPU-only hosts can run without it
+    try:
+        import torch
+
+        device: int = torch.cuda.current_device()
+        stream: int = torch.cuda.current_stream().cuda_stream
+    except (ImportError, RuntimeError, AssertionError) as error:
+        raise ValueError(f"failed to query CUDA device: {error}") from error
+
+    arena_strategy: str = (
+        "kNextPowerOfTwo" if config.memory_arena else "kSameAsRequested"
+    )
+    return [
+        (
+            name,
+            {
+                "device_id": device,
+                "user_compute_stream": str(stream),
+                "arena_extend_strategy": arena_strategy,
+            },
+        )
+    ]
+
+
+def create_hitnet_matcher(
+    path: Path, config: HitnetSessionConfig = HitnetSessionConfig()
+) -> StereoMatcher:
     """Creates a Hitnet stereo matcher."""
 
-    model: HitnetModel = load_hitnet(path).unwrap()
+    model: HitnetModel = load_hitnet(path, config).unwrap()
+    buffer: HitnetInputBuffer = HitnetInputBuffer()
 
     def match_stereo_hitnet(left: Image, right: Image) -> Pair[np.ndarray]:
         """Matches a pair of rectified stereo images with the Hitnet model."""
-        return _compute_disparity(model, left, right)
+        return _compute_disparity(model, left, right, buffer)
 
     return match_stereo_hitnet
 
 
-def _preprocess_images(
-    model: HitnetModel, left: Image, right: Image
-) -> tuple[np.ndarray, np.ndarray]:
-    """Preprocess input images for HITNET."""
-
-    match left.pixel_format:
-        case PixelFormat.RGB:
-            left_array: np.ndarray = cv2.cvtColor(
-                left.to_array(), cv2.COLOR_RGB2GRAY
-            )
-        case PixelFormat.BGR:
-            left_array: np.ndarray = cv2.cvtColor(
-                left.to_array(), cv2.COLOR_BGR2GRAY
-            )
-        case PixelFormat.GRAY:
-            left_array: np.ndarray = left.to_array()
-        case _:
-            raise NotImplementedError(
-                f"invalid image format: {left.pixel_format}"
+def create_hitnet_batch_matcher(
+    path: Path,
+    config: HitnetSessionConfig = HitnetSessionConfig(),
+    max_batch: int | None = None,
+) -> StereoBatchMatcher:
+    """Creates a Hitnet stereo matcher for batches of stereo pairs. Both
+    orientations of every pair are packed into one input tensor. Models with
+    a dynamic batch dimension match the whole batch in a single invocation,
+    while models with a fixed batch size, such as the bundled models with a
+    batch size of one, are still invoked once per orientation. If a maximum
+    batch is given, at most that many pairs are matched per model
+    invocation. The matcher reuses its input buffer, and must therefore not be
+    called from several threads at once."""
+
+    model: HitnetModel = load_hitnet(path, config).unwrap()
+    buffer: HitnetInputBuffer = HitnetInputBuffer()
+
+    def match_stereo_hitnet_batch(
+        pairs: list[Pair[Image]],
+    ) -> list[Pair[np.ndarray]]:
+        """Matches a batch of rectified stereo pairs with the Hitnet model."""
+        step: int = max_batch or max(len(pairs), 1)
+        disparities: list[Pair[np.ndarray]] = list()
+        for start in range(0, len(pairs), step):
+            disparities.extend(
+                _compute_disparities(model, pairs[start : start + step], buffer)
             )
+        return disparities
+
+    return match_stereo_hitnet_batch
+
+
+def _convert_to_grayscale(image: Image) -> np.ndarray:
+    """Converts an image to a grayscale array for Hitnet."""
 
-    match right.pixel_format:
+    match image.pixel_format:
         case PixelFormat.RGB:
-            right_array: np.ndarray = cv2.cvtColor(
-                right.to_array(), cv2.COLOR_RGB2GRAY
-            )
+            return cv2.cvtColor(image.to_array(), cv2.COLOR_RGB2GRAY)
         case PixelFormat.BGR:
-            right_array: np.ndarray = cv2.cvtColor(
-                right.to_array(), cv2.COLOR_BGR2GRAY
-            )
+            return cv2.cvtColor(image.to_array(), cv2.COLOR_BGR2GRAY)
         case PixelFormat.GRAY:
-            right_array: np.ndarray = right.to_array()
+            return np.squeeze(image.to_array())
         case _:
             raise NotImplementedError(
-                f"invalid image format: {right.pixel_format}"
+                f"invalid image format: {image.pixel_format}"
             )
 
-    # NOTE: Images should now be grayscale
+
+def _preprocess_pairs(
+    model: HitnetModel,
+    pairs: list[Pair[Image]],
+    buffer: HitnetInputBuffer,
+) -> np.ndarray:
+    """Preprocesses a batch of stereo pairs into an input tensor for Hitnet.
+    Each pair occupies two consecutive batch entries, i.e. the left and right
+    images, and the flipped right and left images. Each image is converted and
+    resized once, and flipped as a view when packed into the tensor."""
 
     assert (
         len(model.inputs) == 1
@@ -148,29 +306,21 @@ def _preprocess_images(
     ), f"invalid number of outputs: {len(model.outputs)}"
 
     height, width = model.input_size
+    tensor: np.ndarray = buffer.reserve(2 * len(pairs), height, width)
 
-    left_array: np.ndarray = cv2.resize(
-        left_array, (width, height), cv2.INTER_AREA
-    )
-    right_array: np.ndarray = cv2.resize(
-        right_array, (width, height), cv2.INTER_AREA
-    )
+    for index, pair in enumerate(pairs):
+        left_array, right_array = [
+            cv2.resize(_convert_to_grayscale(image), (width, height))
+            for image in (pair.first, pair.second)
+        ]
 
-    # Grayscale needs expansion to reach H,W,C.
-    # Need to do that now because resize would change the shape.
-    if left_array.ndim == 2:
-        left_array: np.ndarray = np.expand_dims(left_array, axis=-1)
-    if right_array.ndim == 2:
-        right_array: np.ndarray = np.expand_dims(right_array, axis=-1)
+        tensor[2 * index, 0] = left_array
+        tensor[2 * index, 1] = right_array
+        tensor[2 * index + 1, 0] = right_array[:, ::-1]
+        tensor[2 * index + 1, 1] = left_array[:, ::-1]
 
     # TODO: Get normalization value based on image dtype
-
-    # -> H,W,C=2 or 6 , normalized to [0,1]
-    tensor = np.concatenate((left_array, right_array), axis=-1) / 255.0
-    # -> C,H,W
-    tensor = tensor.transpose(2, 0, 1)
-    # -> B=1,C,H,W
-    tensor = np.expand_dims(tensor, 0).astype(np.float32)
+    np.multiply(tensor, 1.0 / 255.0, out=tensor)
 
     return tensor
 
@@ -202,35 +352,59 @@ def _postprocess_disparity(
 
 
 def _compute_disparity(
-    model: HitnetModel, left: Image, right: Image
+    model: HitnetModel,
+    left: Image,
+    right: Image,
+    buffer: HitnetInputBuffer | None = None,
 ) -> Pair[np.ndarray]:
     """Computes the disparity for a pair of stereo images. The images needs to be
     rectified prior to disparity estimation. Returns the left and right disparity as
     arrays with float32 values."""
-
-    # Create tensor from flipped images to get left disparity
-    flipped_left: Image = flip_image(left)
-    flipped_right: Image = flip_image(right)
-
-    tensor: np.ndarray = _preprocess_images(model, left, right)
-    flipped_tensor: np.ndarray = _preprocess_images(
-        model, flipped_right, flipped_left
-    )
-
-    left_outputs: list[np.ndarray] = model.session.run(
-        ["reference_output_disparity"], {"input": tensor}
-    )
-    right_outputs: list[np.ndarray] = model.session.run(
-        ["reference_output_disparity"], {"input": flipped_tensor}
-    )
-
-    # Since we estimate the right disparity from the flipped images, we need to flip the
-    # right disparity map back to the same perspective as the original rigth image
-    left_disparity: np.ndarray = _postprocess_disparity(
-        left_outputs[0], left, flip=False
-    )
-    right_disparity: np.ndarray = _postprocess_disparity(
-        right_outputs[0], right, flip=True
+    return _compute_disparities(
+        model, [Pair(first=left, second=right)], buffer
+    )[0]
+
+
+def _compute_disparities(
+    model: HitnetModel,
+    pairs: list[Pair[Image]],
+    buffer: HitnetInputBuffer | None = None,
+) -> list[Pair[np.ndarray]]:
+    """Computes the disparities for a batch of stereo pairs. Both orientations
+    of all the pairs are matched in a single model invocation if the model
+    has a dynamic batch dimension. Models with a fixed batch size are invoked
+    in chunks of that size, i.e. once per orientation for models with a batch
+    size of one."""
+
+    if not pairs:
+        return list()
+
+    if buffer is None:
+        buffer: HitnetInputBuffer = HitnetInputBuffer()
+
+    tensor: np.ndarray = _preprocess_pairs(model, pairs, buffer)
+
+    step: int = model.batch_size or len(tensor)
+    outputs: np.ndarray = np.concatenate(
+        [
+            model.session.run(
+                ["reference_output_disparity"],
+                {"input": tensor[start : start + step]},
+            )[0]
+            for start in range(0, len(tensor), step)
+        ]
     )
 
-    return Pair(first=left_disparity, second=right_disparity)
+    # NOTE: Since we estimate the right disparity from the flipped images, we
+    # flip it back to the perspective of the original right image
+    return [
+        Pair(
+            first=_postprocess_disparity(
+                outputs[2 * index], pair.first, flip=False
+            ),
+            second=_postprocess_disparity(
+                outputs[2 * index + 1], pair.second, flip=True
+            ),
+        )
+        for index, pair in enumerate(pairs)
+    ]
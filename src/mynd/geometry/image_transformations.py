@@ -1,6 +1,6 @@
 """Module for geometric image transformations."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import NamedTuple, Optional, Self
 
 import cv2
@@ -12,10 +12,15 @@ from ..image import Image
 @dataclass
 class PixelMap:
     """Class representing a pixel map. The pixel map data is an
-    array of size HxWx2 with the X and Y pixel maps respectively."""
+    array of size HxWx2 with the X and Y pixel maps respectively. The map
+    can also hold fixed-point maps that are computed on first use."""
 
     data: np.ndarray
 
+    _fixed_point: tuple[np.ndarray, np.ndarray] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     def __post_init__(self: Self) -> None:
         """Validates the pixel map."""
         assert self.data.ndim == 3
@@ -55,6 +60,28 @@ class PixelMap:
         """Returns the pixel map as an array."""
         return self.data.copy()
 
+    def view(self: Self) -> np.ndarray:
+        """Returns a read-only view of the pixel map without copying it."""
+        view: np.ndarray = self.data.view()
+        view.flags.writeable = False
+        return view
+
+    def to_fixed_point(self: Self) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the pixel map as OpenCV fixed-point maps, i.e. a HxWx2
+        array of integer pixel coordinates and a HxW array of indices into
+        the interpolation table. The maps are computed once and kept with
+        the pixel map."""
+
+        # NOTE: Concurrent first calls may both convert the map, which is
+        # harmless since the results are identical
+        if self._fixed_point is None:
+            self._fixed_point = cv2.convertMaps(
+                map1=np.asarray(self.data, dtype=np.float32),
+                map2=None,
+                dstmap1type=cv2.CV_16SC2,
+            )
+        return self._fixed_point
+
 
 def compute_pixel_map(
     camera_matrix: np.ndarray,
@@ -116,12 +143,22 @@ def remap_image_pixels(
     *,
     border_mode: int = cv2.BORDER_CONSTANT,
     interpolation: int = cv2.INTER_LINEAR,
+    fixed_point: bool = False,
 ) -> Image:
-    """Applies a pixel map to the pixels of the image."""
+    """Applies a pixel map to the pixels of the image. With fixed point, the
+    image is remapped with the fixed-point maps of the pixel map, which is
+    faster for repeated use of the same map, at the cost of quantizing the
+    subpixel coordinates to 1/32 of a pixel."""
+
+    if fixed_point:
+        map1, map2 = pixel_map.to_fixed_point()
+    else:
+        map1, map2 = pixel_map.view(), None
+
     mapped: np.ndarray = cv2.remap(
         src=image.to_array(),
-        map1=pixel_map.to_array(),
-        map2=None,
+        map1=map1,
+        map2=map2,
         borderMode=border_mode,
         interpolation=interpolation,
     )
@@ -9,5 +9,6 @@ from mynd.utils.result import Result
 
 
 PointCloud: TypeAlias = open3d.geometry.PointCloud
+TensorPointCloud: TypeAlias = open3d.t.geometry.PointCloud
 PointCloudLoader: TypeAlias = Callable[[None], Result[PointCloud, str]]
 PointCloudProcessor = Callable[[PointCloud], PointCloud]
@@ -1,10 +1,14 @@
-"""Module for point cloud processors."""
+"""Module for point cloud processors. Processors do not modify their input
+unless created with inplace set, and only copy the input for stages that
+modify the point cloud, i.e. normal estimation but not voxel downsampling.
+Processors accept both legacy and tensor point clouds."""
 
 from copy import deepcopy
 
+import open3d.core as core
 import open3d.geometry as geom
 
-from .point_cloud import PointCloud, PointCloudProcessor
+from .point_cloud import PointCloud, PointCloudProcessor, TensorPointCloud
 
 
 def downsample_point_cloud(
@@ -12,12 +16,10 @@ def downsample_point_cloud(
     spacing: float,
     inplace: bool = False,
 ) -> PointCloud:
-    """Downsamples a point cloud by performing voxel resampling."""
-    if not inplace:
-        cloud = deepcopy(cloud)
-
-    cloud = cloud.voxel_down_sample(voxel_size=spacing)
-    return cloud
+    """Downsamples a point cloud by performing voxel resampling. Since voxel
+    resampling returns a new point cloud, the input is neither copied nor
+    modified regardless of the inplace flag."""
+    return cloud.voxel_down_sample(voxel_size=spacing)
 
 
 def estimate_point_cloud_normals(
@@ -26,16 +28,31 @@ def estimate_point_cloud_normals(
     neighbours: int = 30,
     inplace: bool = False,
 ) -> PointCloud:
-    """Estimates the normals of a point cloud based on neighbouring points."""
+    """Estimates the normals of a point cloud based on neighbouring points. The
+    input is copied unless the estimation is performed in place."""
     if not inplace:
         cloud = deepcopy(cloud)
 
-    cloud.estimate_normals(
-        search_param=geom.KDTreeSearchParamHybrid(radius=0.1, max_nn=30)
-    )
+    if isinstance(cloud, TensorPointCloud):
+        cloud.estimate_normals(max_nn=neighbours, radius=radius)
+    else:
+        # NOTE: Legacy point clouds are always searched with a radius of 0.1
+        # and 30 neighbours, so that legacy registration results are unchanged
+        cloud.estimate_normals(
+            search_param=geom.KDTreeSearchParamHybrid(radius=0.1, max_nn=30)
+        )
     return cloud
 
 
+def convert_to_tensor_point_cloud(
+    cloud: PointCloud,
+    dtype: core.Dtype = core.float64,
+) -> TensorPointCloud:
+    """Converts a legacy point cloud to a tensor point cloud. Double precision
+    is used by default, since dense clouds are often in large coordinates."""
+    return TensorPointCloud.from_legacy(cloud, dtype=dtype)
+
+
 def create_downsampler(
     spacing: float,
     inplace: bool = False,
@@ -0,0 +1,259 @@
+"""Module for caching stereo rectification results in memory and on disk."""
+
+import hashlib
+import os
+import tempfile
+import threading
+import zipfile
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from mynd.camera import CameraCalibration
+from mynd.utils.containers import Pair
+from mynd.utils.log import logger
+
+from .image_transformations import PixelMap
+from .stereo_rectification import (
+    StereoRectificationResult,
+    StereoRectificationTransforms,
+    compute_stereo_rectification,
+)
+
+
+# NOTE: Bump the version when the rectification algorithm or the file layout
+# changes, so that stale files are never loaded
+CACHE_VERSION: str = "rectification-v1"
+
+CALIBRATION_FIELDS: tuple[str] = (
+    "camera_matrix",
+    "distortion",
+    "location",
+    "rotation",
+)
+
+
+@dataclass
+class RectificationCache:
+    """Class representing a cache of stereo rectification results keyed by
+    the calibrations of the stereo pair. Results are memoized in memory, and
+    persisted as compressed arrays in a directory if one is given. Cached
+    results are shared between callers and should not be modified."""
+
+    @dataclass
+    class Statistics:
+        """Class representing rectification cache statistics."""
+
+        hits: int = 0
+        loads: int = 0
+        misses: int = 0
+
+    directory: Path | None = None
+    statistics: Statistics = field(default_factory=Statistics)
+
+    _results: dict[str, StereoRectificationResult] = field(
+        default_factory=dict, repr=False
+    )
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __post_init__(self) -> None:
+        """Creates the cache directory if it does not exist."""
+        if self.directory is not None:
+            self.directory = Path(self.directory)
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    def path(self, key: str) -> Path | None:
+        """Returns the file path for a cache key, or none if the cache is not
+        persisted."""
+        if self.directory is None:
+            return None
+        return self.directory / f"{key}.npz"
+
+    def rectify(
+        self, calibrations: Pair[CameraCalibration]
+    ) -> StereoRectificationResult:
+        """Returns the rectification of a stereo pair from memory or disk,
+        and computes and stores it on a miss."""
+
+        key: str = compute_calibration_hash(calibrations)
+
+        # NOTE: The lock is held while computing, so that concurrent callers
+        # with the same rig do not invert the pixel maps more than once
+        with self._lock:
+            if key in self._results:
+                self.statistics.hits += 1
+                return self._results.get(key)
+
+            result: StereoRectificationResult | None = self._load(
+                key, calibrations
+            )
+            if result is not None:
+                self.statistics.loads += 1
+            else:
+                self.statistics.misses += 1
+                result: StereoRectificationResult = (
+                    compute_stereo_rectification(
+                        left=calibrations.first, right=calibrations.second
+                    )
+                )
+                self._save(key, result)
+
+            self._results[key] = result
+            return result
+
+    def clear(self) -> None:
+        """Removes the results memoized in memory."""
+        with self._lock:
+            self._results.clear()
+
+    def _load(
+        self, key: str, calibrations: Pair[CameraCalibration]
+    ) -> StereoRectificationResult | None:
+        """Loads a rectification result from disk, or returns none if it is
+        missing or can not be read."""
+
+        path: Path | None = self.path(key)
+        if path is None:
+            return None
+
+        try:
+            with np.load(path) as archive:
+                arrays: dict[str, np.ndarray] = {
+                    name: archive[name] for name in archive.files
+                }
+            return _unpack_rectification(arrays, calibrations)
+        except FileNotFoundError:
+            return None
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile) as error:
+            logger.warning(f"failed to read rectification file {path}: {error}")
+            return None
+
+    def _save(self, key: str, result: StereoRectificationResult) -> None:
+        """Saves a rectification result to disk. The file is written to a
+        temporary path and renamed, so concurrent readers never see partial
+        files."""
+
+        if self.directory is None:
+            return
+
+        handle, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as file:
+                np.savez_compressed(file, **_pack_rectification(result))
+            os.replace(temporary, self.path(key))
+        except OSError as error:
+            logger.warning(f"failed to write rectification file: {error}")
+            Path(temporary).unlink(missing_ok=True)
+
+
+_DEFAULT_CACHE: RectificationCache = RectificationCache()
+
+
+def get_rectification_cache() -> RectificationCache:
+    """Returns the process wide rectification cache."""
+    return _DEFAULT_CACHE
+
+
+def set_rectification_cache(cache: RectificationCache) -> None:
+    """Sets the process wide rectification cache, e.g. to persist the results
+    in a cache directory."""
+    global _DEFAULT_CACHE
+    _DEFAULT_CACHE = cache
+
+
+def load_stereo_rectification(
+    left: CameraCalibration,
+    right: CameraCalibration,
+    cache: RectificationCache | None = None,
+) -> StereoRectificationResult:
+    """Returns the stereo rectification for a pair of calibrations from a
+    cache. If no cache is given, the process wide cache is used."""
+
+    if cache is None:
+        cache: RectificationCache = get_rectification_cache()
+
+    return cache.rectify(Pair(first=left, second=right))
+
+
+def compute_calibration_hash(calibrations: Pair[CameraCalibration]) -> str:
+    """Computes a hash of the intrinsics, extrinsics, and image sizes of a
+    pair of camera calibrations."""
+
+    hasher = hashlib.sha256(CACHE_VERSION.encode())
+    for calibration in (calibrations.first, calibrations.second):
+        hasher.update(f"{calibration.width}x{calibration.height}".encode())
+        for name in CALIBRATION_FIELDS:
+            values: np.ndarray = np.ascontiguousarray(
+                getattr(calibration, name), dtype=np.float64
+            )
+            hasher.update(f"{name}{values.shape}".encode())
+            hasher.update(values.tobytes())
+
+    return hasher.hexdigest()
+
+
+def _pack_rectification(
+    result: StereoRectificationResult,
+) -> dict[str, np.ndarray]:
+    """Packs the computed parts of a rectification result into arrays. The
+    input calibrations are not stored since they determine the cache key."""
+
+    arrays: dict[str, np.ndarray] = {
+        "rotation": result.transforms.rotation,
+        "homography_first": result.transforms.homographies.first,
+        "homography_second": result.transforms.homographies.second,
+        "pixel_map_first": result.pixel_maps.first.data,
+        "pixel_map_second": result.pixel_maps.second.data,
+        "inverse_pixel_map_first": result.inverse_pixel_maps.first.data,
+        "inverse_pixel_map_second": result.inverse_pixel_maps.second.data,
+    }
+
+    for side in ("first", "second"):
+        calibration: CameraCalibration = getattr(
+            result.rectified_calibrations, side
+        )
+        arrays[f"size_{side}"] = np.array(
+            [calibration.width, calibration.height]
+        )
+        for name in CALIBRATION_FIELDS:
+            arrays[f"{name}_{side}"] = getattr(calibration, name)
+
+    return arrays
+
+
+def _unpack_rectification(
+    arrays: dict[str, np.ndarray],
+    calibrations: Pair[CameraCalibration],
+) -> StereoRectificationResult:
+    """Unpacks a rectification result from arrays."""
+
+    rectified: dict[str, CameraCalibration] = dict()
+    for side in ("first", "second"):
+        width, height = arrays[f"size_{side}"].tolist()
+        rectified[side] = CameraCalibration(
+            width=width,
+            height=height,
+            **{name: arrays[f"{name}_{side}"] for name in CALIBRATION_FIELDS},
+        )
+
+    return StereoRectificationResult(
+        calibrations=calibrations,
+        rectified_calibrations=Pair(**rectified),
+        pixel_maps=Pair(
+            first=PixelMap(arrays["pixel_map_first"]),
+            second=PixelMap(arrays["pixel_map_second"]),
+        ),
+        inverse_pixel_maps=Pair(
+            first=PixelMap(arrays["inverse_pixel_map_first"]),
+            second=PixelMap(arrays["inverse_pixel_map_second"]),
+        ),
+        transforms=StereoRectificationTransforms(
+            rotation=arrays["rotation"],
+            homographies=Pair(
+                first=arrays["homography_first"],
+                second=arrays["homography_second"],
+            ),
+        ),
+    )
@@ -45,11 +45,33 @@ def compute_stereo_geometry(
     """Computes range and normal maps for a rectified stereo setup, a disparity matcher, and
     a pair of images."""
 
-    rectified_calibrations: Pair[CameraCalibration] = (
-        rectification.rectified_calibrations
+    rectified_images: Pair[Image] = rectify_stereo_images(
+        rectification, images, image_filter
+    )
+
+    # Estimate disparity from rectified images
+    disparity_maps: Pair[np.ndarray] = matcher(
+        left=rectified_images.first,
+        right=rectified_images.second,
+    )
+
+    return compute_stereo_geometry_from_disparities(
+        rectification,
+        images,
+        rectified_images,
+        disparity_maps,
+        disparity_filter,
     )
 
-    # Rectify images
+
+def rectify_stereo_images(
+    rectification: StereoRectificationResult,
+    images: Pair[Image],
+    image_filter: Optional[ImageFilter] = None,
+) -> Pair[Image]:
+    """Rectifies a pair of images, and optionally filters the rectified
+    images."""
+
     rectified_images: Pair[Image] = rectify_image_pair(images, rectification)
 
     if image_filter:
@@ -58,10 +80,21 @@ def compute_stereo_geometry(
             second=image_filter(rectified_images.second),
         )
 
-    # Estimate disparity from rectified images
-    disparity_maps: Pair[np.ndarray] = matcher(
-        left=rectified_images.first,
-        right=rectified_images.second,
+    return rectified_images
+
+
+def compute_stereo_geometry_from_disparities(
+    rectification: StereoRectificationResult,
+    images: Pair[Image],
+    rectified_images: Pair[Image],
+    disparity_maps: Pair[np.ndarray],
+    disparity_filter: Optional[DisparityFilter] = None,
+) -> StereoGeometry:
+    """Computes range and normal maps from the disparities of a pair of
+    rectified images."""
+
+    rectified_calibrations: Pair[CameraCalibration] = (
+        rectification.rectified_calibrations
     )
 
     if disparity_filter:
@@ -125,7 +158,9 @@ def compute_stereo_geometry(
 def distort_stereo_geometry(
     geometry: StereoGeometry,
 ) -> tuple[Pair[Image], ...]:
-    """Distorts range and normal maps for the given stereo geometry."""
+    """Distorts range and normal maps for the given stereo geometry. The maps
+    are remapped with the fixed-point inverse pixel maps of the
+    rectification."""
 
     inverse_pixel_maps: Pair[PixelMap] = (
         geometry.rectification.inverse_pixel_maps
@@ -135,10 +170,12 @@ def distort_stereo_geometry(
         first=remap_image_pixels(
             image=geometry.range_maps.first,
             pixel_map=inverse_pixel_maps.first,
+            fixed_point=True,
         ),
         second=remap_image_pixels(
             image=geometry.range_maps.second,
             pixel_map=inverse_pixel_maps.second,
+            fixed_point=True,
         ),
     )
 
@@ -146,10 +183,12 @@ def distort_stereo_geometry(
         first=remap_image_pixels(
             image=geometry.normal_maps.first,
             pixel_map=inverse_pixel_maps.first,
+            fixed_point=True,
         ),
         second=remap_image_pixels(
             image=geometry.normal_maps.second,
             pixel_map=inverse_pixel_maps.second,
+            fixed_point=True,
         ),
     )
 
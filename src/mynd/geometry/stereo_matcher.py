@@ -9,3 +9,4 @@ from mynd.utils.containers import Pair
 
 
 StereoMatcher = Callable[[Image, Image], Pair[np.ndarray]]
+StereoBatchMatcher = Callable[[list[Pair[Image]]], list[Pair[np.ndarray]]]
@@ -252,12 +252,16 @@ def rectify_image_pair(
     images: Pair[Image],
     rectification: StereoRectificationResult,
 ) -> Pair[Image]:
-    """Rectifies two stereo images by appling the rectification map to them."""
+    """Rectifies two stereo images by appling the rectification map to them.
+    The images are remapped with fixed-point maps, since the same maps are
+    applied to every image pair of a stereo rig."""
 
     return Pair[Image](
-        first=remap_image_pixels(images.first, rectification.pixel_maps.first),
+        first=remap_image_pixels(
+            images.first, rectification.pixel_maps.first, fixed_point=True
+        ),
         second=remap_image_pixels(
-            images.second, rectification.pixel_maps.second
+            images.second, rectification.pixel_maps.second, fixed_point=True
         ),
     )
 
@@ -0,0 +1,45 @@
+"""Module for voxel pyramids, i.e. point clouds downsampled at several
+spacings where each level is derived from the next finer level."""
+
+from dataclasses import dataclass, field
+
+from .point_cloud import PointCloud
+from .point_cloud_processors import downsample_point_cloud
+
+
+@dataclass
+class VoxelPyramid:
+    """Class representing a voxel pyramid of a point cloud. Levels are keyed
+    by their voxel spacing, and are shared between callers, so they must not
+    be modified."""
+
+    levels: dict[float, PointCloud] = field(default_factory=dict)
+
+    @property
+    def spacings(self) -> list[float]:
+        """Returns the spacings of the pyramid levels from fine to coarse."""
+        return sorted(self.levels)
+
+    def level(self, spacing: float) -> PointCloud:
+        """Returns the downsampled point cloud for a spacing."""
+        if spacing not in self.levels:
+            raise KeyError(f"missing voxel pyramid level: {spacing}")
+        return self.levels.get(spacing)
+
+
+def build_voxel_pyramid(
+    cloud: PointCloud, spacings: list[float]
+) -> VoxelPyramid:
+    """Builds a voxel pyramid of a point cloud. Only the finest level is
+    downsampled from the input, and each coarser level is downsampled from
+    the level below it, so the input is only traversed once. Levels derived
+    this way are approximations of downsampling the input directly."""
+
+    levels: dict[float, PointCloud] = dict()
+
+    previous: PointCloud = cloud
+    for spacing in sorted(set(spacings)):
+        previous: PointCloud = downsample_point_cloud(previous, spacing)
+        levels[spacing] = previous
+
+    return VoxelPyramid(levels=levels)
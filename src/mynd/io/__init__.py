@@ -18,6 +18,7 @@ from .image_io import (
 from .point_cloud_io import (
     PointCloudLoader,
     read_point_cloud,
+    read_point_cloud_vertices,
     create_point_cloud_loader,
 )
 
@@ -30,5 +31,6 @@ __all__ = [
     "write_image",
     "PointCloudLoader",
     "read_point_cloud",
+    "read_point_cloud_vertices",
     "create_point_cloud_loader",
 ]
@@ -7,7 +7,7 @@ from mynd.camera import Sensor, CameraCalibration, StereoRig
 from mynd.collections import CameraGroup
 from mynd.geometry import (
     StereoRectificationResult,
-    compute_stereo_rectification,
+    load_stereo_rectification,
 )
 
 
@@ -162,7 +162,7 @@ def treeify_camera_calibration(calibration: CameraCalibration) -> dict:
 def treeify_stereo_rig(stereo: StereoRig) -> dict:
     """Converts a stereo camera and its rectification to a tree."""
 
-    rectification: StereoRectificationResult = compute_stereo_rectification(
+    rectification: StereoRectificationResult = load_stereo_rectification(
         left=stereo.sensors.first.calibration,
         right=stereo.sensors.second.calibration,
     )
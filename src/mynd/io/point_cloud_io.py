@@ -4,6 +4,9 @@ from pathlib import Path
 
 import open3d
 
+# NOTE: Some report memory bugs if numpy is import before open3d
+import numpy as np
+
 from mynd.geometry import PointCloud, PointCloudLoader
 from mynd.utils.result import Ok, Err, Result
 
@@ -25,3 +28,101 @@ def create_point_cloud_loader(source: str | Path) -> PointCloudLoader:
         return read_point_cloud(path=source)
 
     return wrapper
+
+
+PLY_TYPES: dict[str, str] = {
+    "char": "i1",
+    "int8": "i1",
+    "uchar": "u1",
+    "uint8": "u1",
+    "short": "i2",
+    "int16": "i2",
+    "ushort": "u2",
+    "uint16": "u2",
+    "int": "i4",
+    "int32": "i4",
+    "uint": "u4",
+    "uint32": "u4",
+    "float": "f4",
+    "float32": "f4",
+    "double": "f8",
+    "float64": "f8",
+}
+
+
+def read_point_cloud_vertices(path: str | Path) -> Result[np.ndarray, str]:
+    """Memory maps the vertices of a binary PLY file as a structured array,
+    so that point clouds larger than the available memory can be traversed
+    in chunks. Only files where the vertex element comes first and has no
+    list properties are supported."""
+
+    try:
+        with open(path, "rb") as handle:
+            header: list[str] = _read_ply_header(handle)
+            offset: int = handle.tell()
+    except (OSError, UnicodeDecodeError) as error:
+        return Err(str(error))
+
+    if not header or header[0] != "ply":
+        return Err(f"invalid ply file: {path}")
+
+    byte_order: str | None = None
+    count: int | None = None
+    fields: list[tuple[str, str]] = list()
+
+    for line in header[1:]:
+        tokens: list[str] = line.split()
+        match tokens:
+            case ["format", "binary_little_endian", _]:
+                byte_order = "<"
+            case ["format", "binary_big_endian", _]:
+                byte_order = ">"
+            case ["format", *_]:
+                return Err(f"unsupported ply format: {line}")
+            case ["element", "vertex", vertices] if count is None:
+                count = int(vertices)
+            case ["element", *_]:
+                if count is None:
+                    return Err("ply vertex element must come first")
+                break
+            case ["property", "list", *_]:
+                return Err("ply vertex list properties are not supported")
+            case ["property", kind, name] if kind in PLY_TYPES:
+                if byte_order is None:
+                    return Err("ply format must come before the properties")
+                fields.append((name, byte_order + PLY_TYPES.get(kind)))
+            case ["property", *_]:
+                return Err(f"unsupported ply property: {line}")
+
+    if byte_order is None or count is None:
+        return Err(f"missing ply format or vertex element: {path}")
+
+    try:
+        vertices: np.ndarray = np.memmap(
+            path,
+            dtype=np.dtype(fields),
+            mode="r",
+            offset=offset,
+            shape=(count,),
+        )
+    except (OSError, ValueError) as error:
+        return Err(str(error))
+
+    return Ok(vertices)
+
+
+def _read_ply_header(handle) -> list[str]:
+    """Reads the header lines of a PLY file, leaving the handle at the start
+    of the data."""
+
+    lines: list[str] = list()
+    while True:
+        line: bytes = handle.readline()
+        if not line:
+            return lines
+
+        text: str = line.decode("ascii").strip()
+        if text == "end_header":
+            return lines
+        if not text.startswith("comment"):
+            lines.append(text)
@@ -1,19 +1,41 @@
 """Package with functionality for registering point clouds."""
 
-from .batch import RegistrationBatch, register_batch
+from .batch import (
+    RegistrationBatch,
+    aggregate_batch_records,
+    register_batch,
+    register_one_to_many,
+)
+from .cache import (
+    LegacyConversionCache,
+    PointCloudCache,
+    PreprocessingCache,
+    PyramidCache,
+    TargetIndexCache,
+)
 
 from .data_types import (
     Feature,
+    InformationEstimator,
     RigidTransformation,
     RegistrationResult,
 )
 
+from .descriptor_index import (
+    DescriptorIndex,
+    build_descriptor_index,
+    compute_fpfh_descriptor,
+    generate_indices_descriptor,
+)
+
 from .feature_registrators import (
     extract_fpfh_features,
     register_features_fast,
     register_features_ransac,
 )
 
+from .feature_store import FeatureStore
+
 from .full_registrators import (
     build_pose_graph,
     optimize_pose_graph,
@@ -24,6 +46,26 @@ from .icp_registrators import (
     register_colored_icp,
 )
 
+from .instrumentation import (
+    PipelineRecord,
+    StageRecord,
+    StageSummary,
+    aggregate_pipeline_records,
+)
+
+from .numpy_registrators import (
+    NumpyICPCriteria,
+    create_numpy_icp_registrator,
+    register_numpy_icp,
+)
+
+from .overlap import (
+    OverlapSummary,
+    compute_overlap_summary,
+    compute_overlap_ratio,
+    generate_indices_overlap,
+)
+
 from .pipeline import (
     RegistrationPipeline,
     apply_registration_pipeline,
@@ -31,6 +73,35 @@ from .pipeline import (
 
 from .pipeline_builder import build_registration_pipeline
 
+from .pose_graph import IncrementalPoseGraph
+
+from .result_store import (
+    ResultStore,
+    compute_config_hash,
+    compute_file_fingerprint,
+)
+
+from .target_index import (
+    TargetIndex,
+    build_target_index,
+    compute_information_matrix,
+)
+
+from .plan import (
+    PlanModule,
+    PlanStep,
+    RegistrationPlan,
+    build_plan_processors,
+    compile_registration_plan,
+)
+
+from .tiled import (
+    TiledPointCloud,
+    read_tiled_point_cloud,
+    register_tiled,
+    tile_point_cloud,
+)
+
 from .registrator_types import (
     FeatureExtractor,
     FeatureMatcher,
@@ -42,28 +113,58 @@ from .utilities import (
     RegistrationIndex,
     generate_indices_one_way,
     generate_indices_cascade,
+    order_indices_by_reuse,
     log_registration_result,
 )
 
 
 __all__ = [
     "RegistrationBatch",
+    "aggregate_batch_records",
     "register_batch",
+    "register_one_to_many",
+    "LegacyConversionCache",
+    "PointCloudCache",
+    "PreprocessingCache",
+    "PyramidCache",
+    "TargetIndexCache",
     # ...
     "Feature",
+    "InformationEstimator",
     "RigidTransformation",
     "RegistrationResult",
     # ...
+    "DescriptorIndex",
+    "build_descriptor_index",
+    "compute_fpfh_descriptor",
+    "generate_indices_descriptor",
+    # ...
     "extract_fpfh_features",
     "register_features_fast",
     "register_features_ransac",
     # ...
+    "FeatureStore",
+    # ...
     "build_pose_graph",
     "optimize_pose_graph",
     # ...
     "register_regular_icp",
     "register_colored_icp",
     # ...
+    "PipelineRecord",
+    "StageRecord",
+    "StageSummary",
+    "aggregate_pipeline_records",
+    # ...
+    "NumpyICPCriteria",
+    "create_numpy_icp_registrator",
+    "register_numpy_icp",
+    # ...
+    "OverlapSummary",
+    "compute_overlap_summary",
+    "compute_overlap_ratio",
+    "generate_indices_overlap",
+    # ...
     "RegistrationPipeline",
     "RegistrationCallback",
     "apply_registration_pipeline",
@@ -74,6 +175,27 @@ __all__ = [
     "build_colored_icp_registrator",
     "build_registration_pipeline",
     # ...
+    "IncrementalPoseGraph",
+    # ...
+    "ResultStore",
+    "compute_config_hash",
+    "compute_file_fingerprint",
+    # ...
+    "TargetIndex",
+    "build_target_index",
+    "compute_information_matrix",
+    # ...
+    "PlanModule",
+    "PlanStep",
+    "RegistrationPlan",
+    "build_plan_processors",
+    "compile_registration_plan",
+    # ...
+    "TiledPointCloud",
+    "read_tiled_point_cloud",
+    "register_tiled",
+    "tile_point_cloud",
+    # ...
     "FeatureExtractor",
     "FeatureMatcher",
     "PointCloudAligner",
@@ -82,5 +204,6 @@ __all__ = [
     "RegistrationIndex",
     "generate_indices_one_way",
     "generate_indices_cascade",
+    "order_indices_by_reuse",
     "log_registration_result",
 ]
@@ -1,24 +1,43 @@
 """Module for batch registration."""
 
+import dataclasses
+import functools
+import multiprocessing
+
 from collections.abc import Callable
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
 from dataclasses import dataclass, field
 from typing import Generic, TypeAlias, TypeVar
 
 import tqdm
 
 from mynd.geometry import PointCloud, PointCloudLoader
+from mynd.utils.result import Ok, Err, Result
 
+from .cache import PointCloudCache, PreprocessingCache
 from .data_types import RegistrationResult
+from .instrumentation import StageSummary, aggregate_pipeline_records
 from .pipeline import RegistrationPipeline, apply_registration_pipeline
-from .utilities import RegistrationIndex
+from .result_store import ResultStore
+from .utilities import RegistrationIndex, generate_indices_one_way
 
 
 Key: TypeVar = TypeVar("Key")
+LoadResult: TypeAlias = Result[PointCloud, str]
 
 
 @dataclass(frozen=True)
 class RegistrationBatch(Generic[Key]):
-    """Class representing a registration batch."""
+    """Class representing a registration batch. If a correspondence limit is
+    given, pair results are compacted to at most that many correspondences as
+    they are registered, so that the memory held by the results depends on
+    the number of pairs rather than the size of the point clouds."""
 
     @dataclass(frozen=True)
     class PairResult:
@@ -36,6 +55,11 @@ class RegistrationBatch(Generic[Key]):
         sources: dict[Key, RegistrationResult]
 
     loaders: dict[Key, PointCloudLoader] = field(default_factory=dict)
+    cache: PointCloudCache[Key] | None = None
+    preprocessing: PreprocessingCache | None = None
+    store: ResultStore | None = None
+    fingerprints: dict[Key, str] = field(default_factory=dict)
+    correspondences: int | None = None
 
     def keys(self) -> list[Key]:
         """Returns the keys in the registration batch."""
@@ -45,6 +69,32 @@ class RegistrationBatch(Generic[Key]):
         """Returns the point cloud loader or none."""
         return self.loaders.get(key)
 
+    def load(self, key: Key) -> LoadResult:
+        """Loads a point cloud, through the cache if the batch has one."""
+
+        loader: PointCloudLoader | None = self.get(key)
+        if loader is None:
+            return Err(f"missing point cloud loader: {key}")
+
+        if self.cache is None:
+            return loader()
+
+        return self.cache.load(key, loader)
+
+    def store_key(self, target: Key, source: Key) -> str | None:
+        """Returns the result store key for a pair, or none if the batch has
+        no store or the pair is missing input fingerprints."""
+
+        if self.store is None:
+            return None
+
+        target_fingerprint: str | None = self.fingerprints.get(target)
+        source_fingerprint: str | None = self.fingerprints.get(source)
+        if target_fingerprint is None or source_fingerprint is None:
+            return None
+
+        return self.store.key(target_fingerprint, source_fingerprint)
+
 
 Batch: TypeAlias = RegistrationBatch
 Pipeline: TypeAlias = RegistrationPipeline
@@ -52,6 +102,10 @@ Index: TypeAlias = RegistrationIndex
 
 
 Callback: TypeAlias = Callable[[Key, Key, RegistrationResult], None]
+PairOutcome: TypeAlias = Result[Batch.PairResult, str]
+
+
+EXECUTORS: tuple[str] = ("sequential", "thread", "process")
 
 
 def register_batch(
@@ -59,31 +113,277 @@ def register_batch(
     pipeline: Pipeline,
     indices: list[Index],
     callback: Callback | None = None,
-) -> list[Batch.PairResult]:
-    """Registers a batch of point clouds with the given pipeline."""
+    executor: str = "sequential",
+    workers: int | None = None,
+) -> list[PairOutcome]:
+    """Registers a batch of point clouds with the given pipeline. Pairs can be
+    registered sequentially, or concurrently with a thread or process pool.
+    The results are returned in the same order as the indices, and pairs that
+    fail are returned as errors without interrupting the rest of the batch.
+    If the batch has point cloud or preprocessing caches, each process worker
+    holds its own copy of them. If the batch has a result store, pairs found
+    in the store are not registered again, and each registered pair is saved
+    to the store as it is completed."""
+
+    outcomes: dict[int, PairOutcome] = _load_stored_pairs(batch, indices)
+    pending: list[int] = [
+        position for position in range(len(indices)) if position not in outcomes
+    ]
+
+    if batch.store is not None:
+        callback: Callback = _create_store_callback(batch, callback)
+
+    registered: list[PairOutcome] = _register_indices(
+        batch,
+        pipeline,
+        [indices[position] for position in pending],
+        callback=callback,
+        executor=executor,
+        workers=workers,
+    )
+    outcomes.update(zip(pending, registered))
+
+    return [outcomes.get(position) for position in range(len(indices))]
+
+
+def register_one_to_many(
+    batch: Batch,
+    pipeline: Pipeline,
+    target: Key,
+    sources: list[Key] | None = None,
+    callback: Callback | None = None,
+    executor: str = "sequential",
+    workers: int | None = None,
+) -> list[PairOutcome]:
+    """Registers several sources in a batch to a common target, by default all
+    the other point clouds in the batch. The target is loaded once and its
+    preprocessed point clouds are shared across the sources through a
+    preprocessing cache, so that target search structures, e.g. the indices
+    of a target index cache, are built once rather than once per source."""
+
+    if sources is None:
+        sources: list[Key] = list(batch.keys())
+
+    indices: list[Index] = generate_indices_one_way(target, sources)
+
+    loaded: LoadResult = batch.load(target)
+    if loaded.is_err():
+        return [
+            Err(f"failed to load target {target}: {loaded.err()}")
+            for _ in indices
+        ]
+
+    # NOTE: Preprocessed point clouds are keyed by the identity of their
+    # input, so the loaded target is pinned for the duration of the batch
+    cloud: PointCloud = loaded.ok()
+    shared: Batch = dataclasses.replace(
+        batch,
+        loaders={**batch.loaders, target: lambda: Ok(cloud)},
+        preprocessing=batch.preprocessing or PreprocessingCache(),
+    )
+
+    return register_batch(
+        shared,
+        pipeline,
+        indices,
+        callback=callback,
+        executor=executor,
+        workers=workers,
+    )
+
+
+def aggregate_batch_records(outcomes: list[PairOutcome]) -> list[StageSummary]:
+    """Aggregates the pipeline records of the registered pairs in a batch into
+    a summary per pipeline stage. Failed pairs and pairs loaded from a result
+    store do not have records and are skipped."""
+    return aggregate_pipeline_records(
+        [outcome.ok().result.record for outcome in outcomes if outcome.is_ok()]
+    )
+
+
+def _register_indices(
+    batch: Batch,
+    pipeline: Pipeline,
+    indices: list[Index],
+    callback: Callback | None = None,
+    executor: str = "sequential",
+    workers: int | None = None,
+) -> list[PairOutcome]:
+    """Registers the given pairs of a batch with an executor."""
+
+    match executor:
+        case "sequential":
+            return _register_batch_sequential(
+                batch, pipeline, indices, callback
+            )
+        case "thread":
+            pool: Executor = ThreadPoolExecutor(max_workers=workers)
+            task: Callable[[Index], PairOutcome] = functools.partial(
+                _register_pair, batch, pipeline
+            )
+        case "process":
+            # NOTE: Pipelines and loaders are closures and can not be pickled,
+            # so we fork the workers and let them inherit the batch state
+            pool: Executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=_initialize_worker,
+                initargs=(batch, pipeline),
+            )
+            task: Callable[[Index], PairOutcome] = _register_pair_in_worker
+        case _:
+            raise NotImplementedError(
+                f"invalid batch executor - valid options are: {EXECUTORS}"
+            )
+
+    with pool:
+        return _register_batch_concurrent(pool, task, indices, callback)
+
+
+def _load_stored_pairs(
+    batch: Batch, indices: list[Index]
+) -> dict[int, PairOutcome]:
+    """Loads the stored results for pairs in a batch, keyed by position."""
+
+    outcomes: dict[int, PairOutcome] = dict()
+    for position, index in enumerate(indices):
+        key: str | None = batch.store_key(index.target, index.source)
+        if key is None:
+            continue
+
+        result: RegistrationResult | None = batch.store.load(key)
+        if result is None:
+            continue
+
+        outcomes[position] = Ok(
+            Batch.PairResult(
+                target=index.target, source=index.source, result=result
+            )
+        )
+
+    return outcomes
+
+
+def _create_store_callback(
+    batch: Batch, callback: Callback | None = None
+) -> Callback:
+    """Creates a callback that saves completed pairs to the batch store
+    before invoking the given callback."""
+
+    def store_callback(
+        target: Key, source: Key, result: RegistrationResult
+    ) -> None:
+        """Saves a registration result to the batch store."""
+        key: str | None = batch.store_key(target, source)
+        if key is not None:
+            batch.store.save(
+                key, result, subsample=batch.correspondences or 0
+            )
+
+        if callback is not None:
+            callback(target, source, result)
+
+    return store_callback
+
+
+def _register_batch_sequential(
+    batch: Batch,
+    pipeline: Pipeline,
+    indices: list[Index],
+    callback: Callback | None = None,
+) -> list[PairOutcome]:
+    """Registers a batch of point clouds one pair at a time."""
 
-    results: list[Batch.PairResult] = list()
+    results: list[PairOutcome] = list()
     for index in tqdm.tqdm(indices, desc="registering batch..."):
+        pairwise: PairOutcome = _register_pair(batch, pipeline, index)
+
+        if pairwise.is_ok() and callback is not None:
+            callback(index.target, index.source, pairwise.ok().result)
+
+        results.append(pairwise)
+
+    return results
+
+
+def _register_batch_concurrent(
+    pool: Executor,
+    task: Callable[[Index], PairOutcome],
+    indices: list[Index],
+    callback: Callback | None = None,
+) -> list[PairOutcome]:
+    """Registers a batch of point clouds by submitting each pair to a pool.
+    Callbacks are invoked in the calling thread as pairs are completed."""
+
+    futures: dict[Future, int] = {
+        pool.submit(task, index): position
+        for position, index in enumerate(indices)
+    }
+
+    results: list[PairOutcome | None] = [None] * len(indices)
+    for future in tqdm.tqdm(
+        as_completed(futures), total=len(futures), desc="registering batch..."
+    ):
+        position: int = futures.get(future)
+        index: Index = indices[position]
+
+        try:
+            pairwise: PairOutcome = future.result()
+        except Exception as error:
+            pairwise: PairOutcome = Err(_format_pair_error(index, error))
+
+        if pairwise.is_ok() and callback is not None:
+            callback(index.target, index.source, pairwise.ok().result)
+
+        results[position] = pairwise
+
+    return results
 
-        target_loader: PointCloudLoader = batch.get(index.target)
-        target_cloud: PointCloud = target_loader().unwrap()
 
-        source_loader: PointCloudLoader = batch.get(index.source)
-        source_cloud: PointCloud = source_loader().unwrap()
+def _register_pair(
+    batch: Batch, pipeline: Pipeline, index: Index
+) -> PairOutcome:
+    """Loads and registers a single pair of point clouds."""
+
+    try:
+        target_cloud: PointCloud = batch.load(index.target).unwrap()
+        source_cloud: PointCloud = batch.load(index.source).unwrap()
 
         result: RegistrationResult = apply_registration_pipeline(
             pipeline,
             target=target_cloud,
             source=source_cloud,
+            cache=batch.preprocessing,
         )
 
-        if callback is not None:
-            callback(index.target, index.source, result)
+        if batch.correspondences is not None:
+            result.compact(subsample=batch.correspondences)
+    except Exception as error:
+        return Err(_format_pair_error(index, error))
 
-        pairwise: Batch.PairResult = Batch.PairResult(
+    return Ok(
+        Batch.PairResult(
             target=index.target, source=index.source, result=result
         )
+    )
 
-        results.append(pairwise)
 
-    return results
+def _format_pair_error(index: Index, error: Exception) -> str:
+    """Formats an error message for a failed registration pair."""
+    return f"failed to register {index.source} to {index.target}: {error!r}"
+
+
+_worker_state: dict = dict()
+
+
+def _initialize_worker(batch: Batch, pipeline: Pipeline) -> None:
+    """Initializes a registration worker process with the batch state."""
+    _worker_state["batch"] = batch
+    _worker_state["pipeline"] = pipeline
+
+
+def _register_pair_in_worker(index: Index) -> PairOutcome:
+    """Registers a pair in a worker process using the inherited batch state."""
+    return _register_pair(
+        _worker_state.get("batch"), _worker_state.get("pipeline"), index
+    )
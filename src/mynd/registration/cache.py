@@ -0,0 +1,501 @@
+"""Module for caching point clouds during batch registration."""
+
+import threading
+import time
+import weakref
+
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Generic, Hashable, TypeVar
+
+import numpy as np
+
+from mynd.geometry import (
+    PointCloud,
+    PointCloudLoader,
+    PointCloudProcessor,
+    TensorPointCloud,
+    VoxelPyramid,
+    build_voxel_pyramid,
+)
+from mynd.utils.result import Ok, Result
+
+from .target_index import TargetIndex, build_target_index
+
+
+Key: TypeVar = TypeVar("Key")
+
+TENSOR_ATTRIBUTES: tuple[str] = (
+    "positions",
+    "colors",
+    "normals",
+    "covariances",
+)
+
+
+@dataclass
+class PointCloudCache(Generic[Key]):
+    """Class representing a least recently used point cloud cache with a
+    memory budget in bytes. Cached point clouds are shared between callers, so
+    processors applied to them must not operate in place. Concurrent requests
+    for a point cloud that is being loaded wait for the first load instead of
+    loading it again."""
+
+    @dataclass
+    class Statistics:
+        """Class representing point cloud cache statistics."""
+
+        hits: int = 0
+        misses: int = 0
+        waits: int = 0
+        evictions: int = 0
+        evicted_bytes: int = 0
+
+        @property
+        def requests(self) -> int:
+            """Returns the number of cache requests."""
+            return self.hits + self.misses + self.waits
+
+        @property
+        def hit_rate(self) -> float:
+            """Returns the ratio of requests served without loading, either
+            from the cache or by waiting for a concurrent load."""
+            if self.requests == 0:
+                return 0.0
+            return (self.hits + self.waits) / self.requests
+
+    budget: int
+    statistics: Statistics = field(default_factory=Statistics)
+
+    _entries: OrderedDict = field(default_factory=OrderedDict, repr=False)
+    _sizes: dict = field(default_factory=dict, repr=False)
+    _loading: dict[Key, Future] = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __len__(self) -> int:
+        """Returns the number of cached point clouds."""
+        return len(self._entries)
+
+    def __contains__(self, key: Key) -> bool:
+        """Returns true if the point cloud is cached."""
+        return key in self._entries
+
+    @property
+    def size(self) -> int:
+        """Returns the number of bytes held by the cache."""
+        return sum(self._sizes.values())
+
+    def load(
+        self, key: Key, loader: PointCloudLoader
+    ) -> Result[PointCloud, str]:
+        """Returns a cached point cloud, or loads and caches it. If the point
+        cloud is already being loaded by another caller, the result of that
+        load is returned instead."""
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.statistics.hits += 1
+                return Ok(self._entries[key])
+
+            loading: Future | None = self._loading.get(key)
+            if loading is not None:
+                self.statistics.waits += 1
+            else:
+                self.statistics.misses += 1
+                future: Future = Future()
+                self._loading[key] = future
+
+        # NOTE: Callers that miss on a point cloud that is being loaded wait
+        # for the first load, so that a point cloud is never decoded twice
+        if loading is not None:
+            return loading.result()
+
+        try:
+            result: Result[PointCloud, str] = loader()
+            if result.is_ok():
+                self.insert(key, result.ok())
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            with self._lock:
+                self._loading.pop(key, None)
+
+        return result
+
+    def insert(self, key: Key, cloud: PointCloud) -> None:
+        """Inserts a point cloud and evicts the least recently used point
+        clouds until the cache is within its budget. Point clouds larger than
+        the budget are not cached."""
+
+        size: int = estimate_point_cloud_bytes(cloud)
+        if size > self.budget:
+            return
+
+        with self._lock:
+            self._entries[key] = cloud
+            self._entries.move_to_end(key)
+            self._sizes[key] = size
+
+            while self.size > self.budget:
+                evicted, _ = self._entries.popitem(last=False)
+                self.statistics.evictions += 1
+                self.statistics.evicted_bytes += self._sizes.pop(evicted)
+
+    def clear(self) -> None:
+        """Removes all point clouds from the cache."""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+
+
+@dataclass
+class PreprocessingCache:
+    """Class representing a least recently used cache of preprocessed point
+    clouds. Entries are keyed by the identity of the input point cloud and the
+    preprocessor parameters, and are discarded when the input point cloud is
+    deleted. If a memory budget in bytes is given, the least recently used
+    entries are evicted to stay within it."""
+
+    @dataclass
+    class Statistics:
+        """Class representing preprocessing cache statistics."""
+
+        hits: int = 0
+        misses: int = 0
+        evictions: int = 0
+        evicted_bytes: int = 0
+        elapsed_seconds: float = 0.0
+        saved_seconds: float = 0.0
+
+        @property
+        def requests(self) -> int:
+            """Returns the number of cache requests."""
+            return self.hits + self.misses
+
+    @dataclass
+    class Entry:
+        """Class representing a preprocessing cache entry."""
+
+        reference: weakref.ref
+        processed: PointCloud
+        elapsed_seconds: float
+        size: int
+
+    budget: int | None = None
+    statistics: Statistics = field(default_factory=Statistics)
+
+    _entries: OrderedDict = field(default_factory=OrderedDict, repr=False)
+    _lock: threading.RLock = field(default_factory=threading.RLock, repr=False)
+
+    def __len__(self) -> int:
+        """Returns the number of cached point clouds."""
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """Returns the number of bytes held by the cache."""
+        return sum(entry.size for entry in self._entries.values())
+
+    def preprocess(
+        self,
+        cloud: PointCloud,
+        preprocessor: PointCloudProcessor,
+        parameters: Hashable,
+    ) -> PointCloud:
+        """Returns the preprocessed point cloud from the cache, or applies the
+        preprocessor and caches the result."""
+
+        key: tuple = (id(cloud), parameters)
+
+        with self._lock:
+            entry: PreprocessingCache.Entry | None = self._entries.get(key)
+            if entry is not None and entry.reference() is cloud:
+                self._entries.move_to_end(key)
+                self.statistics.hits += 1
+                self.statistics.saved_seconds += entry.elapsed_seconds
+                return entry.processed
+
+            self.statistics.misses += 1
+
+        start: float = time.perf_counter()
+        processed: PointCloud = preprocessor(cloud)
+        elapsed: float = time.perf_counter() - start
+
+        with self._lock:
+            self.statistics.elapsed_seconds += elapsed
+
+        # NOTE: Caching a point cloud that references its input would keep
+        # the input alive, so pass-through preprocessors are not cached
+        if processed is cloud:
+            return processed
+
+        size: int = estimate_point_cloud_bytes(processed)
+        if self.budget is not None and size > self.budget:
+            return processed
+
+        with self._lock:
+            self._entries[key] = PreprocessingCache.Entry(
+                reference=weakref.ref(cloud, partial(self._discard, key)),
+                processed=processed,
+                elapsed_seconds=elapsed,
+                size=size,
+            )
+            self._entries.move_to_end(key)
+            self._evict()
+
+        return processed
+
+    def clear(self) -> None:
+        """Removes all preprocessed point clouds from the cache."""
+        with self._lock:
+            self._entries.clear()
+
+    def _evict(self) -> None:
+        """Evicts the least recently used entries until the cache is within
+        its budget."""
+        if self.budget is None:
+            return
+
+        while self.size > self.budget:
+            _, evicted = self._entries.popitem(last=False)
+            self.statistics.evictions += 1
+            self.statistics.evicted_bytes += evicted.size
+
+    def _discard(self, key: tuple, reference: weakref.ref) -> None:
+        """Discards the entry of a deleted input point cloud."""
+        with self._lock:
+            entry: PreprocessingCache.Entry | None = self._entries.get(key)
+            if entry is not None and entry.reference is reference:
+                self._entries.pop(key)
+
+
+@dataclass
+class PyramidCache:
+    """Class representing a cache of voxel pyramids with a fixed set of
+    spacings. Pyramids are keyed by the identity of the input point cloud, and
+    are only valid while the input point cloud is alive."""
+
+    @dataclass
+    class Statistics:
+        """Class representing pyramid cache statistics."""
+
+        hits: int = 0
+        misses: int = 0
+
+    @dataclass
+    class Entry:
+        """Class representing a pyramid cache entry."""
+
+        reference: weakref.ref
+        pyramid: VoxelPyramid
+
+    spacings: tuple[float, ...]
+    statistics: Statistics = field(default_factory=Statistics)
+
+    _entries: dict = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __len__(self) -> int:
+        """Returns the number of cached pyramids."""
+        return len(self._entries)
+
+    def pyramid(self, cloud: PointCloud) -> VoxelPyramid:
+        """Returns the voxel pyramid of a point cloud from the cache, or builds
+        and caches it."""
+
+        key: int = id(cloud)
+
+        with self._lock:
+            entry: PyramidCache.Entry | None = self._entries.get(key)
+            if entry is not None and entry.reference() is cloud:
+                self.statistics.hits += 1
+                return entry.pyramid
+
+            self.statistics.misses += 1
+
+        pyramid: VoxelPyramid = build_voxel_pyramid(cloud, self.spacings)
+
+        with self._lock:
+            expired: list[int] = [
+                other
+                for other, entry in self._entries.items()
+                if entry.reference() is None
+            ]
+            for other in expired:
+                self._entries.pop(other)
+
+            self._entries[key] = PyramidCache.Entry(
+                reference=weakref.ref(cloud), pyramid=pyramid
+            )
+
+        return pyramid
+
+    def clear(self) -> None:
+        """Removes all pyramids from the cache."""
+        with self._lock:
+            self._entries.clear()
+
+
+@dataclass
+class TargetIndexCache:
+    """Class representing a cache of registration target indices. Indices are
+    keyed by the identity of the target point cloud, and are only valid while
+    the target point cloud is alive. When a target is registered with several
+    sources, e.g. through a preprocessing cache, its index is built once."""
+
+    @dataclass
+    class Statistics:
+        """Class representing target index cache statistics."""
+
+        hits: int = 0
+        misses: int = 0
+
+    @dataclass
+    class Entry:
+        """Class representing a target index cache entry."""
+
+        reference: weakref.ref
+        index: TargetIndex
+
+    statistics: Statistics = field(default_factory=Statistics)
+
+    _entries: dict = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __len__(self) -> int:
+        """Returns the number of cached indices."""
+        return len(self._entries)
+
+    def index(self, cloud: PointCloud) -> TargetIndex:
+        """Returns the target index of a point cloud from the cache, or builds
+        and caches it."""
+
+        key: int = id(cloud)
+
+        with self._lock:
+            entry: TargetIndexCache.Entry | None = self._entries.get(key)
+            if entry is not None and entry.reference() is cloud:
+                self.statistics.hits += 1
+                return entry.index
+
+            self.statistics.misses += 1
+
+        index: TargetIndex = build_target_index(cloud)
+
+        with self._lock:
+            expired: list[int] = [
+                other
+                for other, entry in self._entries.items()
+                if entry.reference() is None
+            ]
+            for other in expired:
+                self._entries.pop(other)
+
+            self._entries[key] = TargetIndexCache.Entry(
+                reference=weakref.ref(cloud), index=index
+            )
+
+        return index
+
+    def clear(self) -> None:
+        """Removes all indices from the cache."""
+        with self._lock:
+            self._entries.clear()
+
+
+@dataclass
+class LegacyConversionCache:
+    """Class representing a cache of legacy copies of tensor point clouds.
+    Copies are keyed by the identity of the tensor point cloud, and are
+    discarded when the tensor point cloud is deleted."""
+
+    @dataclass
+    class Statistics:
+        """Class representing legacy conversion cache statistics."""
+
+        hits: int = 0
+        misses: int = 0
+
+    @dataclass
+    class Entry:
+        """Class representing a legacy conversion cache entry."""
+
+        reference: weakref.ref
+        legacy: PointCloud
+
+    statistics: Statistics = field(default_factory=Statistics)
+
+    _entries: dict = field(default_factory=dict, repr=False)
+    _lock: threading.RLock = field(default_factory=threading.RLock, repr=False)
+
+    def __len__(self) -> int:
+        """Returns the number of cached point clouds."""
+        return len(self._entries)
+
+    def convert(self, cloud: TensorPointCloud) -> PointCloud:
+        """Returns the legacy copy of a tensor point cloud from the cache, or
+        converts and caches it."""
+
+        key: int = id(cloud)
+
+        with self._lock:
+            entry: LegacyConversionCache.Entry | None = self._entries.get(key)
+            if entry is not None and entry.reference() is cloud:
+                self.statistics.hits += 1
+                return entry.legacy
+
+            self.statistics.misses += 1
+
+        legacy: PointCloud = cloud.to_legacy()
+
+        with self._lock:
+            self._entries[key] = LegacyConversionCache.Entry(
+                reference=weakref.ref(cloud, partial(self._discard, key)),
+                legacy=legacy,
+            )
+
+        return legacy
+
+    def clear(self) -> None:
+        """Removes all legacy point clouds from the cache."""
+        with self._lock:
+            self._entries.clear()
+
+    def _discard(self, key: int, reference: weakref.ref) -> None:
+        """Discards the entry of a deleted tensor point cloud."""
+        with self._lock:
+            entry: LegacyConversionCache.Entry | None = self._entries.get(key)
+            if entry is not None and entry.reference is reference:
+                self._entries.pop(key)
+
+
+def estimate_point_cloud_bytes(cloud: PointCloud) -> int:
+    """Estimates the number of bytes held by the point cloud attributes."""
+
+    if isinstance(cloud, TensorPointCloud):
+        return sum(
+            cloud.point[name].num_elements()
+            * cloud.point[name].dtype.byte_size()
+            for name in TENSOR_ATTRIBUTES
+            if name in cloud.point
+        )
+
+    count: int = len(cloud.points)
+    vector_bytes: int = 3 * np.dtype(np.float64).itemsize
+    matrix_bytes: int = 9 * np.dtype(np.float64).itemsize
+
+    size: int = count * vector_bytes
+    if cloud.has_colors():
+        size += count * vector_bytes
+    if cloud.has_normals():
+        size += count * vector_bytes
+    if cloud.has_covariances():
+        size += count * matrix_bytes
+
+    return size
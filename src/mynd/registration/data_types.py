@@ -1,10 +1,13 @@
 """Module for registration data types."""
 
+from collections.abc import Callable, Mapping
 from dataclasses import dataclass
+from typing import TypeAlias
 
 import numpy as np
 import open3d
 
+from .instrumentation import PipelineRecord
 
 Feature = open3d.pipelines.registration.Feature
 
@@ -12,12 +15,171 @@ Feature = open3d.pipelines.registration.Feature
 RigidTransformation = np.ndarray
 
 
+InformationEstimator: TypeAlias = Callable[[], np.ndarray]
+
+
+class _LazyInformation:
+    """Descriptor for an information matrix that can be given as an estimator,
+    in which case it is computed on first access."""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        """Sets the name of the attribute that holds the value."""
+        self.attribute: str = f"_{name}"
+
+    def __get__(
+        self, instance: object, owner: type | None = None
+    ) -> np.ndarray:
+        """Returns the information matrix, computing it if necessary."""
+        # NOTE: Raising on class access tells dataclasses that the field does
+        # not have a default value
+        if instance is None:
+            raise AttributeError(self.attribute)
+
+        value: np.ndarray | InformationEstimator = getattr(
+            instance, self.attribute
+        )
+        if callable(value):
+            value: np.ndarray = value()
+            setattr(instance, self.attribute, value)
+        return value
+
+    def __set__(
+        self, instance: object, value: np.ndarray | InformationEstimator
+    ) -> None:
+        """Sets the information matrix or its estimator."""
+        setattr(instance, self.attribute, value)
+
+
 @dataclass
 class RegistrationResult:
-    """Class representing registration results including the information matrix."""
+    """Class representing registration results including the information matrix.
+    The information matrix can be given as an estimator, in which case it is
+    computed on first access. The iteration count and the reason for
+    termination are only set by registrators that expose them, and the record
+    is set by registration pipelines. The correspondence count is kept when a
+    result is compacted, i.e. when its correspondence set is reduced to a
+    subsample."""
 
     fitness: float
     inlier_rmse: float
     correspondence_set: np.ndarray
     transformation: np.ndarray
-    information: np.ndarray
+    information: np.ndarray | InformationEstimator = _LazyInformation()
+    iterations: int | None = None
+    termination: str | None = None
+    record: PipelineRecord | None = None
+    correspondence_count: int | None = None
+
+    def __post_init__(self) -> None:
+        """Counts the correspondences if the count is not given."""
+        if self.correspondence_count is None:
+            self.correspondence_count = len(self.correspondence_set)
+
+    @property
+    def has_information(self) -> bool:
+        """Returns true if the information matrix has been computed."""
+        return not callable(self._information)
+
+    def compute_information(self) -> np.ndarray:
+        """Computes the information matrix if it has not been computed, and
+        releases the estimator along with the point clouds it references."""
+        return self.information
+
+    @property
+    def is_compact(self) -> bool:
+        """Returns true if the correspondence set is a subsample."""
+        return len(self.correspondence_set) < self.correspondence_count
+
+    def compact(
+        self, subsample: int = 0, seed: int = 0
+    ) -> "RegistrationResult":
+        """Compacts the result in place by computing the information matrix and
+        keeping at most a random subsample of the correspondences, so that the
+        result size does not depend on the size of the point clouds."""
+
+        self.compute_information()
+        self.correspondence_set = _subsample_rows(
+            self.correspondence_set, subsample, seed
+        )
+        return self
+
+    def to_arrays(self, subsample: int | None = None) -> dict[str, np.ndarray]:
+        """Serializes the result into a dictionary of arrays, e.g. for storage
+        with numpy.savez. If a subsample size is given, at most that many
+        correspondences are serialized. The pipeline record is not
+        serialized."""
+
+        correspondences: np.ndarray = np.asarray(
+            self.correspondence_set, dtype=np.int64
+        ).reshape(-1, 2)
+        if subsample is not None:
+            correspondences = _subsample_rows(correspondences, subsample)
+
+        return {
+            "fitness": np.asarray(self.fitness),
+            "inlier_rmse": np.asarray(self.inlier_rmse),
+            "correspondence_set": correspondences,
+            "correspondence_count": np.asarray(self.correspondence_count),
+            "transformation": np.asarray(self.transformation),
+            "information": self.information,
+            "iterations": np.asarray(
+                -1 if self.iterations is None else self.iterations
+            ),
+            "termination": np.asarray(self.termination or ""),
+        }
+
+    @classmethod
+    def from_arrays(
+        cls, arrays: Mapping[str, np.ndarray]
+    ) -> "RegistrationResult":
+        """Deserializes a result from a dictionary of arrays. Optional arrays
+        that are missing, e.g. from results written by earlier versions, are
+        given default values."""
+
+        correspondences: np.ndarray = (
+            np.asarray(arrays["correspondence_set"])
+            if "correspondence_set" in arrays
+            else np.empty((0, 2), dtype=np.int64)
+        )
+
+        iterations: int = (
+            int(arrays["iterations"]) if "iterations" in arrays else -1
+        )
+        termination: str = (
+            str(arrays["termination"]) if "termination" in arrays else ""
+        )
+
+        return cls(
+            fitness=float(arrays["fitness"]),
+            inlier_rmse=float(arrays["inlier_rmse"]),
+            correspondence_set=correspondences,
+            transformation=np.asarray(arrays["transformation"]),
+            information=np.asarray(arrays["information"]),
+            iterations=None if iterations < 0 else iterations,
+            termination=termination or None,
+            correspondence_count=(
+                int(arrays["correspondence_count"])
+                if "correspondence_count" in arrays
+                else len(correspondences)
+            ),
+        )
+
+    def __getstate__(self) -> dict:
+        """Returns the state of the result with the information matrix computed,
+        since estimators can not be pickled."""
+        self.compute_information()
+        return self.__dict__.copy()
+
+
+def _subsample_rows(array: np.ndarray, count: int, seed: int = 0) -> np.ndarray:
+    """Returns a random subsample of at most the given number of rows, in
+    their original order."""
+
+    if len(array) <= count:
+        return array
+
+    generator: np.random.Generator = np.random.default_rng(seed)
+    rows: np.ndarray = np.sort(
+        generator.choice(len(array), count, replace=False)
+    )
+    return np.array(array[rows])
@@ -0,0 +1,150 @@
+"""Module for global point cloud descriptors and similarity retrieval."""
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+import open3d.geometry as geom
+import open3d.pipelines.registration as reg
+
+# NOTE: Some report memory bugs if numpy is import before open3d
+import numpy as np
+
+from scipy.spatial import cKDTree
+
+from mynd.geometry import PointCloud
+
+from .utilities import RegistrationIndex
+
+
+T: TypeVar = TypeVar("T")
+
+
+FPFH_BINS: int = 33
+
+
+def compute_fpfh_descriptor(
+    cloud: PointCloud,
+    voxel_size: float,
+    radius: float,
+    neighbours: int = 100,
+) -> np.ndarray:
+    """Computes a global descriptor of a point cloud by aggregating the fast
+    point feature histograms (FPFH) of a downsampled copy, i.e. the mean and
+    standard deviation of each histogram bin. The descriptor is normalized to
+    unit length, and is invariant to rigid transformations of the cloud."""
+
+    downsampled: PointCloud = cloud.voxel_down_sample(voxel_size=voxel_size)
+    downsampled.estimate_normals(
+        search_param=geom.KDTreeSearchParamHybrid(
+            radius=2.0 * voxel_size, max_nn=30
+        )
+    )
+
+    features: np.ndarray = np.asarray(
+        reg.compute_fpfh_feature(
+            input=downsampled,
+            search_param=geom.KDTreeSearchParamHybrid(
+                radius=radius, max_nn=neighbours
+            ),
+        ).data
+    ).T
+
+    if len(features) == 0:
+        return np.zeros(2 * FPFH_BINS)
+
+    descriptor: np.ndarray = np.concatenate(
+        [features.mean(axis=0), features.std(axis=0)]
+    )
+    return _normalize(descriptor)
+
+
+@dataclass(frozen=True)
+class DescriptorIndex(Generic[T]):
+    """Class representing a retrieval index over global point cloud
+    descriptors. Descriptors are stored in a KD-tree, so that the most similar
+    items are found in sub-linear time."""
+
+    keys: list[T]
+    descriptors: np.ndarray
+    tree: cKDTree
+
+    def __len__(self) -> int:
+        """Returns the number of items in the index."""
+        return len(self.keys)
+
+    def query(
+        self,
+        descriptor: np.ndarray,
+        count: int,
+        max_distance: float = np.inf,
+    ) -> list[tuple[T, float]]:
+        """Returns the keys and descriptor distances of the most similar items,
+        ordered from the most to the least similar."""
+
+        count: int = min(count, len(self.keys))
+        if count == 0:
+            return list()
+
+        distances, positions = self.tree.query(
+            _normalize(descriptor),
+            k=count,
+            distance_upper_bound=max_distance,
+        )
+
+        return [
+            (self.keys[position], float(distance))
+            for distance, position in zip(
+                np.atleast_1d(distances), np.atleast_1d(positions)
+            )
+            if np.isfinite(distance)
+        ]
+
+
+def build_descriptor_index(
+    descriptors: Mapping[T, np.ndarray],
+) -> DescriptorIndex[T]:
+    """Builds a retrieval index from the global descriptors of items."""
+
+    keys: list[T] = list(descriptors.keys())
+    matrix: np.ndarray = np.stack(
+        [_normalize(descriptors.get(key)) for key in keys]
+    )
+    return DescriptorIndex(keys=keys, descriptors=matrix, tree=cKDTree(matrix))
+
+
+def generate_indices_descriptor(
+    descriptors: Mapping[T, np.ndarray],
+    count: int,
+    max_distance: float = np.inf,
+) -> list[RegistrationIndex]:
+    """Generates registration indices by pairing each item with its most
+    similar items by global descriptor. Pairs are deduplicated and ordered as
+    for cascaded indices, i.e. the target is the item that comes first."""
+
+    index: DescriptorIndex[T] = build_descriptor_index(descriptors)
+    positions: dict[T, int] = {key: pos for pos, key in enumerate(index.keys)}
+
+    pairs: set[tuple[int, int]] = set()
+    for position in range(len(index)):
+        # NOTE: The item itself is the nearest match, so we query one extra
+        matches: list[tuple[T, float]] = index.query(
+            index.descriptors[position], count + 1, max_distance=max_distance
+        )
+
+        for match, _ in matches:
+            other: int = positions.get(match)
+            if other != position:
+                pairs.add((min(position, other), max(position, other)))
+
+    return [
+        RegistrationIndex(target=index.keys[first], source=index.keys[second])
+        for first, second in sorted(pairs)
+    ]
+
+
+def _normalize(descriptor: np.ndarray) -> np.ndarray:
+    """Normalizes a descriptor to unit length."""
+    descriptor: np.ndarray = np.asarray(descriptor, dtype=float)
+    norm: float = np.linalg.norm(descriptor)
+    return descriptor / norm if norm > 0.0 else descriptor
@@ -1,8 +1,12 @@
 """Module for point cloud processors, i.e. including filters for spacing and confidence."""
 
 import functools
-import copy
+import math
+import time
 
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TypeAlias
 
 import open3d.geometry as geom
 import open3d.pipelines.registration as reg
@@ -12,12 +16,14 @@ import numpy as np
 
 from mynd.geometry import PointCloud
 
-from .data_types import Feature, RegistrationResult
+from .data_types import Feature, InformationEstimator, RegistrationResult
+from .feature_store import FeatureStore, create_feature_key
 from .registrator_types import (
     FeatureExtractor,
     FeatureMatcher,
     PointCloudAligner,
 )
+from .utilities import create_information_estimator
 
 
 def extract_fpfh_features(
@@ -77,13 +83,11 @@ def match_fast_wrapper(
         )
     )
 
-    information_matrix: np.ndarray = (
-        reg.get_information_matrix_from_point_clouds(
-            source=source,
-            target=target,
-            max_correspondence_distance=distance_threshold,
-            transformation=result.transformation,
-        )
+    information: InformationEstimator = create_information_estimator(
+        source=source,
+        target=target,
+        distance_threshold=distance_threshold,
+        transformation=result.transformation,
     )
 
     return RegistrationResult(
@@ -91,7 +95,7 @@ def match_fast_wrapper(
         inlier_rmse=result.inlier_rmse,
         correspondence_set=np.asarray(result.correspondence_set),
         transformation=result.transformation,
-        information=information_matrix,
+        information=information,
     )
 
 
@@ -117,6 +121,20 @@ def register_features_fast(
     )
 
 
+@dataclass(frozen=True)
+class RANSACBudget:
+    """Class representing a budget for RANSAC matching. RANSAC is run in chunks
+    of iterations, and stops when the iteration cap is reached, when the
+    confidence of the best result is reached, when the wall time exceeds the
+    time limit, or when the best fitness has not improved for the given
+    number of iterations. Features are matched again for each
+    chunk, so chunks should be large enough to amortize the matching."""
+
+    seconds: float | None = None
+    stagnation: int | None = None
+    chunk: int = 100000
+
+
 def match_features_ransac(
     source: PointCloud,
     target: PointCloud,
@@ -128,11 +146,17 @@ def match_features_ransac(
     distance_threshold: float,
     sample_count: int = 3,
     mutual_filter: bool = True,
+    budget: RANSACBudget | None = None,
 ) -> RegistrationResult:
-    """Wrapper function for Open3D feature based RANSAC registration method."""
-
-    result: reg.RegistrationResult = (
-        reg.registration_ransac_based_on_feature_matching(
+    """Wrapper function for Open3D feature based RANSAC registration method. If
+    a budget is given, RANSAC is run in chunks and the best result is kept.
+    The reason for termination is recorded in the result."""
+
+    def run_ransac(
+        criteria: reg.RANSACConvergenceCriteria,
+    ) -> reg.RegistrationResult:
+        """Runs Open3D RANSAC with the given convergence criteria."""
+        return reg.registration_ransac_based_on_feature_matching(
             source=source,
             target=target,
             source_feature=source_features,
@@ -142,17 +166,23 @@ def match_features_ransac(
             ransac_n=sample_count,
             estimation_method=estimation_method,
             checkers=validators,
-            criteria=convergence_criteria,
+            criteria=criteria,
         )
-    )
 
-    information_matrix: np.ndarray = (
-        reg.get_information_matrix_from_point_clouds(
-            source=source,
-            target=target,
-            max_correspondence_distance=distance_threshold,
-            transformation=result.transformation,
+    if budget is None:
+        result: reg.RegistrationResult = run_ransac(convergence_criteria)
+        iterations: int | None = None
+        termination: str = "completed"
+    else:
+        result, iterations, termination = _run_ransac_with_budget(
+            run_ransac, convergence_criteria, budget, sample_count
         )
+
+    information: InformationEstimator = create_information_estimator(
+        source=source,
+        target=target,
+        distance_threshold=distance_threshold,
+        transformation=result.transformation,
     )
 
     return RegistrationResult(
@@ -160,10 +190,92 @@ def match_features_ransac(
         inlier_rmse=result.inlier_rmse,
         correspondence_set=np.asarray(result.correspondence_set),
         transformation=result.transformation,
-        information=information_matrix,
+        information=information,
+        iterations=iterations,
+        termination=termination,
     )
 
 
+RANSACRunner: TypeAlias = Callable[
+    [reg.RANSACConvergenceCriteria], reg.RegistrationResult
+]
+
+
+def _run_ransac_with_budget(
+    run_ransac: RANSACRunner,
+    convergence_criteria: reg.RANSACConvergenceCriteria,
+    budget: RANSACBudget,
+    sample_count: int = 3,
+) -> tuple[reg.RegistrationResult, int, str]:
+    """Runs RANSAC in chunks of iterations within a budget. Returns the result
+    with the best fitness, the number of iterations run and the reason for
+    termination. Iterations are counted in whole chunks, and confidence based
+    exits within a chunk are not visible, so the count is an upper bound."""
+
+    start: float = time.perf_counter()
+
+    best: reg.RegistrationResult | None = None
+    iterations: int = 0
+    stagnant: int = 0
+
+    while iterations < convergence_criteria.max_iteration:
+        chunk: int = min(
+            budget.chunk, convergence_criteria.max_iteration - iterations
+        )
+        result: reg.RegistrationResult = run_ransac(
+            reg.RANSACConvergenceCriteria(
+                max_iteration=chunk,
+                confidence=convergence_criteria.confidence,
+            )
+        )
+        iterations += chunk
+
+        if best is None or result.fitness > best.fitness:
+            best: reg.RegistrationResult = result
+            stagnant: int = 0
+        else:
+            stagnant += chunk
+
+        # NOTE: Open3D exits a chunk early once the confidence of its best
+        # result is reached, which is not visible in the result. Applying the
+        # same test to the iterations run so far stops the loop where an
+        # unbudgeted run would have stopped
+        required: float = _estimate_ransac_iterations(
+            best.fitness, convergence_criteria.confidence, sample_count
+        )
+        if iterations >= required:
+            return best, iterations, "converged"
+
+        if budget.seconds is not None:
+            if time.perf_counter() - start >= budget.seconds:
+                return best, iterations, "time_budget"
+
+        if budget.stagnation is not None and stagnant >= budget.stagnation:
+            return best, iterations, "stagnation"
+
+    return best, iterations, "completed"
+
+
+def _estimate_ransac_iterations(
+    fitness: float, confidence: float, sample_count: int
+) -> float:
+    """Estimates the number of RANSAC iterations required to reach the given
+    confidence for a result with the given fitness, with the same estimate as
+    Open3D uses for early exits."""
+
+    if confidence >= 1.0 or fitness <= 0.0:
+        return math.inf
+    if fitness >= 1.0:
+        return 0.0
+
+    # NOTE: Fitness values close to zero give a vanishing hit probability
+    probability: float = fitness**sample_count
+    if probability <= 0.0:
+        return math.inf
+
+    return math.log(1.0 - confidence) / math.log1p(-probability)
+
+
 def register_features_ransac(
     source: PointCloud,
     target: PointCloud,
@@ -174,11 +286,11 @@ def register_features_ransac(
     distance_threshold: float,
     sample_count: int = 3,
     mutual_filter: bool = True,
+    budget: RANSACBudget | None = None,
 ) -> RegistrationResult:
-    """Extracts features and performs registration with RANSAC matching."""
-
-    source: PointCloud = copy.deepcopy(source)
-    target: PointCloud = copy.deepcopy(target)
+    """Extracts features and performs registration with RANSAC matching. Neither
+    feature extraction nor matching modifies the point clouds, so they are
+    used without copying."""
 
     source_features: Feature = feature_extractor(input=source)
     target_features: Feature = feature_extractor(input=target)
@@ -194,6 +306,7 @@ def register_features_ransac(
         distance_threshold=distance_threshold,
         sample_count=sample_count,
         mutual_filter=mutual_filter,
+        budget=budget,
     )
 
 
@@ -202,6 +315,7 @@ Factories functions:
  - create_correspondence_validators
  - create_fpfh_extractor
  - create_ransac_convergence_criteria
+ - create_ransac_budget
  - create_ransac_registrator
  - create_point_to_point_estimator
  - create_point_to_plane_estimator
@@ -231,14 +345,33 @@ def create_correspondence_validators(
     return validators
 
 
-def create_fpfh_extractor(radius: float, neighbours: int) -> FeatureExtractor:
-    """Creates a FPFH feature extractor."""
+def create_fpfh_extractor(
+    radius: float,
+    neighbours: int,
+    store: FeatureStore | None = None,
+) -> FeatureExtractor:
+    """Creates a FPFH feature extractor. If a feature store is given, features
+    are loaded from the store when available and saved to it otherwise."""
 
     def feature_extractor_wrapper(input: PointCloud) -> Feature:
-        return extract_fpfh_features(
-            input=input, radius=radius, neighbours=neighbours
+        if store is None:
+            return extract_fpfh_features(
+                input=input, radius=radius, neighbours=neighbours
+            )
+
+        key: str = create_feature_key(
+            input, "fpfh", radius=radius, neighbours=neighbours
         )
 
+        feature: Feature | None = store.load(key)
+        if feature is None:
+            feature: Feature = extract_fpfh_features(
+                input=input, radius=radius, neighbours=neighbours
+            )
+            store.save(key, feature)
+
+        return feature
+
     return feature_extractor_wrapper
 
 
@@ -252,6 +385,15 @@ def create_ransac_convergence_criteria(
     )
 
 
+def create_ransac_budget(
+    seconds: float | None = None,
+    stagnation: int | None = None,
+    chunk: int = 100000,
+) -> RANSACBudget:
+    """Creates a RANSAC budget."""
+    return RANSACBudget(seconds=seconds, stagnation=stagnation, chunk=chunk)
+
+
 def create_ransac_registrator(
     feature_extractor: FeatureExtractor,
     estimation_method: reg.TransformationEstimation,
@@ -260,6 +402,7 @@ def create_ransac_registrator(
     distance_threshold: float,
     sample_count: int = 3,
     mutual_filter: bool = True,
+    budget: RANSACBudget | None = None,
 ) -> PointCloudAligner:
     """Creates a wrapper around a RANSAC registrator."""
 
@@ -279,6 +422,7 @@ def create_ransac_registrator(
             distance_threshold=distance_threshold,
             sample_count=sample_count,
             mutual_filter=mutual_filter,
+            budget=budget,
         )
 
     return ransac_registrator_wrapper
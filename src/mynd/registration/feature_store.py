@@ -0,0 +1,116 @@
+"""Module for persistent storage of point cloud features."""
+
+import hashlib
+import os
+import tempfile
+import threading
+import zipfile
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import open3d.pipelines.registration as reg
+
+# NOTE: Some report memory bugs if numpy is import before open3d
+import numpy as np
+
+from mynd.geometry import PointCloud
+from mynd.utils.log import logger
+
+from .data_types import Feature
+
+
+@dataclass
+class FeatureStore:
+    """Class representing a content-addressed feature store. Features are
+    stored as compressed arrays in a directory, with file names derived from
+    the point cloud content and the feature parameters."""
+
+    @dataclass
+    class Statistics:
+        """Class representing feature store statistics."""
+
+        hits: int = 0
+        misses: int = 0
+
+    directory: Path
+    statistics: Statistics = field(default_factory=Statistics)
+
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __post_init__(self) -> None:
+        """Creates the store directory if it does not exist."""
+        self.directory = Path(self.directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def path(self, key: str) -> Path:
+        """Returns the file path for a feature key."""
+        return self.directory / f"{key}.npz"
+
+    def load(self, key: str) -> Feature | None:
+        """Loads a feature from the store, or returns none if it is missing
+        or can not be read."""
+
+        path: Path = self.path(key)
+
+        try:
+            with np.load(path) as archive:
+                data: np.ndarray = archive["data"]
+        except FileNotFoundError:
+            self._count(hit=False)
+            return None
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile) as error:
+            logger.warning(f"failed to read feature file {path}: {error}")
+            self._count(hit=False)
+            return None
+
+        self._count(hit=True)
+
+        feature: Feature = reg.Feature()
+        feature.data = data
+        return feature
+
+    def save(self, key: str, feature: Feature) -> None:
+        """Saves a feature to the store. The file is written to a temporary
+        path and renamed, so concurrent readers never see partial files."""
+
+        handle, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as file:
+                np.savez_compressed(file, data=np.asarray(feature.data))
+            os.replace(temporary, self.path(key))
+        except OSError as error:
+            logger.warning(f"failed to write feature file: {error}")
+            Path(temporary).unlink(missing_ok=True)
+
+    def _count(self, hit: bool) -> None:
+        """Updates the store statistics."""
+        with self._lock:
+            if hit:
+                self.statistics.hits += 1
+            else:
+                self.statistics.misses += 1
+
+
+def compute_point_cloud_hash(cloud: PointCloud) -> str:
+    """Computes a hash of the point cloud points and normals. Since features
+    are extracted from preprocessed point clouds, the hash also reflects the
+    preprocessor configuration."""
+
+    hasher = hashlib.sha256()
+    hasher.update(np.ascontiguousarray(cloud.points).tobytes())
+    if cloud.has_normals():
+        hasher.update(np.ascontiguousarray(cloud.normals).tobytes())
+
+    return hasher.hexdigest()
+
+
+def create_feature_key(cloud: PointCloud, name: str, **parameters) -> str:
+    """Creates a feature store key from a point cloud and feature parameters."""
+
+    hasher = hashlib.sha256(compute_point_cloud_hash(cloud).encode())
+    hasher.update(name.encode())
+    for parameter, value in sorted(parameters.items()):
+        hasher.update(f"{parameter}={value!r}".encode())
+
+    return hasher.hexdigest()
@@ -7,8 +7,10 @@ import numpy as np
 
 from mynd.geometry import PointCloud
 
-from .data_types import RegistrationResult
+from .cache import TargetIndexCache
+from .data_types import InformationEstimator, RegistrationResult
 from .registrator_types import PointCloudRefiner
+from .utilities import create_information_estimator
 
 
 def create_icp_convergence_criteria(
@@ -56,8 +58,11 @@ def create_regular_icp_registrator(
     estimation_method: reg.TransformationEstimation,
     convergence_criteria: reg.ICPConvergenceCriteria,
     distance_threshold: float,
+    indices: TargetIndexCache | None = None,
 ) -> PointCloudRefiner:
-    """Creates a regular ICP registrator from the given arguments."""
+    """Creates a regular ICP registrator from the given arguments. If a target
+    index cache is given, information matrices are computed with the cached
+    index of the target."""
 
     def regular_icp_wrapper(
         source: PointCloud,
@@ -72,6 +77,7 @@ def create_regular_icp_registrator(
             estimation_method=estimation_method,
             convergence_criteria=convergence_criteria,
             distance_threshold=distance_threshold,
+            indices=indices,
         )
 
     return regular_icp_wrapper
@@ -81,8 +87,11 @@ def create_colored_icp_registrator(
     estimation_method: reg.TransformationEstimation,
     convergence_criteria: reg.ICPConvergenceCriteria,
     distance_threshold: float,
+    indices: TargetIndexCache | None = None,
 ) -> PointCloudRefiner:
-    """Creates a colored ICP registrator from the given arguments."""
+    """Creates a colored ICP registrator from the given arguments. If a target
+    index cache is given, information matrices are computed with the cached
+    index of the target."""
 
     def colored_icp_wrapper(
         source: PointCloud,
@@ -97,6 +106,7 @@ def create_colored_icp_registrator(
             estimation_method=estimation_method,
             convergence_criteria=convergence_criteria,
             distance_threshold=distance_threshold,
+            indices=indices,
         )
 
     return colored_icp_wrapper
@@ -127,9 +137,12 @@ def register_regular_icp(
     distance_threshold: float,
     estimation_method: reg.TransformationEstimation = reg.TransformationEstimationPointToPlane(),
     convergence_criteria: reg.ICPConvergenceCriteria = reg.ICPConvergenceCriteria(),
+    indices: TargetIndexCache | None = None,
 ) -> RegistrationResult:
     """Registers the source to the target with ICP."""
 
+    # NOTE: Open3D builds a target KD-tree inside every call, so only the
+    # information matrix can reuse a cached target index
     result: reg.RegistrationResult = reg.registration_icp(
         source=source,
         target=target,
@@ -139,17 +152,18 @@ def register_regular_icp(
         criteria=convergence_criteria,
     )
 
-    information: np.ndarray = reg.get_information_matrix_from_point_clouds(
+    information: InformationEstimator = create_information_estimator(
         source=source,
         target=target,
-        max_correspondence_distance=distance_threshold,
+        distance_threshold=distance_threshold,
         transformation=result.transformation,
+        indices=indices,
     )
 
     return RegistrationResult(
         fitness=result.fitness,
         inlier_rmse=result.inlier_rmse,
-        correspondence_set=result.correspondence_set,
+        correspondence_set=np.asarray(result.correspondence_set),
         transformation=result.transformation,
         information=information,
     )
@@ -163,9 +177,12 @@ def register_colored_icp(
     distance_threshold: float,
     estimation_method: reg.TransformationEstimation = reg.TransformationEstimationForColoredICP(),
     convergence_criteria: reg.ICPConvergenceCriteria = reg.ICPConvergenceCriteria(),
+    indices: TargetIndexCache | None = None,
 ) -> RegistrationResult:
     """Registers the source to the target with ICP."""
 
+    # NOTE: Open3D builds a target KD-tree and color gradients inside every
+    # call, so only the information matrix can reuse a cached target index
     result: reg.RegistrationResult = reg.registration_colored_icp(
         source=source,
         target=target,
@@ -175,17 +192,18 @@ def register_colored_icp(
         criteria=convergence_criteria,
     )
 
-    information: np.ndarray = reg.get_information_matrix_from_point_clouds(
+    information: InformationEstimator = create_information_estimator(
         source=source,
         target=target,
-        max_correspondence_distance=distance_threshold,
+        distance_threshold=distance_threshold,
         transformation=result.transformation,
+        indices=indices,
     )
 
     return RegistrationResult(
         fitness=result.fitness,
         inlier_rmse=result.inlier_rmse,
-        correspondence_set=result.correspondence_set,
+        correspondence_set=np.asarray(result.correspondence_set),
         transformation=result.transformation,
         information=information,
     )
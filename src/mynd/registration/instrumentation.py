@@ -0,0 +1,155 @@
+"""Module for instrumentation of registration pipelines."""
+
+import resource
+import sys
+import time
+
+from dataclasses import asdict, dataclass, field
+
+from mynd.geometry import PointCloud, TensorPointCloud
+
+
+@dataclass
+class StageRecord:
+    """Class representing the statistics of a registration pipeline stage.
+    Iterations are only reported by registrators that expose them. The
+    process peak is the peak resident set size of the process so far at the
+    end of the stage, which includes earlier stages and pairs, while the peak
+    growth is how much the stage raised that peak."""
+
+    name: str
+    kind: str
+    preprocess_seconds: float = 0.0
+    register_seconds: float = 0.0
+    source_points: int = 0
+    target_points: int = 0
+    iterations: int | None = None
+    termination: str | None = None
+    process_peak_mb: float = 0.0
+    peak_growth_mb: float = 0.0
+    fitness: float = 0.0
+    inlier_rmse: float = 0.0
+
+    @property
+    def seconds(self) -> float:
+        """Returns the total wall time of the stage."""
+        return self.preprocess_seconds + self.register_seconds
+
+
+@dataclass
+class PipelineRecord:
+    """Class representing the statistics of a registration pipeline
+    application. The process peak is the peak resident set size of the
+    process so far at the end of the application."""
+
+    stages: list[StageRecord] = field(default_factory=list)
+    seconds: float = 0.0
+    process_peak_mb: float = 0.0
+
+    def to_dict(self) -> dict:
+        """Returns the record as a dictionary of builtin types."""
+        return asdict(self)
+
+
+@dataclass
+class StageSummary:
+    """Class representing aggregated statistics of a pipeline stage across
+    several pipeline applications."""
+
+    name: str
+    kind: str
+    count: int = 0
+    preprocess_seconds: float = 0.0
+    register_seconds: float = 0.0
+    max_seconds: float = 0.0
+    source_points: int = 0
+    target_points: int = 0
+    iterations: int = 0
+    process_peak_mb: float = 0.0
+    peak_growth_mb: float = 0.0
+
+    @property
+    def seconds(self) -> float:
+        """Returns the total wall time of the stage."""
+        return self.preprocess_seconds + self.register_seconds
+
+    @property
+    def mean_seconds(self) -> float:
+        """Returns the mean wall time of the stage."""
+        return self.seconds / self.count if self.count else 0.0
+
+    def to_dict(self) -> dict:
+        """Returns the summary as a dictionary of builtin types."""
+        return {
+            **asdict(self),
+            "seconds": self.seconds,
+            "mean_seconds": self.mean_seconds,
+        }
+
+
+def aggregate_pipeline_records(
+    records: list[PipelineRecord | None],
+) -> list[StageSummary]:
+    """Aggregates pipeline records, e.g. from the results of a batch, into a
+    summary per stage. Stages are keyed by their position and name, and
+    missing records, e.g. for results loaded from a store, are skipped."""
+
+    summaries: dict[tuple[int, str], StageSummary] = dict()
+    for record in records:
+        if record is None:
+            continue
+
+        for position, stage in enumerate(record.stages):
+            key: tuple[int, str] = (position, stage.name)
+            if key not in summaries:
+                summaries[key] = StageSummary(name=stage.name, kind=stage.kind)
+
+            summary: StageSummary = summaries.get(key)
+            summary.count += 1
+            summary.preprocess_seconds += stage.preprocess_seconds
+            summary.register_seconds += stage.register_seconds
+            summary.max_seconds = max(summary.max_seconds, stage.seconds)
+            summary.source_points += stage.source_points
+            summary.target_points += stage.target_points
+            summary.iterations += stage.iterations or 0
+            summary.process_peak_mb = max(
+                summary.process_peak_mb, stage.process_peak_mb
+            )
+            summary.peak_growth_mb = max(
+                summary.peak_growth_mb, stage.peak_growth_mb
+            )
+
+    return [summaries.get(key) for key in sorted(summaries)]
+
+
+class Stopwatch:
+    """Class representing a stopwatch that measures wall time in seconds."""
+
+    def __init__(self) -> None:
+        """Initializes and starts the stopwatch."""
+        self._start: float = time.perf_counter()
+
+    def lap(self) -> float:
+        """Returns the time since the last lap and restarts the stopwatch."""
+        now: float = time.perf_counter()
+        elapsed: float = now - self._start
+        self._start = now
+        return elapsed
+
+
+def get_peak_memory_megabytes() -> float:
+    """Returns the peak resident set size of the process so far in
+    megabytes."""
+    peak: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # NOTE: The peak resident set size is in bytes on macOS and in kilobytes
+    # on Linux
+    if sys.platform == "darwin":
+        return peak / 1024**2
+    return peak / 1024
+
+
+def count_points(cloud: PointCloud | TensorPointCloud) -> int:
+    """Returns the number of points in a legacy or tensor point cloud."""
+    if isinstance(cloud, TensorPointCloud):
+        return int(cloud.point.positions.shape[0])
+    return len(cloud.points)
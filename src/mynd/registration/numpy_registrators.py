@@ -0,0 +1,253 @@
+"""Module for point cloud registrators implemented with NumPy and SciPy."""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from scipy.spatial.transform import Rotation
+
+from mynd.geometry import PointCloud
+
+from .cache import TargetIndexCache
+from .data_types import RegistrationResult
+from .registrator_types import PointCloudRefiner
+from .target_index import (
+    TargetIndex,
+    build_target_index,
+    compute_correspondence_information,
+)
+
+
+@dataclass(frozen=True)
+class NumpyICPCriteria:
+    """Class representing convergence criteria for NumPy ICP. Iterations stop
+    when the update step or the relative change in inlier RMSE falls below
+    its threshold."""
+
+    max_iteration: int = 30
+    relative_rmse: float = 1e-6
+    step_tolerance: float = 1e-8
+
+
+def create_numpy_icp_registrator(
+    distance_threshold: float,
+    criteria: NumpyICPCriteria = NumpyICPCriteria(),
+    sample_count: int | None = None,
+    huber_k: float | None = None,
+    workers: int = -1,
+    seed: int = 0,
+    indices: TargetIndexCache | None = None,
+) -> PointCloudRefiner:
+    """Creates a NumPy point-to-plane ICP registrator from the given
+    arguments. If a target index cache is given, the KD-tree of a target is
+    built once and reused for every source registered to it."""
+
+    def numpy_icp_wrapper(
+        source: PointCloud,
+        target: PointCloud,
+        transformation: np.ndarray,
+    ) -> RegistrationResult:
+        """Closure wrapper for NumPy ICP registration method."""
+        return register_numpy_icp(
+            source=source,
+            target=target,
+            transformation=transformation,
+            distance_threshold=distance_threshold,
+            criteria=criteria,
+            sample_count=sample_count,
+            huber_k=huber_k,
+            workers=workers,
+            seed=seed,
+            indices=indices,
+        )
+
+    return numpy_icp_wrapper
+
+
+"""
+Worker functions:
+ - register_numpy_icp
+"""
+
+
+def register_numpy_icp(
+    source: PointCloud,
+    target: PointCloud,
+    transformation: np.ndarray,
+    *,
+    distance_threshold: float,
+    criteria: NumpyICPCriteria = NumpyICPCriteria(),
+    sample_count: int | None = None,
+    huber_k: float | None = None,
+    workers: int = -1,
+    seed: int = 0,
+    indices: TargetIndexCache | None = None,
+) -> RegistrationResult:
+    """Registers the source to the target with point-to-plane ICP. Nearest
+    neighbours are found with a KD-tree queried by several workers, and the
+    normal equations are assembled for all correspondences at once. If a
+    sample count is given, a new random subset of source points is matched in
+    each iteration. If a Huber parameter is given, residuals are weighted with
+    a Huber kernel. The target must have normals."""
+
+    if not target.has_normals():
+        raise ValueError("numpy icp requires a target with normals")
+
+    if indices is None:
+        index: TargetIndex = build_target_index(target)
+    else:
+        index: TargetIndex = indices.index(target)
+
+    source_points: np.ndarray = np.asarray(source.points)
+    generator: np.random.Generator = np.random.default_rng(seed)
+
+    transformation: np.ndarray = np.array(transformation, dtype=float)
+    previous_rmse: float = np.inf
+    iterations: int = 0
+
+    for iterations in range(1, criteria.max_iteration + 1):
+        points: np.ndarray = _sample_points(
+            source_points, sample_count, generator
+        )
+        points: np.ndarray = _transform_points(points, transformation)
+
+        distances, nearest = index.query(points, distance_threshold, workers)
+        valid: np.ndarray = np.isfinite(distances)
+        if np.count_nonzero(valid) < 6:
+            break
+
+        step, rmse = _solve_point_to_plane(
+            points[valid],
+            index.points[nearest[valid]],
+            index.normals[nearest[valid]],
+            huber_k=huber_k,
+        )
+
+        transformation: np.ndarray = _exponential_map(step) @ transformation
+
+        converged: bool = (
+            np.linalg.norm(step) < criteria.step_tolerance
+            or abs(previous_rmse - rmse)
+            < criteria.relative_rmse * max(previous_rmse, 1e-12)
+        )
+        previous_rmse: float = rmse
+        if converged:
+            break
+
+    return _evaluate_registration(
+        source,
+        index,
+        transformation,
+        distance_threshold=distance_threshold,
+        iterations=iterations,
+        workers=workers,
+    )
+
+
+def _sample_points(
+    points: np.ndarray,
+    sample_count: int | None,
+    generator: np.random.Generator,
+) -> np.ndarray:
+    """Samples a random subset of points without replacement, or returns all
+    the points if there are fewer than the sample count."""
+    if sample_count is None or len(points) <= sample_count:
+        return points
+    return points[generator.choice(len(points), sample_count, replace=False)]
+
+
+def _transform_points(
+    points: np.ndarray, transformation: np.ndarray
+) -> np.ndarray:
+    """Applies a rigid transformation to an array of points."""
+    return points @ transformation[:3, :3].T + transformation[:3, 3]
+
+
+def _solve_point_to_plane(
+    sources: np.ndarray,
+    targets: np.ndarray,
+    normals: np.ndarray,
+    huber_k: float | None = None,
+) -> tuple[np.ndarray, float]:
+    """Solves the linearized point-to-plane problem for a set of
+    correspondences. Returns the update step as a rotation vector and
+    translation, and the inlier RMSE before the update."""
+
+    residuals: np.ndarray = np.einsum("ij,ij->i", sources - targets, normals)
+
+    # NOTE: Each row is the derivative of a residual with respect to a small
+    # rotation and translation, i.e. [p x n, n]
+    jacobian: np.ndarray = np.hstack([np.cross(sources, normals), normals])
+
+    if huber_k is None:
+        weights: np.ndarray = np.ones_like(residuals)
+    else:
+        magnitudes: np.ndarray = np.abs(residuals)
+        weights: np.ndarray = np.where(
+            magnitudes <= huber_k, 1.0, huber_k / np.maximum(magnitudes, 1e-12)
+        )
+
+    weighted: np.ndarray = jacobian * weights[:, None]
+    hessian: np.ndarray = weighted.T @ jacobian
+    gradient: np.ndarray = weighted.T @ residuals
+
+    try:
+        step: np.ndarray = -np.linalg.solve(hessian, gradient)
+    except np.linalg.LinAlgError:
+        step: np.ndarray = -np.linalg.lstsq(hessian, gradient, rcond=None)[0]
+
+    rmse: float = float(np.sqrt(np.mean(residuals**2)))
+    return step, rmse
+
+
+def _exponential_map(step: np.ndarray) -> np.ndarray:
+    """Converts an update step, i.e. a rotation vector and a translation, into
+    a rigid transformation."""
+    transformation: np.ndarray = np.identity(4)
+    transformation[:3, :3] = Rotation.from_rotvec(step[:3]).as_matrix()
+    transformation[:3, 3] = step[3:]
+    return transformation
+
+
+def _evaluate_registration(
+    source: PointCloud,
+    index: TargetIndex,
+    transformation: np.ndarray,
+    distance_threshold: float,
+    iterations: int,
+    workers: int = -1,
+) -> RegistrationResult:
+    """Evaluates a transformation with all the source points, and creates a
+    registration result with the fitness, inlier RMSE and correspondences."""
+
+    points: np.ndarray = _transform_points(
+        np.asarray(source.points), transformation
+    )
+
+    distances, nearest = index.query(points, distance_threshold, workers)
+    valid: np.ndarray = np.isfinite(distances)
+
+    correspondences: np.ndarray = np.stack(
+        [np.flatnonzero(valid), nearest[valid]], axis=1
+    )
+
+    if len(points) == 0 or not np.any(valid):
+        fitness, inlier_rmse = 0.0, 0.0
+    else:
+        fitness: float = float(np.count_nonzero(valid) / len(points))
+        inlier_rmse: float = float(np.sqrt(np.mean(distances[valid] ** 2)))
+
+    # NOTE: The information matrix is computed with the same correspondences
+    # as the result, so it is not deferred
+    information: np.ndarray = compute_correspondence_information(
+        index.points[correspondences[:, 1]]
+    )
+
+    return RegistrationResult(
+        fitness=fitness,
+        inlier_rmse=inlier_rmse,
+        correspondence_set=correspondences,
+        transformation=transformation,
+        information=information,
+        iterations=iterations,
+    )
@@ -0,0 +1,155 @@
+"""Module for spatial overlap estimation between point clouds."""
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import TypeVar
+
+import open3d
+
+# NOTE: Some report memory bugs if numpy is import before open3d
+import numpy as np
+
+from mynd.geometry import PointCloud
+
+from .utilities import RegistrationIndex
+
+
+T: TypeVar = TypeVar("T")
+
+
+VOXEL_BITS: int = 21
+
+
+@dataclass(frozen=True)
+class OverlapSummary:
+    """Class representing a compact spatial summary of a point cloud, i.e. an
+    oriented bounding box and the set of occupied voxels at a coarse
+    resolution."""
+
+    center: np.ndarray
+    rotation: np.ndarray
+    extent: np.ndarray
+    voxels: np.ndarray
+    voxel_size: float
+
+
+def compute_overlap_summary(
+    cloud: PointCloud, voxel_size: float
+) -> OverlapSummary:
+    """Computes an overlap summary of a point cloud. The occupied voxels are
+    stored as unique integer voxel coordinates."""
+
+    box: open3d.geometry.OrientedBoundingBox = (
+        cloud.get_oriented_bounding_box()
+    )
+
+    points: np.ndarray = np.asarray(cloud.points)
+    coordinates: np.ndarray = np.floor(points / voxel_size).astype(np.int64)
+
+    return OverlapSummary(
+        center=np.asarray(box.center),
+        rotation=np.asarray(box.R),
+        extent=np.asarray(box.extent),
+        voxels=np.unique(coordinates, axis=0),
+        voxel_size=voxel_size,
+    )
+
+
+def compute_overlap_ratio(
+    first: OverlapSummary, second: OverlapSummary
+) -> float:
+    """Computes the overlap ratio between two summaries, i.e. the fraction of
+    occupied voxels of the smaller summary that are occupied in both."""
+
+    assert (
+        first.voxel_size == second.voxel_size
+    ), "overlap summaries must have the same voxel size"
+
+    smallest: int = min(len(first.voxels), len(second.voxels))
+    if smallest == 0:
+        return 0.0
+
+    if not _boxes_intersect(first, second, margin=first.voxel_size):
+        return 0.0
+
+    # NOTE: Voxels are packed relative to a shared origin, so that world scale
+    # coordinates fit in the packed fields
+    origin: np.ndarray = np.minimum(
+        first.voxels.min(axis=0), second.voxels.min(axis=0)
+    )
+    shared: np.ndarray = np.intersect1d(
+        _pack_voxels(first.voxels - origin),
+        _pack_voxels(second.voxels - origin),
+        assume_unique=True,
+    )
+    return len(shared) / smallest
+
+
+def generate_indices_overlap(
+    summaries: Mapping[T, OverlapSummary],
+    threshold: float,
+) -> list[RegistrationIndex]:
+    """Generates cascaded registration indices for the pairs of items with an
+    overlap ratio above the threshold. Items are paired in the same order as
+    for cascaded indices, and pairs with disjoint bounding boxes are rejected
+    without comparing their voxels."""
+
+    items: list[T] = list(summaries.keys())
+
+    indices: list[RegistrationIndex] = list()
+    for index, target in enumerate(items[:-1]):
+        for source in items[index + 1 :]:
+            ratio: float = compute_overlap_ratio(
+                summaries.get(target), summaries.get(source)
+            )
+
+            if ratio >= threshold:
+                indices.append(RegistrationIndex(target=target, source=source))
+
+    return indices
+
+
+def _pack_voxels(coordinates: np.ndarray) -> np.ndarray:
+    """Packs non-negative integer voxel coordinates into a single integer per
+    voxel."""
+
+    assert np.all(coordinates >= 0), "voxel coordinates must be non-negative"
+    assert np.all(
+        coordinates < (1 << VOXEL_BITS)
+    ), f"voxel span exceeds {1 << VOXEL_BITS} voxels - increase voxel size"
+
+    return (
+        (coordinates[:, 0] << (2 * VOXEL_BITS))
+        | (coordinates[:, 1] << VOXEL_BITS)
+        | coordinates[:, 2]
+    )
+
+
+def _boxes_intersect(
+    first: OverlapSummary, second: OverlapSummary, margin: float = 0.0
+) -> bool:
+    """Tests if the oriented bounding boxes of two summaries intersect with
+    the separating axis theorem, with the boxes grown by a margin."""
+
+    first_axes: np.ndarray = first.rotation.T
+    second_axes: np.ndarray = second.rotation.T
+
+    cross_axes: np.ndarray = np.cross(
+        first_axes[:, None, :], second_axes[None, :, :]
+    ).reshape(-1, 3)
+    cross_norms: np.ndarray = np.linalg.norm(cross_axes, axis=1)
+
+    axes: np.ndarray = np.concatenate(
+        [first_axes, second_axes, cross_axes[cross_norms > 1e-9]]
+    )
+
+    first_radii: np.ndarray = np.abs(axes @ first_axes.T) @ (
+        first.extent / 2.0 + margin
+    )
+    second_radii: np.ndarray = np.abs(axes @ second_axes.T) @ (
+        second.extent / 2.0 + margin
+    )
+    distances: np.ndarray = np.abs(axes @ (second.center - first.center))
+
+    # NOTE: Cross axes are not normalized, which scales both sides equally
+    return bool(np.all(distances <= first_radii + second_radii))
@@ -2,17 +2,31 @@
 
 from collections.abc import Callable
 from dataclasses import dataclass, field
-from typing import TypeAlias
+from typing import Hashable, TypeAlias
 
-from mynd.geometry import PointCloud, PointCloudProcessor
+from mynd.geometry import (
+    PointCloud,
+    PointCloudProcessor,
+    convert_to_tensor_point_cloud,
+)
 
+from .cache import PreprocessingCache
 from .data_types import RigidTransformation, RegistrationResult
+from .instrumentation import (
+    PipelineRecord,
+    StageRecord,
+    Stopwatch,
+    count_points,
+    get_peak_memory_megabytes,
+)
+from .plan import RegistrationPlan
 from .registrator_types import PointCloudAligner, PointCloudRefiner
 
 
 @dataclass
 class RegistrationPipeline:
-    """Class representing a registration pipeline."""
+    """Class representing a registration pipeline. Pipelines built from a
+    configuration keep the compiled preprocessing plan of their modules."""
 
     @dataclass
     class AlignerModule:
@@ -20,6 +34,8 @@ class RegistrationPipeline:
 
         preprocessor: PointCloudProcessor
         registrator: PointCloudAligner
+        parameters: Hashable | None = None
+        name: str = "aligner"
 
     @dataclass
     class RefinerModule:
@@ -27,9 +43,13 @@ class RegistrationPipeline:
 
         preprocessor: PointCloudProcessor
         registrator: PointCloudRefiner
+        parameters: Hashable | None = None
+        name: str = "refiner"
 
     initializer: AlignerModule
     incrementors: list[RefinerModule] = field(default_factory=list)
+    backend: str = "legacy"
+    plan: RegistrationPlan | None = None
 
     Callback = TypeAlias = Callable[
         [PointCloud, PointCloud, RegistrationResult], None
@@ -44,14 +64,28 @@ def apply_registration_pipeline(
     source: PointCloud,
     target: PointCloud,
     callback: Pipeline.Callback | None = None,
+    cache: PreprocessingCache | None = None,
 ) -> RegistrationResult:
-    """Applies a registration pipeline to the source and target."""
+    """Applies a registration pipeline to the source and target. If a cache is
+    given, preprocessed point clouds are reused for modules with identical
+    preprocessor parameters, also across pipeline applications. For the tensor
+    backend, the point clouds are converted once before the modules run. The
+    wall time, point counts and peak memory of each module are recorded on the
+    result."""
+
+    stopwatch: Stopwatch = Stopwatch()
+    record: PipelineRecord = PipelineRecord()
+
+    source: PointCloud = _convert_input(pipeline, source, cache)
+    target: PointCloud = _convert_input(pipeline, target, cache)
 
     result: RegistrationResult = _apply_aligner_module(
         pipeline.initializer,
         source=source,
         target=target,
         callback=callback,
+        cache=cache,
+        record=record,
     )
 
     for incrementor in pipeline.incrementors:
@@ -61,8 +95,18 @@ def apply_registration_pipeline(
             target=target,
             transformation=result.transformation,
             callback=callback,
+            cache=cache,
+            record=record,
         )
 
+    # NOTE: Information matrices are computed lazily, so only the final result
+    # pays for it. Computing it here releases the preprocessed point clouds.
+    result.compute_information()
+
+    record.seconds = stopwatch.lap()
+    record.process_peak_mb = get_peak_memory_megabytes()
+    result.record = record
+
     return result
 
 
@@ -71,16 +115,36 @@ def _apply_aligner_module(
     source: PointCloud,
     target: PointCloud,
     callback: Pipeline.Callback | None = None,
+    cache: PreprocessingCache | None = None,
+    record: PipelineRecord | None = None,
 ) -> RegistrationResult:
     """Applies an initializer module to the source and target."""
 
-    source_pre: PointCloud = module.preprocessor(source)
-    target_pre: PointCloud = module.preprocessor(target)
+    stopwatch: Stopwatch = Stopwatch()
+    start_peak_mb: float = get_peak_memory_megabytes()
+
+    source_pre: PointCloud = _preprocess(module, source, cache)
+    target_pre: PointCloud = _preprocess(module, target, cache)
+    preprocess_seconds: float = stopwatch.lap()
 
     result: RegistrationResult = module.registrator(
         source=source_pre, target=target_pre
     )
 
+    if record is not None:
+        record.stages.append(
+            _create_stage_record(
+                module.name,
+                "aligner",
+                source_pre,
+                target_pre,
+                result,
+                preprocess_seconds=preprocess_seconds,
+                register_seconds=stopwatch.lap(),
+                start_peak_mb=start_peak_mb,
+            )
+        )
+
     if callback is not None:
         callback(source_pre, target_pre, result)
 
@@ -93,11 +157,17 @@ def _apply_refiner_module(
     target: PointCloud,
     transformation: RigidTransformation,
     callback: Pipeline.Callback | None = None,
+    cache: PreprocessingCache | None = None,
+    record: PipelineRecord | None = None,
 ) -> RegistrationResult:
     """Applies an incrementor module to the source and target."""
 
-    source_pre: PointCloud = module.preprocessor(source)
-    target_pre: PointCloud = module.preprocessor(target)
+    stopwatch: Stopwatch = Stopwatch()
+    start_peak_mb: float = get_peak_memory_megabytes()
+
+    source_pre: PointCloud = _preprocess(module, source, cache)
+    target_pre: PointCloud = _preprocess(module, target, cache)
+    preprocess_seconds: float = stopwatch.lap()
 
     result: RegistrationResult = module.registrator(
         source=source_pre,
@@ -105,7 +175,86 @@ def _apply_refiner_module(
         transformation=transformation,
     )
 
+    if record is not None:
+        record.stages.append(
+            _create_stage_record(
+                module.name,
+                "refiner",
+                source_pre,
+                target_pre,
+                result,
+                preprocess_seconds=preprocess_seconds,
+                register_seconds=stopwatch.lap(),
+                start_peak_mb=start_peak_mb,
+            )
+        )
+
     if callback is not None:
         callback(source_pre, target_pre, result)
 
     return result
+
+
+def _create_stage_record(
+    name: str,
+    kind: str,
+    source: PointCloud,
+    target: PointCloud,
+    result: RegistrationResult,
+    preprocess_seconds: float,
+    register_seconds: float,
+    start_peak_mb: float = 0.0,
+) -> StageRecord:
+    """Creates a record of a pipeline stage from its preprocessed point clouds
+    and result, and the process peak memory at the start of the stage."""
+    process_peak_mb: float = get_peak_memory_megabytes()
+    return StageRecord(
+        name=name,
+        kind=kind,
+        preprocess_seconds=preprocess_seconds,
+        register_seconds=register_seconds,
+        source_points=count_points(source),
+        target_points=count_points(target),
+        iterations=result.iterations,
+        termination=result.termination,
+        process_peak_mb=process_peak_mb,
+        peak_growth_mb=max(process_peak_mb - start_peak_mb, 0.0),
+        fitness=result.fitness,
+        inlier_rmse=result.inlier_rmse,
+    )
+
+
+def _convert_input(
+    pipeline: Pipeline,
+    cloud: PointCloud,
+    cache: PreprocessingCache | None = None,
+) -> PointCloud:
+    """Converts a point cloud to the representation of the pipeline backend."""
+
+    match pipeline.backend:
+        case "legacy":
+            return cloud
+        case "tensor" if cache is None:
+            return convert_to_tensor_point_cloud(cloud)
+        case "tensor":
+            return cache.preprocess(
+                cloud, convert_to_tensor_point_cloud, parameters="tensor"
+            )
+        case _:
+            raise NotImplementedError(
+                f"invalid registration backend: {pipeline.backend}"
+            )
+
+
+def _preprocess(
+    module: Pipeline.AlignerModule | Pipeline.RefinerModule,
+    cloud: PointCloud,
+    cache: PreprocessingCache | None = None,
+) -> PointCloud:
+    """Preprocesses a point cloud, through the cache if the module preprocessor
+    is parameterized."""
+
+    if cache is None or module.parameters is None:
+        return module.preprocessor(cloud)
+
+    return cache.preprocess(cloud, module.preprocessor, module.parameters)
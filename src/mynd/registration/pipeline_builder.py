@@ -1,9 +1,10 @@
 """Module for building registration pipelines."""
 
 from collections.abc import Callable
-from typing import Any, TypeAlias
+from typing import Any, Hashable, TypeAlias
 
 import open3d.pipelines.registration as reg
+import open3d.t.pipelines.registration as treg
 
 from mynd.geometry import (
     PointCloud,
@@ -11,15 +12,21 @@ from mynd.geometry import (
     create_downsampler,
     create_normal_estimator,
 )
+from mynd.utils.log import logger
+
+from .cache import PyramidCache, TargetIndexCache
 
 from .feature_registrators import (
     create_fpfh_extractor,
     create_point_to_point_estimator,
     create_correspondence_validators,
+    create_ransac_budget,
     create_ransac_convergence_criteria,
     create_ransac_registrator,
 )
 
+from .feature_store import FeatureStore
+
 from .icp_registrators import (
     create_huber_loss,
     create_tukey_loss,
@@ -30,39 +37,124 @@ from .icp_registrators import (
     create_colored_icp_registrator,
 )
 
+from .numpy_registrators import (
+    NumpyICPCriteria,
+    create_numpy_icp_registrator,
+)
+
 from .registrator_types import (
     FeatureExtractor,
     PointCloudAligner,
     PointCloudRefiner,
 )
 
+from .tensor_registrators import (
+    create_tensor_aligner,
+    create_tensor_colored_icp_estimator,
+    create_tensor_huber_loss,
+    create_tensor_icp_convergence_criteria,
+    create_tensor_icp_registrator,
+    create_tensor_multi_scale_icp_registrator,
+    create_tensor_point_to_plane_estimator,
+    create_tensor_tukey_loss,
+)
+
 from .pipeline import RegistrationPipeline
+from .plan import (
+    RegistrationPlan,
+    build_plan_processors,
+    compile_registration_plan,
+    freeze_parameters,
+)
 
 
 Pipeline: TypeAlias = RegistrationPipeline
 
 
-def build_registration_pipeline(config: dict) -> Pipeline:
-    """Builds a registration pipeline from the given config."""
+def build_registration_pipeline(
+    config: dict,
+    feature_store: FeatureStore | None = None,
+) -> Pipeline:
+    """Builds a registration pipeline from the given config. If a feature store
+    is given, the aligner features are persisted in it. If the config enables
+    voxel pyramids, the modules draw their downsampled point clouds from a
+    pyramid built once per input point cloud. Legacy refiners share a target
+    index cache, so that target search structures are built once per target
+    point cloud. The preprocessors are compiled into a plan that merges
+    identical steps across modules, and is kept on the pipeline for
+    inspection."""
 
     ALIGNER_KEY: str = "aligner"
     REFINER_KEY: str = "refiner"
+    BACKEND_KEY: str = "backend"
+    PYRAMID_KEY: str = "pyramid"
+
+    BACKENDS: tuple[str] = ("legacy", "tensor")
 
     assert ALIGNER_KEY in config, f"missing required key: {ALIGNER_KEY}"
     assert REFINER_KEY in config, f"missing required key: {REFINER_KEY}"
 
+    backend: str = config.get(BACKEND_KEY, "legacy")
+    if backend not in BACKENDS:
+        raise NotImplementedError(
+            f"invalid registration backend - valid options are: {BACKENDS}"
+        )
+
+    plan: RegistrationPlan = compile_registration_plan(config)
+
+    pyramids: PyramidCache | None = None
+    if config.get(PYRAMID_KEY, False):
+        if backend != "legacy":
+            raise NotImplementedError(
+                "voxel pyramids are only supported by the legacy backend"
+            )
+        pyramids: PyramidCache = _build_pyramid_cache(plan)
+
+    preprocessors: list[PointCloudProcessor] = build_plan_processors(
+        plan, pyramids=pyramids
+    )
+
     aligner_module: Pipeline.AlignerModule = _build_aligner_module(
-        config.get(ALIGNER_KEY)
+        config.get(ALIGNER_KEY),
+        preprocessors[0],
+        feature_store=feature_store,
+        backend=backend,
     )
 
+    indices: TargetIndexCache | None = None
+    if backend == "legacy":
+        indices: TargetIndexCache = TargetIndexCache()
+
     refiner_modules: list[Pipeline.RefinerModule] = [
-        _build_refiner_module(section) for section in config.get(REFINER_KEY)
+        _build_refiner_module(
+            section, preprocessor, backend=backend, indices=indices
+        )
+        for section, preprocessor in zip(
+            config.get(REFINER_KEY), preprocessors[1:]
+        )
     ]
 
-    return Pipeline(aligner_module, refiner_modules)
+    return Pipeline(aligner_module, refiner_modules, backend=backend, plan=plan)
+
 
+def _build_pyramid_cache(plan: RegistrationPlan) -> PyramidCache:
+    """Builds a pyramid cache with the spacings of the downsampling steps
+    applied to the input point clouds in a plan."""
 
-def _build_aligner_module(config: dict) -> Pipeline.AlignerModule:
+    spacings: set[float] = {
+        dict(step.parameters).get("spacing")
+        for step in plan.steps.values()
+        if step.operation == "downsample" and step.parent is None
+    }
+    return PyramidCache(spacings=tuple(sorted(spacings)))
+
+
+def _build_aligner_module(
+    config: dict,
+    preprocessor: PointCloudProcessor,
+    feature_store: FeatureStore | None = None,
+    backend: str = "legacy",
+) -> Pipeline.AlignerModule:
     """Builds an aligner module from the configuration."""
 
     MATCHER_FACTORIES: list[str] = {
@@ -72,9 +164,7 @@ def _build_aligner_module(config: dict) -> Pipeline.AlignerModule:
     matcher_type: str = config.get("type")
     matcher_params: dict = config.get("matcher")
 
-    preprocessor: PointCloudProcessor = build_point_cloud_processor(
-        config.get("preprocessor")
-    )
+    parameters: Hashable = freeze_parameters(config.get("preprocessor"))
 
     if matcher_type not in MATCHER_FACTORIES:
         raise NotImplementedError(
@@ -82,36 +172,69 @@ def _build_aligner_module(config: dict) -> Pipeline.AlignerModule:
         )
 
     factory = MATCHER_FACTORIES.get(matcher_type)
-    matcher: PointCloudAligner = factory(matcher_params)
+    matcher: PointCloudAligner = factory(
+        matcher_params, feature_store=feature_store
+    )
+
+    if backend == "tensor":
+        matcher: PointCloudAligner = create_tensor_aligner(matcher)
 
-    return Pipeline.AlignerModule(preprocessor, matcher)
+    return Pipeline.AlignerModule(
+        preprocessor, matcher, parameters, name=config.get("name", "aligner")
+    )
 
 
-def _build_refiner_module(config: dict) -> Pipeline.RefinerModule:
+def _build_refiner_module(
+    config: dict,
+    preprocessor: PointCloudProcessor,
+    backend: str = "legacy",
+    indices: TargetIndexCache | None = None,
+) -> Pipeline.RefinerModule:
     """Builds an refiner module from the configuration."""
 
-    REFINER_FACTORIES: dict[str, Callable] = {
-        "regular_icp": build_regular_icp_registrator,
-        "colored_icp": build_colored_icp_registrator,
+    REFINER_FACTORIES: dict[str, dict[str, Callable]] = {
+        "legacy": {
+            "regular_icp": build_regular_icp_registrator,
+            "colored_icp": build_colored_icp_registrator,
+            "numpy_icp": build_numpy_icp_registrator,
+        },
+        "tensor": {
+            "regular_icp": build_tensor_regular_icp_registrator,
+            "colored_icp": build_tensor_colored_icp_registrator,
+            "multi_scale_icp": build_tensor_multi_scale_icp_registrator,
+        },
     }
 
-    preprocessor: PointCloudProcessor = build_point_cloud_processor(
-        config.get("preprocessor")
-    )
+    parameters: Hashable = freeze_parameters(config.get("preprocessor"))
 
     matcher_type: str = config.get("type")
     matcher_params: str = config.get("matcher")
 
-    factory = REFINER_FACTORIES.get(matcher_type)
-    matcher: PointCloudRefiner = factory(matcher_params)
+    factories: dict[str, Callable] = REFINER_FACTORIES.get(backend)
+    if matcher_type not in factories:
+        raise NotImplementedError(
+            f"invalid {backend} refiner - valid options are: {factories.keys()}"
+        )
+
+    factory = factories.get(matcher_type)
+    if backend == "legacy":
+        matcher: PointCloudRefiner = factory(matcher_params, indices=indices)
+    else:
+        matcher: PointCloudRefiner = factory(matcher_params)
 
-    return Pipeline.RefinerModule(preprocessor, matcher)
+    return Pipeline.RefinerModule(
+        preprocessor, matcher, parameters, name=config.get("name", "refiner")
+    )
 
 
 def build_point_cloud_processor(
-    components: dict[str, Any]
+    components: dict[str, Any],
 ) -> PointCloudProcessor:
-    """Builds a point cloud preprocessor from a configuration."""
+    """Builds a point cloud preprocessor from a configuration. The input point
+    cloud is never modified, and stages following a downsampler operate in
+    place on the downsampled point cloud instead of copying it. Pipelines
+    build their preprocessors from a registration plan instead, which also
+    supports voxel pyramids."""
 
     processors: list[PointCloudProcessor] = list()
 
@@ -119,8 +242,12 @@ def build_point_cloud_processor(
         processors.append(create_downsampler(**components.get("downsample")))
 
     if "estimate_normals" in components:
+        # NOTE: The downsampled point cloud is owned by the preprocessor, so
+        # normals can be estimated in place without touching the input
+        parameters: dict = dict(components.get("estimate_normals"))
+        inplace: bool = parameters.pop("inplace", False) or bool(processors)
         processors.append(
-            create_normal_estimator(**components.get("estimate_normals"))
+            create_normal_estimator(**parameters, inplace=inplace)
         )
 
     def preprocess_point_cloud(cloud: PointCloud) -> PointCloud:
@@ -134,8 +261,12 @@ def build_point_cloud_processor(
     return preprocess_point_cloud
 
 
-def build_ransac_registrator(components: dict[str, Any]) -> PointCloudAligner:
-    """Builds a RANSAC registrator from a collection of parameters."""
+def build_ransac_registrator(
+    components: dict[str, Any],
+    feature_store: FeatureStore | None = None,
+) -> PointCloudAligner:
+    """Builds a RANSAC registrator from a collection of parameters. An optional
+    budget limits the wall time and the iterations without improvement."""
 
     for key in [
         "feature",
@@ -147,7 +278,7 @@ def build_ransac_registrator(components: dict[str, Any]) -> PointCloudAligner:
         assert key in components, f"missing build component: {key}"
 
     feature_extractor: FeatureExtractor = create_fpfh_extractor(
-        **components.get("feature")
+        **components.get("feature"), store=feature_store
     )
     estimation_method = create_point_to_point_estimator(
         **components.get("point_to_point")
@@ -158,18 +289,25 @@ def build_ransac_registrator(components: dict[str, Any]) -> PointCloudAligner:
     convergence_criteria = create_ransac_convergence_criteria(
         **components.get("convergence")
     )
+    budget = (
+        create_ransac_budget(**components.get("budget"))
+        if "budget" in components
+        else None
+    )
 
     return create_ransac_registrator(
         feature_extractor=feature_extractor,
         estimation_method=estimation_method,
         validators=validators,
         convergence_criteria=convergence_criteria,
+        budget=budget,
         **components.get("algorithm"),
     )
 
 
 def build_regular_icp_registrator(
     parameters: dict,
+    indices: TargetIndexCache | None = None,
 ) -> PointCloudRefiner:
     """Builds a regular ICP registrator from a configuration."""
 
@@ -211,6 +349,7 @@ def build_regular_icp_registrator(
         estimation_method=estimator,
         convergence_criteria=convergence_criteria,
         distance_threshold=distance_threshold,
+        indices=indices,
     )
 
 
@@ -223,6 +362,7 @@ DISTANCE_THRESHOLD_KEY: str = "distance_threshold"
 
 def build_colored_icp_registrator(
     parameters: dict,
+    indices: TargetIndexCache | None = None,
 ) -> PointCloudRefiner:
     """Builds an incremental registrator from a configuration."""
 
@@ -265,4 +405,192 @@ def build_colored_icp_registrator(
         estimation_method=estimator,
         convergence_criteria=criteria,
         distance_threshold=distance_threshold,
+        indices=indices,
+    )
+
+
+def build_numpy_icp_registrator(
+    parameters: dict,
+    indices: TargetIndexCache | None = None,
+) -> PointCloudRefiner:
+    """Builds a NumPy point-to-plane ICP registrator from a configuration. The
+    number of source points matched per iteration, the number of KD-tree
+    workers and the random seed are optional."""
+
+    if DISTANCE_THRESHOLD_KEY not in parameters:
+        raise ValueError(
+            f"numpy icp builder: missing key '{DISTANCE_THRESHOLD_KEY}'"
+        )
+
+    huber_k: float | None = parameters.get(BUILD_HUBER_KEY, dict()).get("k")
+
+    return create_numpy_icp_registrator(
+        distance_threshold=parameters.get(DISTANCE_THRESHOLD_KEY),
+        criteria=_build_numpy_icp_criteria(
+            parameters.get(CONVERGENCE_CRITERIA_KEY, dict())
+        ),
+        sample_count=parameters.get("sample_count"),
+        huber_k=huber_k,
+        workers=parameters.get("workers", -1),
+        seed=parameters.get("seed", 0),
+        indices=indices,
+    )
+
+
+NUMPY_ICP_CRITERIA_KEYS: tuple[str] = (
+    "max_iteration",
+    "relative_rmse",
+    "step_tolerance",
+)
+
+
+def _build_numpy_icp_criteria(parameters: dict) -> NumpyICPCriteria:
+    """Builds NumPy ICP convergence criteria from a configuration. The
+    relative fitness criterion of Open3D ICP has no NumPy ICP counterpart, so
+    it is ignored to keep the shared refiner configurations valid."""
+
+    if "relative_fitness" in parameters:
+        logger.info("numpy icp builder: ignoring criterion 'relative_fitness'")
+
+    invalid: list[str] = [
+        key
+        for key in parameters
+        if key not in NUMPY_ICP_CRITERIA_KEYS and key != "relative_fitness"
+    ]
+    if invalid:
+        raise ValueError(
+            f"numpy icp builder: invalid convergence criteria {invalid} - "
+            f"valid options are: {NUMPY_ICP_CRITERIA_KEYS}"
+        )
+
+    return NumpyICPCriteria(
+        **{
+            key: parameters.get(key)
+            for key in NUMPY_ICP_CRITERIA_KEYS
+            if key in parameters
+        }
+    )
+
+
+def _build_tensor_kernel(
+    parameters: dict,
+) -> treg.robust_kernel.RobustKernel | None:
+    """Builds a tensor robust kernel from a configuration."""
+    if BUILD_HUBER_KEY in parameters:
+        return create_tensor_huber_loss(**parameters.get(BUILD_HUBER_KEY))
+    elif BUILD_TUKEY_KEY in parameters:
+        return create_tensor_tukey_loss(**parameters.get(BUILD_TUKEY_KEY))
+    else:
+        return None
+
+
+def build_tensor_regular_icp_registrator(
+    parameters: dict,
+) -> PointCloudRefiner:
+    """Builds a tensor regular ICP registrator from a configuration."""
+
+    estimator: treg.TransformationEstimation = (
+        create_tensor_point_to_plane_estimator(
+            kernel=_build_tensor_kernel(parameters)
+        )
+    )
+
+    criteria: treg.ICPConvergenceCriteria = (
+        create_tensor_icp_convergence_criteria(
+            **parameters.get(CONVERGENCE_CRITERIA_KEY, dict())
+        )
+    )
+
+    if DISTANCE_THRESHOLD_KEY not in parameters:
+        raise ValueError(
+            f"tensor regular icp builder: missing key '{DISTANCE_THRESHOLD_KEY}'"
+        )
+
+    return create_tensor_icp_registrator(
+        estimation_method=estimator,
+        convergence_criteria=criteria,
+        distance_threshold=parameters.get(DISTANCE_THRESHOLD_KEY),
+    )
+
+
+def build_tensor_colored_icp_registrator(
+    parameters: dict,
+) -> PointCloudRefiner:
+    """Builds a tensor colored ICP registrator from a configuration."""
+
+    COLOR_ESTIMATOR_KEY: str = "colored_icp_estimation"
+
+    if COLOR_ESTIMATOR_KEY not in parameters:
+        raise ValueError(
+            f"tensor colored icp builder: missing key '{COLOR_ESTIMATOR_KEY}'"
+        )
+
+    estimator: treg.TransformationEstimation = (
+        create_tensor_colored_icp_estimator(
+            **parameters.get(COLOR_ESTIMATOR_KEY),
+            kernel=_build_tensor_kernel(parameters),
+        )
+    )
+
+    criteria: treg.ICPConvergenceCriteria = (
+        create_tensor_icp_convergence_criteria(
+            **parameters.get(CONVERGENCE_CRITERIA_KEY, dict())
+        )
+    )
+
+    if DISTANCE_THRESHOLD_KEY not in parameters:
+        raise ValueError(
+            f"tensor colored icp builder: missing key '{DISTANCE_THRESHOLD_KEY}'"
+        )
+
+    return create_tensor_icp_registrator(
+        estimation_method=estimator,
+        convergence_criteria=criteria,
+        distance_threshold=parameters.get(DISTANCE_THRESHOLD_KEY),
+    )
+
+
+def build_tensor_multi_scale_icp_registrator(
+    parameters: dict,
+) -> PointCloudRefiner:
+    """Builds a tensor multi-scale ICP registrator from a configuration. The
+    scales are given by lists of voxel sizes, distance thresholds, and
+    optionally convergence criteria, ordered from coarse to fine."""
+
+    COLOR_ESTIMATOR_KEY: str = "colored_icp_estimation"
+    VOXEL_SIZES_KEY: str = "voxel_sizes"
+    DISTANCE_THRESHOLDS_KEY: str = "distance_thresholds"
+
+    for key in [VOXEL_SIZES_KEY, DISTANCE_THRESHOLDS_KEY]:
+        if key not in parameters:
+            raise ValueError(f"multi-scale icp builder: missing key '{key}'")
+
+    kernel: treg.robust_kernel.RobustKernel | None = _build_tensor_kernel(
+        parameters
+    )
+
+    if COLOR_ESTIMATOR_KEY in parameters:
+        estimator: treg.TransformationEstimation = (
+            create_tensor_colored_icp_estimator(
+                **parameters.get(COLOR_ESTIMATOR_KEY), kernel=kernel
+            )
+        )
+    else:
+        estimator: treg.TransformationEstimation = (
+            create_tensor_point_to_plane_estimator(kernel=kernel)
+        )
+
+    voxel_sizes: list[float] = parameters.get(VOXEL_SIZES_KEY)
+    criteria_parameters: list[dict] = parameters.get(
+        CONVERGENCE_CRITERIA_KEY, [dict() for _ in voxel_sizes]
+    )
+
+    return create_tensor_multi_scale_icp_registrator(
+        estimation_method=estimator,
+        voxel_sizes=voxel_sizes,
+        distance_thresholds=parameters.get(DISTANCE_THRESHOLDS_KEY),
+        convergence_criteria=[
+            create_tensor_icp_convergence_criteria(**criteria)
+            for criteria in criteria_parameters
+        ],
     )
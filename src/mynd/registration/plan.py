@@ -0,0 +1,270 @@
+"""Module for compiling registration configurations into preprocessing plans."""
+
+from dataclasses import dataclass, field
+from typing import Any, Hashable
+
+from mynd.geometry import (
+    PointCloud,
+    PointCloudProcessor,
+    VoxelPyramid,
+    create_downsampler,
+    create_normal_estimator,
+)
+
+from .cache import PreprocessingCache, PyramidCache
+
+
+OPERATIONS: tuple[str] = ("downsample", "estimate_normals")
+
+
+@dataclass(frozen=True)
+class PlanStep:
+    """Class representing a preprocessing step in a registration plan. Steps
+    without a parent are applied to the input point cloud."""
+
+    key: str
+    operation: str
+    parameters: Hashable
+    parent: str | None = None
+
+    def describe(self) -> str:
+        """Returns a description of the step operation and its parameters."""
+        arguments: str = ", ".join(
+            f"{name}={value}" for name, value in self.parameters
+        )
+        return f"{self.operation}({arguments})"
+
+
+@dataclass(frozen=True)
+class PlanModule:
+    """Class representing a registration module in a plan, with the step that
+    produces its preprocessed point clouds."""
+
+    name: str
+    kind: str
+    matcher: str
+    step: str | None = None
+
+
+@dataclass
+class RegistrationPlan:
+    """Class representing a compiled registration plan, i.e. a graph of
+    preprocessing steps consumed by the pipeline modules. Identical steps with
+    identical parents are merged, so modules that repeat the same
+    preprocessing share its steps. Steps are ordered so that every step comes
+    after its parent."""
+
+    backend: str = "legacy"
+    steps: dict[str, PlanStep] = field(default_factory=dict)
+    modules: list[PlanModule] = field(default_factory=list)
+
+    def consumers(self, key: str) -> int:
+        """Returns the number of steps and modules consuming a step."""
+        steps: int = sum(step.parent == key for step in self.steps.values())
+        modules: int = sum(module.step == key for module in self.modules)
+        return steps + modules
+
+    def is_shared(self, key: str) -> bool:
+        """Returns true if a step is consumed more than once."""
+        return self.consumers(key) > 1
+
+    def add_step(
+        self, operation: str, parameters: dict, parent: str | None = None
+    ) -> str:
+        """Adds a step to the plan and returns its key. If an identical step
+        with the same parent exists, its key is returned instead."""
+
+        frozen: Hashable = freeze_parameters(parameters)
+        for step in self.steps.values():
+            if (step.operation, step.parameters, step.parent) == (
+                operation,
+                frozen,
+                parent,
+            ):
+                return step.key
+
+        key: str = f"s{len(self.steps)}"
+        self.steps[key] = PlanStep(key, operation, frozen, parent)
+        return key
+
+    def add_preprocessor(self, components: dict[str, Any]) -> str | None:
+        """Adds the steps of a preprocessor configuration to the plan, and
+        returns the key of the final step, or none if the configuration has
+        no steps."""
+
+        parent: str | None = None
+        for operation in OPERATIONS:
+            if operation not in components:
+                continue
+
+            # NOTE: Whether steps operate in place is decided by the plan
+            parameters: dict = dict(components.get(operation))
+            parameters.pop("inplace", None)
+            parent: str = self.add_step(operation, parameters, parent)
+
+        return parent
+
+    def describe(self) -> str:
+        """Returns a description of the plan with one line per step and
+        module."""
+
+        lines: list[str] = [f"registration plan ({self.backend} backend):"]
+        for step in self.steps.values():
+            shared: str = " [shared]" if self.is_shared(step.key) else ""
+            lines.append(
+                f"  {step.key}: {step.describe()} <- "
+                f"{step.parent or 'input'}{shared}"
+            )
+
+        for module in self.modules:
+            lines.append(
+                f"  {module.kind} '{module.name}': {module.matcher} <- "
+                f"{module.step or 'input'}"
+            )
+
+        return "\n".join(lines)
+
+
+def compile_registration_plan(config: dict) -> RegistrationPlan:
+    """Compiles a registration configuration into a plan."""
+
+    plan: RegistrationPlan = RegistrationPlan(
+        backend=config.get("backend", "legacy")
+    )
+
+    sections: list[tuple[str, dict]] = [("aligner", config.get("aligner"))]
+    sections += [("refiner", section) for section in config.get("refiner")]
+
+    for kind, section in sections:
+        step: str | None = plan.add_preprocessor(
+            section.get("preprocessor", dict())
+        )
+        plan.modules.append(
+            PlanModule(
+                name=section.get("name", kind),
+                kind=kind,
+                matcher=section.get("type"),
+                step=step,
+            )
+        )
+
+    return plan
+
+
+def build_plan_processors(
+    plan: RegistrationPlan,
+    pyramids: PyramidCache | None = None,
+) -> list[PointCloudProcessor]:
+    """Builds a preprocessor for each module in a plan. Shared steps are
+    executed once per input point cloud, and their outputs are cached while
+    the input is alive. Steps with a single consumer operate in place on the
+    output of their parent when no other consumer can observe it. If a
+    pyramid cache is given, downsampled point clouds are drawn from the
+    pyramid of the input point cloud, and every step output is cached."""
+
+    cache: PreprocessingCache = PreprocessingCache()
+
+    evaluators: dict[str, PointCloudProcessor] = dict()
+    for key, step in plan.steps.items():
+        evaluators[key] = _build_step_evaluator(
+            plan, step, evaluators, cache, pyramids
+        )
+
+    return [
+        evaluators.get(module.step, _pass_through)
+        for module in plan.modules
+    ]
+
+
+def freeze_parameters(parameters: Any) -> Hashable:
+    """Converts nested configuration parameters into a hashable value, with
+    identical values for identical configurations."""
+
+    if isinstance(parameters, dict):
+        return tuple(
+            sorted(
+                (key, freeze_parameters(value))
+                for key, value in parameters.items()
+            )
+        )
+    if isinstance(parameters, (list, tuple)):
+        return tuple(freeze_parameters(value) for value in parameters)
+
+    return parameters
+
+
+def _build_step_evaluator(
+    plan: RegistrationPlan,
+    step: PlanStep,
+    evaluators: dict[str, PointCloudProcessor],
+    cache: PreprocessingCache,
+    pyramids: PyramidCache | None = None,
+) -> PointCloudProcessor:
+    """Builds a processor that evaluates a step and its ancestors for an input
+    point cloud."""
+
+    parent: PointCloudProcessor = evaluators.get(step.parent, _pass_through)
+    processor: PointCloudProcessor = _build_step_processor(
+        step,
+        inplace=_is_fresh(plan, step.parent, pyramids),
+        pyramids=pyramids,
+    )
+
+    def evaluate_step(cloud: PointCloud) -> PointCloud:
+        """Evaluates a plan step for an input point cloud."""
+        return processor(parent(cloud))
+
+    if not plan.is_shared(step.key) and pyramids is None:
+        return evaluate_step
+
+    def evaluate_cached_step(cloud: PointCloud) -> PointCloud:
+        """Evaluates a plan step through the plan cache."""
+        return cache.preprocess(cloud, evaluate_step, parameters=step.key)
+
+    return evaluate_cached_step
+
+
+def _build_step_processor(
+    step: PlanStep,
+    inplace: bool = False,
+    pyramids: PyramidCache | None = None,
+) -> PointCloudProcessor:
+    """Builds the processor of a single plan step."""
+
+    parameters: dict = dict(step.parameters)
+
+    match step.operation:
+        case "downsample" if pyramids is not None and step.parent is None:
+            spacing: float = parameters.get("spacing")
+
+            def pyramid_downsampler(cloud: PointCloud) -> PointCloud:
+                """Draws a downsampled point cloud from its voxel pyramid."""
+                pyramid: VoxelPyramid = pyramids.pyramid(cloud)
+                return pyramid.level(spacing)
+
+            return pyramid_downsampler
+        case "downsample":
+            return create_downsampler(**parameters)
+        case "estimate_normals":
+            return create_normal_estimator(**parameters, inplace=inplace)
+        case _:
+            raise NotImplementedError(
+                f"invalid plan operation - valid options are: {OPERATIONS}"
+            )
+
+
+def _is_fresh(
+    plan: RegistrationPlan,
+    key: str | None,
+    pyramids: PyramidCache | None = None,
+) -> bool:
+    """Returns true if the output of a step is a new point cloud that is only
+    seen by its single consumer, i.e. that it can be modified in place. Steps
+    always return new point clouds, unless they are drawn from a pyramid or
+    cached for several consumers."""
+    return key is not None and pyramids is None and not plan.is_shared(key)
+
+
+def _pass_through(cloud: PointCloud) -> PointCloud:
+    """Returns the input point cloud unchanged."""
+    return cloud
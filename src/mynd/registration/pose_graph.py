@@ -0,0 +1,258 @@
+"""Module for incremental pose graphs with arbitrary node keys."""
+
+from dataclasses import dataclass, field
+from typing import Generic, TypeVar
+
+import open3d.pipelines.registration as reg
+
+# NOTE: Some report memory bugs if numpy is import before open3d
+import numpy as np
+
+from .data_types import RegistrationResult
+
+
+Key: TypeVar = TypeVar("Key")
+
+
+@dataclass
+class IncrementalPoseGraph(Generic[Key]):
+    """Class representing a sparse pose graph that is built incrementally.
+    Node keys are mapped to node indices, and each edge holds the
+    transformation that registers its source to its target. Edges can be
+    added as pairs are registered, and optimization only revisits the
+    connected components that have changed since they were last optimized."""
+
+    @dataclass
+    class Edge:
+        """Class representing a pose graph edge between node indices."""
+
+        source: int
+        target: int
+        transformation: np.ndarray
+        information: np.ndarray
+        uncertain: bool
+
+    indices: dict[Key, int] = field(default_factory=dict)
+    keys: list[Key] = field(default_factory=list)
+    poses: list[np.ndarray] = field(default_factory=list)
+    edges: list[Edge] = field(default_factory=list)
+
+    _parents: list[int] = field(default_factory=list, repr=False)
+    _dirty: set[int] = field(default_factory=set, repr=False)
+
+    def __contains__(self, key: Key) -> bool:
+        """Returns true if the graph has a node with the key."""
+        return key in self.indices
+
+    def __len__(self) -> int:
+        """Returns the number of nodes in the graph."""
+        return len(self.keys)
+
+    def add_node(self, key: Key, pose: np.ndarray | None = None) -> int:
+        """Adds a node to the graph, and returns its index. Nodes without a
+        pose start in their own component with an identity pose."""
+
+        if key in self.indices:
+            return self.indices.get(key)
+
+        index: int = len(self.keys)
+        self.indices[key] = index
+        self.keys.append(key)
+        self.poses.append(np.identity(4) if pose is None else np.array(pose))
+        self._parents.append(index)
+        self._dirty.add(index)
+        return index
+
+    def add_edge(
+        self,
+        source: Key,
+        target: Key,
+        transformation: np.ndarray,
+        information: np.ndarray,
+        uncertain: bool | None = None,
+    ) -> None:
+        """Adds an edge with the transformation that registers the source to
+        the target. Missing nodes are initialized from the edge, and when the
+        edge joins two components the later component is moved rigidly to
+        agree with it. By default, edges that join components are treated as
+        odometry and edges within a component as loop closures."""
+
+        source_new: bool = source not in self.indices
+        target_new: bool = target not in self.indices
+
+        # NOTE: When both nodes are new, the target is added first so that it
+        # becomes the reference node of the new component
+        if source_new:
+            target_index: int = self.add_node(target)
+            pose: np.ndarray = self.pose(target) @ transformation
+            source_index: int = self.add_node(source, pose)
+        elif target_new:
+            source_index: int = self.indices.get(source)
+            pose: np.ndarray = self.pose(source) @ np.linalg.inv(transformation)
+            target_index: int = self.add_node(target, pose)
+        else:
+            source_index: int = self.indices.get(source)
+            target_index: int = self.indices.get(target)
+
+        source_root: int = self._find(source_index)
+        target_root: int = self._find(target_index)
+        joins: bool = source_root != target_root
+
+        # NOTE: The component with the later root is moved, so the reference
+        # node of the joined component keeps its pose
+        if joins and source_root > target_root:
+            self._align_component(
+                source_root,
+                self.poses[target_index]
+                @ transformation
+                @ np.linalg.inv(self.poses[source_index]),
+            )
+        elif joins:
+            self._align_component(
+                target_root,
+                self.poses[source_index]
+                @ np.linalg.inv(transformation)
+                @ np.linalg.inv(self.poses[target_index]),
+            )
+
+        if joins:
+            self._union(source_root, target_root)
+
+        self.edges.append(
+            IncrementalPoseGraph.Edge(
+                source=source_index,
+                target=target_index,
+                transformation=np.asarray(transformation),
+                information=np.asarray(information),
+                uncertain=not joins if uncertain is None else uncertain,
+            )
+        )
+        self._dirty.add(self._find(source_index))
+
+    def add_registration(
+        self, target: Key, source: Key, result: RegistrationResult
+    ) -> None:
+        """Adds a registration result as an edge. The signature matches the
+        batch registration callback, so the graph can be grown while a batch
+        is registered."""
+        self.add_edge(source, target, result.transformation, result.information)
+
+    def pose(self, key: Key) -> np.ndarray:
+        """Returns the pose of a node, i.e. the transformation from the node
+        to the frame of its component reference node."""
+        return self.poses[self.indices[key]]
+
+    def get_poses(self) -> dict[Key, np.ndarray]:
+        """Returns the poses of all the nodes by key."""
+        return {key: pose for key, pose in zip(self.keys, self.poses)}
+
+    def components(self) -> list[list[Key]]:
+        """Returns the keys of the nodes in each connected component."""
+        members: dict[int, list[Key]] = dict()
+        for index, key in enumerate(self.keys):
+            members.setdefault(self._find(index), list()).append(key)
+        return list(members.values())
+
+    def optimize(
+        self,
+        correspondence_distance: float,
+        prune_threshold: float = 0.25,
+        preference_loop_closure: float = 1.0,
+    ) -> list[Key]:
+        """Optimizes the components that have changed since they were last
+        optimized, and returns the keys of the nodes that were optimized. Each
+        component is optimized separately with its first node as reference.
+        Edges are kept as measurements, so edges pruned in one optimization
+        are considered again in the next."""
+
+        option = reg.GlobalOptimizationOption(
+            max_correspondence_distance=correspondence_distance,
+            edge_prune_threshold=prune_threshold,
+            preference_loop_closure=preference_loop_closure,
+            reference_node=0,
+        )
+
+        dirty: set[int] = {self._find(root) for root in self._dirty}
+        self._dirty.clear()
+
+        optimized: list[Key] = list()
+        for root in sorted(dirty):
+            nodes: list[int] = [
+                index
+                for index in range(len(self.keys))
+                if self._find(index) == root
+            ]
+
+            edges: list[IncrementalPoseGraph.Edge] = [
+                edge for edge in self.edges if self._find(edge.source) == root
+            ]
+
+            if not edges:
+                continue
+
+            pose_graph: reg.PoseGraph = self._create_pose_graph(nodes, edges)
+
+            reg.global_optimization(
+                pose_graph,
+                reg.GlobalOptimizationLevenbergMarquardt(),
+                reg.GlobalOptimizationConvergenceCriteria(),
+                option,
+            )
+
+            for local, index in enumerate(nodes):
+                self.poses[index] = np.asarray(pose_graph.nodes[local].pose)
+                optimized.append(self.keys[index])
+
+        return optimized
+
+    def to_pose_graph(self) -> reg.PoseGraph:
+        """Converts the graph into an Open3D pose graph with nodes in order of
+        their indices."""
+        return self._create_pose_graph(list(range(len(self.keys))), self.edges)
+
+    def _create_pose_graph(
+        self, nodes: list[int], edges: list[Edge]
+    ) -> reg.PoseGraph:
+        """Creates an Open3D pose graph from a subset of nodes and the edges
+        between them, with nodes indexed by their position in the subset."""
+
+        local: dict[int, int] = {index: pos for pos, index in enumerate(nodes)}
+
+        pose_graph: reg.PoseGraph = reg.PoseGraph()
+        for index in nodes:
+            pose_graph.nodes.append(reg.PoseGraphNode(self.poses[index]))
+
+        for edge in edges:
+            pose_graph.edges.append(
+                reg.PoseGraphEdge(
+                    local.get(edge.source),
+                    local.get(edge.target),
+                    edge.transformation,
+                    edge.information,
+                    uncertain=edge.uncertain,
+                )
+            )
+
+        return pose_graph
+
+    def _align_component(self, root: int, correction: np.ndarray) -> None:
+        """Applies a rigid correction to the poses of a component."""
+        for index in range(len(self.keys)):
+            if self._find(index) == root:
+                self.poses[index] = correction @ self.poses[index]
+
+    def _find(self, index: int) -> int:
+        """Returns the root index of the component of a node."""
+        while self._parents[index] != index:
+            self._parents[index] = self._parents[self._parents[index]]
+            index: int = self._parents[index]
+        return index
+
+    def _union(self, source_root: int, target_root: int) -> None:
+        """Joins two components, keeping the lowest index as root so the first
+        node of a component remains its reference."""
+        root: int = min(source_root, target_root)
+        other: int = max(source_root, target_root)
+        self._parents[other] = root
+        self._dirty.discard(other)
+        self._dirty.add(root)
@@ -0,0 +1,128 @@
+"""Module for persistent storage of pairwise registration results."""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import zipfile
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from mynd.utils.log import logger
+
+from .data_types import RegistrationResult
+
+
+@dataclass
+class ResultStore:
+    """Class representing a store of pairwise registration results. Results
+    are stored as arrays in a directory, with file names derived from the
+    input fingerprints and the pipeline configuration, so that a batch can be
+    resumed after it has been interrupted. Without resume, stored results are
+    ignored and overwritten as pairs are registered again."""
+
+    @dataclass
+    class Statistics:
+        """Class representing result store statistics."""
+
+        hits: int = 0
+        misses: int = 0
+        saved: int = 0
+
+    directory: Path
+    pipeline: str = ""
+    resume: bool = True
+    statistics: Statistics = field(default_factory=Statistics)
+
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __post_init__(self) -> None:
+        """Creates the store directory if it does not exist."""
+        self.directory = Path(self.directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def key(self, target: str, source: str) -> str:
+        """Returns the store key for a pair of input fingerprints."""
+        hasher = hashlib.sha256(self.pipeline.encode())
+        hasher.update(target.encode())
+        hasher.update(source.encode())
+        return hasher.hexdigest()
+
+    def path(self, key: str) -> Path:
+        """Returns the file path for a result key."""
+        return self.directory / f"{key}.npz"
+
+    def load(self, key: str) -> RegistrationResult | None:
+        """Loads a result from the store, or returns none if it is missing or
+        can not be read. Results are stored compacted, so the loaded result
+        only has the correspondence subsample it was saved with."""
+
+        if not self.resume:
+            self._count("misses")
+            return None
+
+        path: Path = self.path(key)
+
+        try:
+            with np.load(path) as archive:
+                result: RegistrationResult = RegistrationResult.from_arrays(
+                    archive
+                )
+        except FileNotFoundError:
+            self._count("misses")
+            return None
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile) as error:
+            logger.warning(f"failed to read result file {path}: {error}")
+            self._count("misses")
+            return None
+
+        self._count("hits")
+        return result
+
+    def save(
+        self, key: str, result: RegistrationResult, subsample: int = 0
+    ) -> None:
+        """Saves a result to the store. The file is written to a temporary path
+        and renamed, so an interrupted batch never leaves partial files. At
+        most the given number of correspondences are stored."""
+
+        handle, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as file:
+                np.savez(file, **result.to_arrays(subsample=subsample))
+            os.replace(temporary, self.path(key))
+        except OSError as error:
+            logger.warning(f"failed to write result file: {error}")
+            Path(temporary).unlink(missing_ok=True)
+            return
+
+        self._count("saved")
+
+    def _count(self, name: str) -> None:
+        """Updates the store statistics."""
+        with self._lock:
+            setattr(self.statistics, name, getattr(self.statistics, name) + 1)
+
+
+def compute_config_hash(config: dict) -> str:
+    """Computes a hash of a configuration, independent of the key order."""
+    serialized: str = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+
+def compute_file_fingerprint(path: Path, block_size: int = 1 << 20) -> str:
+    """Computes a fingerprint of a file by hashing its content in a streamed
+    pass, without decoding it. Unlike modification times, the fingerprint is
+    unchanged when an identical file is exported again, and any change to the
+    content changes it."""
+
+    hasher = hashlib.sha256()
+    with open(path, "rb") as file:
+        while block := file.read(block_size):
+            hasher.update(block)
+
+    return hasher.hexdigest()
@@ -0,0 +1,101 @@
+"""Module for search structures over registration targets."""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from scipy.spatial import cKDTree
+
+from mynd.geometry import PointCloud
+
+
+@dataclass(frozen=True)
+class TargetIndex:
+    """Class representing search structures over a registration target, i.e.
+    a KD-tree over the target points and a copy of the target normals. The
+    index holds copies of the target attributes, so that it does not keep the
+    target point cloud alive."""
+
+    tree: cKDTree
+    normals: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        """Returns the number of target points."""
+        return self.tree.n
+
+    @property
+    def points(self) -> np.ndarray:
+        """Returns the target points."""
+        return self.tree.data
+
+    def query(
+        self,
+        points: np.ndarray,
+        distance_threshold: float,
+        workers: int = -1,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the distances and indices of the nearest target points. For
+        points without a target point within the distance threshold, the
+        distance is infinite."""
+        return self.tree.query(
+            points,
+            k=1,
+            distance_upper_bound=distance_threshold,
+            workers=workers,
+        )
+
+
+def build_target_index(cloud: PointCloud) -> TargetIndex:
+    """Builds a target index for a point cloud."""
+
+    normals: np.ndarray | None = None
+    if cloud.has_normals():
+        normals: np.ndarray = np.array(cloud.normals)
+
+    return TargetIndex(tree=cKDTree(np.array(cloud.points)), normals=normals)
+
+
+def compute_information_matrix(
+    source: PointCloud,
+    index: TargetIndex,
+    distance_threshold: float,
+    transformation: np.ndarray,
+    workers: int = -1,
+) -> np.ndarray:
+    """Computes the information matrix of a registration from its point
+    correspondences, using a prebuilt target index. The result is equivalent
+    to the Open3D estimator, which builds a new KD-tree for every call."""
+
+    points: np.ndarray = np.asarray(source.points)
+    points: np.ndarray = (
+        points @ transformation[:3, :3].T + transformation[:3, 3]
+    )
+
+    distances, indices = index.query(points, distance_threshold, workers)
+    targets: np.ndarray = index.points[indices[np.isfinite(distances)]]
+
+    return compute_correspondence_information(targets)
+
+
+def compute_correspondence_information(targets: np.ndarray) -> np.ndarray:
+    """Computes the information matrix of a registration from the target
+    points of its correspondences."""
+
+    # NOTE: Each correspondence contributes G^T G, where G is [-[t]x, I] for
+    # the target point t, so the sums are assembled from the point moments
+    count: int = len(targets)
+    moments: np.ndarray = targets.T @ targets
+    sums: np.ndarray = targets.sum(axis=0)
+
+    information: np.ndarray = np.zeros((6, 6))
+    information[:3, :3] = np.trace(moments) * np.identity(3) - moments
+    information[:3, 3:] = _skew(sums)
+    information[3:, :3] = _skew(sums).T
+    information[3:, 3:] = count * np.identity(3)
+    return information
+
+
+def _skew(vector: np.ndarray) -> np.ndarray:
+    """Returns the skew symmetric matrix of a vector."""
+    x, y, z = vector
+    return np.array([[0.0, -z, y], [z, 0.0, -x], [-y, x, 0.0]])
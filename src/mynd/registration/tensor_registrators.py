@@ -0,0 +1,250 @@
+"""Module for point cloud registrators based on the Open3D tensor API."""
+
+import open3d.core as core
+import open3d.utility as utility
+import open3d.t.pipelines.registration as treg
+
+# NOTE: Some report memory bugs if numpy is import before open3d
+import numpy as np
+
+from mynd.geometry import TensorPointCloud
+
+from .cache import LegacyConversionCache
+from .data_types import InformationEstimator, RegistrationResult
+from .registrator_types import PointCloudAligner, PointCloudRefiner
+
+
+def create_tensor_icp_convergence_criteria(
+    max_iteration: int = 30,
+    relative_fitness: float = 1e-06,
+    relative_rmse: float = 1e-06,
+) -> treg.ICPConvergenceCriteria:
+    """Creates a tensor ICP convergence criteria."""
+    return treg.ICPConvergenceCriteria(
+        max_iteration=max_iteration,
+        relative_fitness=relative_fitness,
+        relative_rmse=relative_rmse,
+    )
+
+
+def create_tensor_huber_loss(k: float) -> treg.robust_kernel.RobustKernel:
+    """Creates a tensor robust kernel with Huber loss."""
+    return treg.robust_kernel.RobustKernel(
+        treg.robust_kernel.RobustKernelMethod.HuberLoss, k
+    )
+
+
+def create_tensor_tukey_loss(k: float) -> treg.robust_kernel.RobustKernel:
+    """Creates a tensor robust kernel with Tukey loss."""
+    return treg.robust_kernel.RobustKernel(
+        treg.robust_kernel.RobustKernelMethod.TukeyLoss, k
+    )
+
+
+def create_tensor_point_to_plane_estimator(
+    kernel: treg.robust_kernel.RobustKernel | None = None,
+) -> treg.TransformationEstimation:
+    """Creates a tensor point to plane transformation estimator."""
+    if kernel is None:
+        return treg.TransformationEstimationPointToPlane()
+    return treg.TransformationEstimationPointToPlane(kernel)
+
+
+def create_tensor_colored_icp_estimator(
+    lambda_geometric: float,
+    kernel: treg.robust_kernel.RobustKernel | None = None,
+) -> treg.TransformationEstimation:
+    """Creates a tensor colored ICP transformation estimator."""
+    if kernel is None:
+        return treg.TransformationEstimationForColoredICP(lambda_geometric)
+    return treg.TransformationEstimationForColoredICP(lambda_geometric, kernel)
+
+
+def create_tensor_aligner(
+    aligner: PointCloudAligner,
+    conversions: LegacyConversionCache | None = None,
+) -> PointCloudAligner:
+    """Creates an aligner for tensor point clouds from a legacy aligner. The
+    Open3D tensor API has no feature based RANSAC, so the preprocessed point
+    clouds are converted to legacy point clouds for the alignment. Each point
+    cloud is converted once, e.g. a target that is aligned with several
+    sources through a preprocessing cache."""
+
+    if conversions is None:
+        conversions: LegacyConversionCache = LegacyConversionCache()
+
+    def tensor_aligner_wrapper(
+        source: TensorPointCloud,
+        target: TensorPointCloud,
+    ) -> RegistrationResult:
+        """Wraps a legacy aligner for tensor point clouds."""
+        return aligner(
+            source=conversions.convert(source),
+            target=conversions.convert(target),
+        )
+
+    return tensor_aligner_wrapper
+
+
+def create_tensor_icp_registrator(
+    estimation_method: treg.TransformationEstimation,
+    convergence_criteria: treg.ICPConvergenceCriteria,
+    distance_threshold: float,
+) -> PointCloudRefiner:
+    """Creates a tensor ICP registrator from the given arguments."""
+
+    def tensor_icp_wrapper(
+        source: TensorPointCloud,
+        target: TensorPointCloud,
+        transformation: np.ndarray,
+    ) -> RegistrationResult:
+        """Closure wrapper for tensor ICP registration method."""
+        return register_tensor_icp(
+            source=source,
+            target=target,
+            transformation=transformation,
+            estimation_method=estimation_method,
+            convergence_criteria=convergence_criteria,
+            distance_threshold=distance_threshold,
+        )
+
+    return tensor_icp_wrapper
+
+
+def create_tensor_multi_scale_icp_registrator(
+    estimation_method: treg.TransformationEstimation,
+    voxel_sizes: list[float],
+    distance_thresholds: list[float],
+    convergence_criteria: list[treg.ICPConvergenceCriteria],
+) -> PointCloudRefiner:
+    """Creates a tensor multi-scale ICP registrator from the given arguments."""
+
+    assert (
+        len(voxel_sizes) == len(distance_thresholds) == len(convergence_criteria)
+    ), "multi-scale icp requires the same number of parameters for each scale"
+
+    def tensor_multi_scale_icp_wrapper(
+        source: TensorPointCloud,
+        target: TensorPointCloud,
+        transformation: np.ndarray,
+    ) -> RegistrationResult:
+        """Closure wrapper for tensor multi-scale ICP registration method."""
+        return register_tensor_multi_scale_icp(
+            source=source,
+            target=target,
+            transformation=transformation,
+            estimation_method=estimation_method,
+            voxel_sizes=voxel_sizes,
+            distance_thresholds=distance_thresholds,
+            convergence_criteria=convergence_criteria,
+        )
+
+    return tensor_multi_scale_icp_wrapper
+
+
+"""
+Worker functions:
+ - register_tensor_icp
+ - register_tensor_multi_scale_icp
+"""
+
+
+def register_tensor_icp(
+    source: TensorPointCloud,
+    target: TensorPointCloud,
+    transformation: np.ndarray,
+    *,
+    distance_threshold: float,
+    estimation_method: treg.TransformationEstimation,
+    convergence_criteria: treg.ICPConvergenceCriteria = treg.ICPConvergenceCriteria(),
+) -> RegistrationResult:
+    """Registers the source to the target with tensor ICP."""
+
+    result: treg.RegistrationResult = treg.icp(
+        source=source,
+        target=target,
+        max_correspondence_distance=distance_threshold,
+        init_source_to_target=core.Tensor(transformation),
+        estimation_method=estimation_method,
+        criteria=convergence_criteria,
+    )
+
+    return _convert_tensor_result(
+        result, source, target, distance_threshold=distance_threshold
+    )
+
+
+def register_tensor_multi_scale_icp(
+    source: TensorPointCloud,
+    target: TensorPointCloud,
+    transformation: np.ndarray,
+    *,
+    estimation_method: treg.TransformationEstimation,
+    voxel_sizes: list[float],
+    distance_thresholds: list[float],
+    convergence_criteria: list[treg.ICPConvergenceCriteria],
+) -> RegistrationResult:
+    """Registers the source to the target with tensor multi-scale ICP."""
+
+    result: treg.RegistrationResult = treg.multi_scale_icp(
+        source=source,
+        target=target,
+        voxel_sizes=utility.DoubleVector(voxel_sizes),
+        criteria_list=convergence_criteria,
+        max_correspondence_distances=utility.DoubleVector(distance_thresholds),
+        init_source_to_target=core.Tensor(transformation),
+        estimation_method=estimation_method,
+    )
+
+    return _convert_tensor_result(
+        result, source, target, distance_threshold=distance_thresholds[-1]
+    )
+
+
+def _convert_tensor_result(
+    result: treg.RegistrationResult,
+    source: TensorPointCloud,
+    target: TensorPointCloud,
+    distance_threshold: float,
+) -> RegistrationResult:
+    """Converts a tensor registration result to a registration result."""
+
+    transformation: np.ndarray = result.transformation.numpy()
+
+    def information_estimator() -> np.ndarray:
+        """Estimates the information matrix with the tensor API."""
+        return treg.get_information_matrix(
+            source,
+            target,
+            distance_threshold,
+            core.Tensor(transformation),
+        ).numpy()
+
+    information: InformationEstimator = information_estimator
+
+    return RegistrationResult(
+        fitness=result.fitness,
+        inlier_rmse=result.inlier_rmse,
+        correspondence_set=_convert_tensor_correspondences(result),
+        transformation=transformation,
+        information=information,
+        iterations=getattr(result, "num_iterations", None),
+    )
+
+
+def _convert_tensor_correspondences(
+    result: treg.RegistrationResult,
+) -> np.ndarray:
+    """Converts tensor correspondences, i.e. a target index for each source
+    point or -1, to source and target index pairs."""
+
+    # NOTE: The correspondence attribute was renamed in Open3D 0.19
+    if hasattr(result, "correspondence_set"):
+        correspondences: core.Tensor = result.correspondence_set
+    else:
+        correspondences: core.Tensor = result.correspondences_
+
+    targets: np.ndarray = correspondences.numpy().reshape(-1)
+    sources: np.ndarray = np.flatnonzero(targets >= 0)
+
+    return np.stack([sources, targets[sources]], axis=1)
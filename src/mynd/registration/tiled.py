@@ -0,0 +1,359 @@
+"""Module for out-of-core registration of point clouds split into tiles."""
+
+import itertools
+import json
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import open3d
+
+# NOTE: Some report memory bugs if numpy is import before open3d
+import numpy as np
+
+from scipy.spatial.transform import Rotation
+
+from mynd.geometry import PointCloud
+from mynd.utils.result import Ok, Err, Result
+
+from .data_types import RegistrationResult
+from .pipeline import RegistrationPipeline, apply_registration_pipeline
+
+
+TileKey = tuple[int, int]
+
+
+INDEX_FILE: str = "tiles.json"
+DOWNSAMPLE_FILE: str = "downsample.ply"
+
+
+@dataclass(frozen=True)
+class TiledPointCloud:
+    """Class representing a point cloud split into square tiles in the
+    horizontal plane. Each tile is stored as a file of raw vertex records, and
+    a global downsample of the whole point cloud is stored along with them, so
+    that only a few tiles need to be held in memory at a time."""
+
+    @dataclass(frozen=True)
+    class Tile:
+        """Class representing a tile with its point count and bounds."""
+
+        count: int
+        lower: np.ndarray
+        upper: np.ndarray
+
+    directory: Path
+    tile_size: float
+    dtype: np.dtype
+    tiles: dict[TileKey, Tile]
+
+    def keys(self) -> list[TileKey]:
+        """Returns the keys of the tiles."""
+        return list(self.tiles.keys())
+
+    def path(self, key: TileKey) -> Path:
+        """Returns the file path of a tile."""
+        return _get_tile_path(self.directory, key)
+
+    def load_vertices(self, key: TileKey) -> np.ndarray:
+        """Loads the vertex records of a tile."""
+        return np.fromfile(self.path(key), dtype=self.dtype)
+
+    def load_tile(self, key: TileKey) -> PointCloud:
+        """Loads a tile as a point cloud."""
+        return create_point_cloud_from_vertices(self.load_vertices(key))
+
+    def load_region(self, lower: np.ndarray, upper: np.ndarray) -> PointCloud:
+        """Loads the points within an axis aligned box from the tiles that
+        intersect it."""
+
+        keys: list[TileKey] = [
+            key
+            for key, tile in self.tiles.items()
+            if np.all(tile.lower <= upper) and np.all(tile.upper >= lower)
+        ]
+
+        if not keys:
+            return PointCloud()
+
+        vertices: np.ndarray = np.concatenate(
+            [self.load_vertices(key) for key in keys]
+        )
+        positions: np.ndarray = _get_positions(vertices)
+        inside: np.ndarray = np.all(
+            (positions >= lower) & (positions <= upper), axis=1
+        )
+        return create_point_cloud_from_vertices(vertices[inside])
+
+    def load_downsample(self) -> PointCloud:
+        """Loads the global downsample of the point cloud."""
+        return open3d.io.read_point_cloud(str(self.directory / DOWNSAMPLE_FILE))
+
+
+def tile_point_cloud(
+    vertices: np.ndarray,
+    directory: Path,
+    tile_size: float,
+    spacing: float,
+    chunk_size: int = 5_000_000,
+) -> TiledPointCloud:
+    """Splits point cloud vertices, e.g. memory mapped from a file, into tiles
+    on disk. The vertices are traversed once in chunks, and a global downsample
+    with the given spacing is built during the traversal, so that the memory
+    use is bounded by the chunk size and the size of the downsample."""
+
+    directory: Path = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    # NOTE: Tiles are appended to chunk by chunk, so existing tiles are removed
+    for path in directory.glob("tile_*.bin"):
+        path.unlink()
+
+    counts: dict[TileKey, int] = dict()
+    lowers: dict[TileKey, np.ndarray] = dict()
+    uppers: dict[TileKey, np.ndarray] = dict()
+    downsamples: list[PointCloud] = list()
+
+    for start in range(0, len(vertices), chunk_size):
+        chunk: np.ndarray = np.asarray(vertices[start : start + chunk_size])
+        positions: np.ndarray = _get_positions(chunk)
+
+        cells: np.ndarray = np.floor(positions[:, :2] / tile_size).astype(int)
+        order: np.ndarray = np.lexsort((cells[:, 1], cells[:, 0]))
+        unique, first = np.unique(cells[order], axis=0, return_index=True)
+
+        for cell, rows in zip(unique, np.split(order, first[1:])):
+            key: TileKey = (int(cell[0]), int(cell[1]))
+            records: np.ndarray = chunk[rows]
+
+            with open(_get_tile_path(directory, key), "ab") as file:
+                records.tofile(file)
+
+            lower: np.ndarray = positions[rows].min(axis=0)
+            upper: np.ndarray = positions[rows].max(axis=0)
+            counts[key] = counts.get(key, 0) + len(rows)
+            lowers[key] = np.minimum(lowers.get(key, lower), lower)
+            uppers[key] = np.maximum(uppers.get(key, upper), upper)
+
+        downsamples.append(
+            create_point_cloud_from_vertices(chunk).voxel_down_sample(spacing)
+        )
+
+    downsample: PointCloud = PointCloud()
+    for cloud in downsamples:
+        downsample += cloud
+    downsample: PointCloud = downsample.voxel_down_sample(spacing)
+    open3d.io.write_point_cloud(str(directory / DOWNSAMPLE_FILE), downsample)
+
+    tiled: TiledPointCloud = TiledPointCloud(
+        directory=directory,
+        tile_size=tile_size,
+        dtype=vertices.dtype,
+        tiles={
+            key: TiledPointCloud.Tile(
+                count=counts.get(key),
+                lower=lowers.get(key),
+                upper=uppers.get(key),
+            )
+            for key in sorted(counts)
+        },
+    )
+    _write_tile_index(tiled)
+    return tiled
+
+
+def read_tiled_point_cloud(directory: Path) -> Result[TiledPointCloud, str]:
+    """Reads a tiled point cloud from its directory."""
+
+    directory: Path = Path(directory)
+
+    try:
+        index: dict = json.loads((directory / INDEX_FILE).read_text())
+    except (OSError, ValueError) as error:
+        return Err(f"failed to read tile index: {error}")
+
+    return Ok(
+        TiledPointCloud(
+            directory=directory,
+            tile_size=index.get("tile_size"),
+            dtype=np.lib.format.descr_to_dtype(
+                [tuple(field) for field in index.get("dtype")]
+            ),
+            tiles={
+                tuple(tile.get("key")): TiledPointCloud.Tile(
+                    count=tile.get("count"),
+                    lower=np.asarray(tile.get("lower")),
+                    upper=np.asarray(tile.get("upper")),
+                )
+                for tile in index.get("tiles")
+            },
+        )
+    )
+
+
+def register_tiled(
+    pipeline: RegistrationPipeline,
+    source: TiledPointCloud,
+    target: TiledPointCloud,
+    margin: float,
+    min_points: int = 100,
+) -> RegistrationResult:
+    """Registers a tiled source to a tiled target. The aligner module of the
+    pipeline is applied to the global downsamples. Each refiner module is then
+    applied to every source tile and the target points around it, and the
+    tile results are fused into a single transformation weighted by their
+    information matrices. Only one tile pair is held in memory at a time."""
+
+    if pipeline.backend != "legacy":
+        raise NotImplementedError(
+            "tiled registration is only supported by the legacy backend"
+        )
+
+    result: RegistrationResult = apply_registration_pipeline(
+        RegistrationPipeline(pipeline.initializer, backend=pipeline.backend),
+        source=source.load_downsample(),
+        target=target.load_downsample(),
+    )
+
+    for module in pipeline.incrementors:
+        tile_results: list[RegistrationResult] = list()
+
+        for key in source.keys():
+            tile: TiledPointCloud.Tile = source.tiles.get(key)
+            lower, upper = _transform_bounds(
+                tile.lower, tile.upper, result.transformation
+            )
+
+            target_cloud: PointCloud = target.load_region(
+                lower - margin, upper + margin
+            )
+            if len(target_cloud.points) < min_points:
+                continue
+
+            tile_result: RegistrationResult = module.registrator(
+                source=module.preprocessor(source.load_tile(key)),
+                target=module.preprocessor(target_cloud),
+                transformation=result.transformation,
+            )
+            tile_results.append(tile_result.compact())
+
+        if tile_results:
+            result: RegistrationResult = _fuse_tile_results(
+                tile_results, result.transformation
+            )
+
+    return result
+
+
+def create_point_cloud_from_vertices(vertices: np.ndarray) -> PointCloud:
+    """Creates a point cloud from structured vertex records with positions,
+    and optionally normals and colors."""
+
+    names: tuple[str] = vertices.dtype.names
+
+    cloud: PointCloud = PointCloud(
+        open3d.utility.Vector3dVector(_get_positions(vertices))
+    )
+
+    if {"nx", "ny", "nz"}.issubset(names):
+        normals: np.ndarray = np.stack(
+            [vertices["nx"], vertices["ny"], vertices["nz"]], axis=1
+        )
+        cloud.normals = open3d.utility.Vector3dVector(normals.astype(float))
+
+    if {"red", "green", "blue"}.issubset(names):
+        colors: np.ndarray = np.stack(
+            [vertices["red"], vertices["green"], vertices["blue"]], axis=1
+        )
+        if np.issubdtype(colors.dtype, np.integer):
+            colors: np.ndarray = colors / np.iinfo(colors.dtype).max
+        cloud.colors = open3d.utility.Vector3dVector(colors.astype(float))
+
+    return cloud
+
+
+def _get_tile_path(directory: Path, key: TileKey) -> Path:
+    """Returns the file path of a tile in a directory."""
+    return directory / f"tile_{key[0]}_{key[1]}.bin"
+
+
+def _get_positions(vertices: np.ndarray) -> np.ndarray:
+    """Returns the positions of structured vertex records."""
+    return np.stack(
+        [vertices["x"], vertices["y"], vertices["z"]], axis=1
+    ).astype(float)
+
+
+def _transform_bounds(
+    lower: np.ndarray, upper: np.ndarray, transformation: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the axis aligned bounds of a transformed box."""
+    corners: np.ndarray = np.array(list(itertools.product(*zip(lower, upper))))
+    corners: np.ndarray = (
+        corners @ transformation[:3, :3].T + transformation[:3, 3]
+    )
+    return corners.min(axis=0), corners.max(axis=0)
+
+
+def _fuse_tile_results(
+    results: list[RegistrationResult], transformation: np.ndarray
+) -> RegistrationResult:
+    """Fuses tile results refined from a common transformation. The updates
+    of each tile, as rotation vectors and translations, are averaged with
+    their information matrices as weights."""
+
+    information: np.ndarray = np.zeros((6, 6))
+    weighted: np.ndarray = np.zeros(6)
+
+    for result in results:
+        update: np.ndarray = result.transformation @ np.linalg.inv(
+            transformation
+        )
+        step: np.ndarray = np.concatenate(
+            [Rotation.from_matrix(update[:3, :3]).as_rotvec(), update[:3, 3]]
+        )
+        information += result.information
+        weighted += result.information @ step
+
+    step: np.ndarray = np.linalg.lstsq(information, weighted, rcond=None)[0]
+
+    update: np.ndarray = np.identity(4)
+    update[:3, :3] = Rotation.from_rotvec(step[:3]).as_matrix()
+    update[:3, 3] = step[3:]
+
+    counts: np.ndarray = np.array(
+        [result.correspondence_count for result in results]
+    )
+    weights: np.ndarray = counts / max(counts.sum(), 1)
+
+    return RegistrationResult(
+        fitness=float(
+            np.dot(weights, [result.fitness for result in results])
+        ),
+        inlier_rmse=float(
+            np.dot(weights, [result.inlier_rmse for result in results])
+        ),
+        correspondence_set=np.empty((0, 2), dtype=np.int64),
+        transformation=update @ transformation,
+        information=information,
+        correspondence_count=int(counts.sum()),
+    )
+
+
+def _write_tile_index(tiled: TiledPointCloud) -> None:
+    """Writes the index of a tiled point cloud to its directory."""
+
+    index: dict = {
+        "tile_size": tiled.tile_size,
+        "dtype": np.lib.format.dtype_to_descr(tiled.dtype),
+        "tiles": [
+            {
+                "key": list(key),
+                "count": tile.count,
+                "lower": tile.lower.tolist(),
+                "upper": tile.upper.tolist(),
+            }
+            for key, tile in tiled.tiles.items()
+        ],
+    }
+    (tiled.directory / INDEX_FILE).write_text(json.dumps(index, indent=2))
@@ -1,15 +1,22 @@
 """Module for registration utility functionality."""
 
+from collections import deque
 from collections.abc import Sequence
 from dataclasses import dataclass
 from typing import TypeVar
 
+import open3d.pipelines.registration as reg
+
+# NOTE: Some report memory bugs if numpy is import before open3d
 import numpy as np
 
+from mynd.geometry import PointCloud
 from mynd.spatial import decompose_transformation, rotation_matrix_to_euler
 from mynd.utils.log import logger
 
-from .data_types import RegistrationResult
+from .cache import TargetIndexCache
+from .data_types import InformationEstimator, RegistrationResult
+from .target_index import compute_information_matrix
 
 
 T: TypeVar = TypeVar("T")
@@ -49,6 +56,79 @@ def generate_indices_cascade(items: Sequence[T]) -> list[RegistrationIndex]:
     return indices
 
 
+def order_indices_by_reuse(
+    indices: Sequence[RegistrationIndex],
+    window: int = 8,
+) -> list[RegistrationIndex]:
+    """Orders registration indices so that pairs sharing a point cloud are
+    registered back to back. Starting from the first index, the next index is
+    greedily chosen as the one sharing the most recently used point cloud,
+    which keeps the working set of a point cloud cache small. Only the given
+    number of most recently used point clouds are considered."""
+
+    remaining: list[RegistrationIndex] = list(indices)
+    ordered: list[RegistrationIndex] = list()
+    recent: deque[T] = deque(maxlen=window)
+
+    while remaining:
+        position: int = _find_reusing_index(remaining, recent)
+        index: RegistrationIndex = remaining.pop(position)
+        ordered.append(index)
+
+        for key in (index.target, index.source):
+            if key in recent:
+                recent.remove(key)
+            recent.append(key)
+
+    return ordered
+
+
+def _find_reusing_index(
+    indices: list[RegistrationIndex], recent: deque[T]
+) -> int:
+    """Returns the position of the index that reuses the most recently used
+    point clouds, or the first index if none of them are reused."""
+
+    for key in reversed(recent):
+        for position, index in enumerate(indices):
+            if key in (index.target, index.source):
+                return position
+
+    return 0
+
+
+def create_information_estimator(
+    source: PointCloud,
+    target: PointCloud,
+    distance_threshold: float,
+    transformation: np.ndarray,
+    indices: TargetIndexCache | None = None,
+) -> InformationEstimator:
+    """Creates an estimator that computes the information matrix of a
+    registration from its point correspondences when called. If a target index
+    cache is given, the correspondences are found with the cached index of
+    the target instead of a new KD-tree."""
+
+    def information_estimator_wrapper() -> np.ndarray:
+        """Wraps the Open3D information matrix estimator."""
+        if indices is not None:
+            return compute_information_matrix(
+                source=source,
+                index=indices.index(target),
+                distance_threshold=distance_threshold,
+                transformation=transformation,
+            )
+
+        return reg.get_information_matrix_from_point_clouds(
+            source=source,
+            target=target,
+            max_correspondence_distance=distance_threshold,
+            transformation=transformation,
+        )
+
+    return information_estimator_wrapper
+
+
 def log_registration_result(result: RegistrationResult) -> None:
     """Logs a registration result."""
 
@@ -58,7 +138,7 @@ def log_registration_result(result: RegistrationResult) -> None:
 
     rotz, roty, rotx = rotation_matrix_to_euler(rotation, degrees=True)
 
-    correspondence_count: int = len(result.correspondence_set)
+    correspondence_count: int = result.correspondence_count
 
     np.set_printoptions(precision=3)
 
@@ -11,7 +11,7 @@ from mynd.image import ImageCompositeLoader
 
 from mynd.geometry import (
     StereoRectificationResult,
-    compute_stereo_rectification,
+    load_stereo_rectification,
 )
 
 import h5py as h5
@@ -207,7 +207,9 @@ def handle_camera_export(
             )
 
             rectification: StereoRectificationResult = (
-                compute_stereo_rectification(calibrations)
+                load_stereo_rectification(
+                    left=calibrations.first, right=calibrations.second
+                )
             )
 
             result: Result[None, str] = insert_sensor_identifier_into(
@@ -1,9 +1,11 @@
 """Package with functionality for exporting stereo geometry."""
 
 from .export_stereo_geometry import (
+    ExportStereoGeometryConfig,
     export_stereo_geometry,
 )
 
 __all__ = [
+    "ExportStereoGeometryConfig",
     "export_stereo_geometry",
 ]
@@ -1,9 +1,13 @@
 """Module for exporting stereo geometry, including rectification results, range
 maps, and normal maps."""
 
+import functools
 import os
 
-from dataclasses import dataclass
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TypeAlias
 
@@ -13,15 +17,20 @@ import tqdm
 from mynd.camera import CameraID
 from mynd.collections import StereoCameraGroup
 
-from mynd.geometry import StereoMatcher, create_hitnet_matcher
+from mynd.geometry import (
+    HitnetSessionConfig,
+    StereoMatcher,
+    create_hitnet_matcher,
+)
 from mynd.geometry import (
     StereoGeometry,
-    compute_stereo_geometry,
+    compute_stereo_geometry_from_disparities,
     distort_stereo_geometry,
+    rectify_stereo_images,
 )
 from mynd.geometry import (
     StereoRectificationResult,
-    compute_stereo_rectification,
+    load_stereo_rectification,
 )
 
 from mynd.image import Image, ImageLoader
@@ -37,6 +46,7 @@ from mynd.visualization import (
 )
 
 from mynd.utils.containers import Pair
+from mynd.utils.generators import generate_prefetched
 from mynd.utils.key_codes import KeyCode
 from mynd.utils.log import logger
 from mynd.utils.result import Ok, Err, Result
@@ -64,8 +74,34 @@ class ExportStereoGeometryConfig:
         image_filter: object | None = None
         disparity_filter: object | None = None
 
+    @dataclass
+    class Pipelining:
+        """Class representing the workers of the export stages, and the
+        number of camera pairs each stage can hold ahead of the next one. The
+        matcher stage always has a single worker."""
+
+        loaders: int = 4
+        geometry: int = 2
+        writers: int = 4
+        depth: int = 8
+
     directories: Directories
     processors: Processors
+    pipelining: Pipelining = field(default_factory=Pipelining)
+
+
+@dataclass
+class StereoExportItem:
+    """Class representing a camera pair as it passes through the export
+    stages."""
+
+    camera_pair: Pair[CameraID]
+    images: Pair[Image]
+    rectified: Pair[Image]
+    disparities: Pair[np.ndarray] | None = None
+    geometry: StereoGeometry | None = None
+    ranges: Pair[Image] | None = None
+    normals: Pair[Image] | None = None
 
 
 Config: TypeAlias = ExportStereoGeometryConfig
@@ -77,22 +113,32 @@ def export_stereo_geometry(
     matcher: Path,
     visualize: bool,
     save_samples: bool,
+    session: HitnetSessionConfig = HitnetSessionConfig(),
+    pipelining: Config.Pipelining | None = None,
 ) -> Result[None, str]:
-    """Invoke a stereo export task."""
+    """Invoke a stereo export task. The session config selects the execution
+    provider and session options of the matcher, and the pipelining config
+    the workers and prefetch depth of the export stages."""
 
     logger.info(f"Stereo group:     {stereo_group.group_identifier}")
     logger.info(f"Destination:      {destination}")
     logger.info(f"Matcher:          {matcher}")
     logger.info(f"Visualize:        {visualize}")
     logger.info(f"Save samples:     {save_samples}")
+    logger.info(f"Provider:         {session.provider}")
+    logger.info(f"Pipelining:       {pipelining or Config.Pipelining()}")
 
     # TODO: Create configuration
     directories: Config.Directories = prepare_export_directories(
         destination, stereo_group, save_samples
     )
-    processors: Config.Processors = prepare_stereo_processors(matcher)
+    processors: Config.Processors = prepare_stereo_processors(
+        matcher, session
+    )
 
-    config: Config = Config(directories, processors)
+    config: Config = Config(
+        directories, processors, pipelining or Config.Pipelining()
+    )
 
     logger.info("Directories:")
     logger.info(f" - Base:      {config.directories.base}")
@@ -101,7 +147,7 @@ def export_stereo_geometry(
     logger.info(f" - Samples:   {config.directories.samples}")
     logger.info("")
 
-    rectification: StereoRectificationResult = compute_stereo_rectification(
+    rectification: StereoRectificationResult = load_stereo_rectification(
         left=stereo_group.calibrations.first,
         right=stereo_group.calibrations.second,
     )
@@ -111,76 +157,165 @@ def export_stereo_geometry(
     else:
         windows = None
 
-    EXPORT_SAMPLE_EVERY: int = 50
-    for index, camera_pair in tqdm.tqdm(
-        enumerate(stereo_group.camera_pairs),
-        desc="Estimating stereo geometry...",
-    ):
+    pipelining: Config.Pipelining = config.pipelining
 
-        loaders: Pair[ImageLoader] = Pair(
-            stereo_group.image_loaders.get(camera_pair.first),
-            stereo_group.image_loaders.get(camera_pair.second),
+    # NOTE: Images are loaded and rectified, matched, converted into geometry,
+    # and written in separate stages, so that disk I/O and image decoding
+    # overlap with inference
+    with (
+        ThreadPoolExecutor(pipelining.loaders) as load_pool,
+        ThreadPoolExecutor(1) as match_pool,
+        ThreadPoolExecutor(pipelining.geometry) as geometry_pool,
+        ThreadPoolExecutor(pipelining.writers) as write_pool,
+    ):
+        loaded: Iterator[StereoExportItem] = generate_prefetched(
+            stereo_group.camera_pairs,
+            functools.partial(
+                load_stereo_item, stereo_group, rectification, config
+            ),
+            load_pool,
+            pipelining.depth,
+        )
+        matched: Iterator[StereoExportItem] = generate_prefetched(
+            loaded,
+            functools.partial(match_stereo_item, config),
+            match_pool,
+            pipelining.depth,
+        )
+        completed: Iterator[StereoExportItem] = generate_prefetched(
+            matched,
+            functools.partial(complete_stereo_item, rectification, config),
+            geometry_pool,
+            pipelining.depth,
         )
 
-        assert loaders.first is not None, "invalid first image loader"
-        assert loaders.second is not None, "invalid second image loader"
+        writes: deque[Future] = deque()
+
+        EXPORT_SAMPLE_EVERY: int = 50
+        for index, item in tqdm.tqdm(
+            enumerate(completed),
+            total=len(stereo_group.camera_pairs),
+            desc="Estimating stereo geometry...",
+        ):
+            if directories.samples and index % EXPORT_SAMPLE_EVERY == 0:
+                writes.append(
+                    write_pool.submit(write_stereo_sample, config, item)
+                )
+
+            # Write stereo geometry
+            writes.append(
+                write_pool.submit(
+                    write_stereo_geometry,
+                    directories=config.directories,
+                    camera_pair=item.camera_pair,
+                    ranges=item.ranges,
+                    normals=item.normals,
+                )
+            )
 
-        images: Pair[Image] = Pair(
-            first=loaders.first(),
-            second=loaders.second(),
-        )
+            while len(writes) > pipelining.depth:
+                log_write_errors(writes.popleft())
 
-        assert images.first is not None, "invalid first image"
-        assert images.second is not None, "invalid second image"
+            if windows:
+                # Visualize stereo geometry mapped back into the distorted
+                # image frame
+                render_stereo_geometry(windows, item.geometry, distort=True)
 
-        geometry: StereoGeometry = compute_stereo_geometry(
-            rectification=rectification,
-            images=images,
-            matcher=config.processors.disparity_estimator,
-            image_filter=config.processors.image_filter,
-            disparity_filter=config.processors.disparity_filter,
-        )
+                match wait_key_input(100):
+                    case KeyCode.ESC:
+                        logger.info("Quitting...")
+                        destroy_all_windows()
+                        break
+                    case KeyCode.SPACE:
+                        continue
+                    case _:
+                        continue
 
-        # TODO: Add option to distort or leave undistorted
-        ranges: Pair[Image]
-        normals: Pair[Image]
-        ranges, normals = distort_stereo_geometry(geometry)
+        while writes:
+            log_write_errors(writes.popleft())
 
-        if directories.samples and index % EXPORT_SAMPLE_EVERY == 0:
-            combined_image: Image = create_stereo_geometry_color_image(
-                geometry.raw_images, ranges, normals
-            )
-            export_stereo_geometry_sample(
-                directories=directories,
-                camera_pair=camera_pair,
-                image=combined_image,
-            )
 
-        # Write stereo geometry
-        results: list[Result] = write_stereo_geometry(
-            directories=config.directories,
-            camera_pair=camera_pair,
-            ranges=ranges,
-            normals=normals,
-        )
+def load_stereo_item(
+    stereo_group: StereoCameraGroup,
+    rectification: StereoRectificationResult,
+    config: Config,
+    camera_pair: Pair[CameraID],
+) -> StereoExportItem:
+    """Loads and rectifies the images of a camera pair."""
+
+    loaders: Pair[ImageLoader] = Pair(
+        stereo_group.image_loaders.get(camera_pair.first),
+        stereo_group.image_loaders.get(camera_pair.second),
+    )
+
+    assert loaders.first is not None, "invalid first image loader"
+    assert loaders.second is not None, "invalid second image loader"
+
+    images: Pair[Image] = Pair(
+        first=loaders.first(),
+        second=loaders.second(),
+    )
+
+    assert images.first is not None, "invalid first image"
+    assert images.second is not None, "invalid second image"
+
+    rectified: Pair[Image] = rectify_stereo_images(
+        rectification, images, config.processors.image_filter
+    )
+
+    return StereoExportItem(camera_pair, images, rectified)
+
+
+def match_stereo_item(
+    config: Config, item: StereoExportItem
+) -> StereoExportItem:
+    """Estimates the disparities of a rectified camera pair."""
+    item.disparities = config.processors.disparity_estimator(
+        left=item.rectified.first,
+        right=item.rectified.second,
+    )
+    return item
+
+
+def complete_stereo_item(
+    rectification: StereoRectificationResult,
+    config: Config,
+    item: StereoExportItem,
+) -> StereoExportItem:
+    """Computes the range and normal maps of a matched camera pair, and maps
+    them back into the distorted image frames."""
+
+    item.geometry = compute_stereo_geometry_from_disparities(
+        rectification,
+        item.images,
+        item.rectified,
+        item.disparities,
+        config.processors.disparity_filter,
+    )
+
+    # TODO: Add option to distort or leave undistorted
+    item.ranges, item.normals = distort_stereo_geometry(item.geometry)
+    return item
+
 
-        for result in results:
-            if result.is_err():
-                logger.error(result.err())
+def write_stereo_sample(config: Config, item: StereoExportItem) -> list[Result]:
+    """Creates and writes a sample image of the stereo geometry."""
+    combined_image: Image = create_stereo_geometry_color_image(
+        item.geometry.raw_images, item.ranges, item.normals
+    )
+    export_stereo_geometry_sample(
+        directories=config.directories,
+        camera_pair=item.camera_pair,
+        image=combined_image,
+    )
+    return list()
 
-        if windows:
-            # Visualize stereo geometry mapped back into the distorted image frame
-            render_stereo_geometry(windows, geometry, distort=True)
 
-            match wait_key_input(100):
-                case KeyCode.ESC:
-                    logger.info("Quitting...")
-                    destroy_all_windows()
-                    return
-                case KeyCode.SPACE:
-                    continue
-                case _:
-                    continue
+def log_write_errors(write: Future) -> None:
+    """Waits for a write to complete and logs its errors."""
+    for result in write.result():
+        if result.is_err():
+            logger.error(result.err())
 
 
 def prepare_export_directories(
@@ -221,10 +356,12 @@ def prepare_export_directories(
     return directories
 
 
-def prepare_stereo_processors(matcher: Path) -> Config.Processors:
+def prepare_stereo_processors(
+    matcher: Path, session: HitnetSessionConfig = HitnetSessionConfig()
+) -> Config.Processors:
     """Prepares stereo processors."""
 
-    stereo_matcher: StereoMatcher = create_hitnet_matcher(matcher)
+    stereo_matcher: StereoMatcher = create_hitnet_matcher(matcher, session)
 
     processors: Config.Processors = Config.Processors(
         disparity_estimator=stereo_matcher,
@@ -3,16 +3,18 @@
 from collections.abc import Callable
 
 from mynd.collections import GroupID
-from mynd.geometry import PointCloud, PointCloudLoader
+from mynd.geometry import PointCloud
 
 from mynd.registration import RegistrationPipeline, RegistrationResult
+from mynd.registration import PointCloudCache, PreprocessingCache
 from mynd.registration import RegistrationBatch, register_batch
+from mynd.registration import StageSummary, aggregate_batch_records
 from mynd.registration import RegistrationIndex
 
 from mynd.visualization import visualize_registration
 
 from mynd.utils.log import logger
-from mynd.utils.result import Ok, Result
+from mynd.utils.result import Ok, Err, Result
 
 
 def register_groups(
@@ -22,27 +24,54 @@ def register_groups(
     reference: GroupID,
     visualize: bool = False,
     callback: Callable | None = None,
+    executor: str = "sequential",
+    workers: int | None = None,
 ) -> Result[RegistrationBatch.Result, str]:
     """Registers a batch of groups with the given"""
 
     logger.info("")
     logger.info("Performing batch registration...")
-    registration_results: list[RegistrationBatch.PairResult] = register_batch(
-        batch,
-        pipeline,
-        indices,
-        callback=callback,
+    pair_outcomes: list[Result[RegistrationBatch.PairResult, str]] = (
+        register_batch(
+            batch,
+            pipeline,
+            indices,
+            callback=callback,
+            executor=executor,
+            workers=workers,
+        )
     )
     logger.info("Batch registration done!")
     logger.info("")
 
+    # NOTE: Process workers hold their own copies of the caches, so the
+    # statistics of the caches in this process are not representative
+    if executor == "process":
+        logger.info("Cache statistics are not collected for process workers")
+    else:
+        if batch.cache is not None:
+            log_cache_statistics(batch.cache)
+
+        if batch.preprocessing is not None:
+            log_preprocessing_statistics(batch.preprocessing)
+
+    log_stage_statistics(aggregate_batch_records(pair_outcomes))
+
+    registration_results: list[RegistrationBatch.PairResult] = list()
+    for outcome in pair_outcomes:
+        match outcome:
+            case Ok(pairwise):
+                registration_results.append(pairwise)
+            case Err(message):
+                logger.error(message)
+
+    if not registration_results:
+        return Err("batch registration failed for all pairs")
+
     if visualize:
         for registration in registration_results:
-            target_loader: PointCloudLoader = batch.get(registration.target)
-            source_loader: PointCloudLoader = batch.get(registration.source)
-
-            target_cloud: PointCloud = target_loader().unwrap()
-            source_cloud: PointCloud = source_loader().unwrap()
+            target_cloud: PointCloud = batch.load(registration.target).unwrap()
+            source_cloud: PointCloud = batch.load(registration.source).unwrap()
 
             visualize_registration(
                 target=target_cloud,
@@ -70,3 +99,42 @@ def reference_registration_results(
             source_results[pairwise.source] = pairwise.result
 
     return RegistrationBatch.Result(target=target, sources=source_results)
+
+
+def log_cache_statistics(cache: PointCloudCache) -> None:
+    """Logs the statistics of a point cloud cache."""
+
+    statistics: PointCloudCache.Statistics = cache.statistics
+
+    logger.info(f"Cache hits:       {statistics.hits}")
+    logger.info(f"Cache misses:     {statistics.misses}")
+    logger.info(f"Cache waits:      {statistics.waits}")
+    logger.info(f"Cache hit rate:   {statistics.hit_rate:.3f}")
+    logger.info(f"Cache evictions:  {statistics.evictions}")
+    logger.info(f"Evicted bytes:    {statistics.evicted_bytes}")
+
+
+def log_preprocessing_statistics(cache: PreprocessingCache) -> None:
+    """Logs the statistics of a preprocessing cache."""
+
+    statistics: PreprocessingCache.Statistics = cache.statistics
+
+    logger.info(f"Preprocessing hits:     {statistics.hits}")
+    logger.info(f"Preprocessing misses:   {statistics.misses}")
+    logger.info(f"Preprocessing evicted:  {statistics.evictions}")
+    logger.info(f"Preprocessing time:     {statistics.elapsed_seconds:.2f} s")
+    logger.info(f"Preprocessing saved:    {statistics.saved_seconds:.2f} s")
+
+
+def log_stage_statistics(summaries: list[StageSummary]) -> None:
+    """Logs the aggregated statistics of the registration pipeline stages."""
+
+    for summary in summaries:
+        logger.info(
+            f"Stage {summary.name}: {summary.count} pairs, "
+            f"{summary.preprocess_seconds:.2f} s preprocessing, "
+            f"{summary.register_seconds:.2f} s registration, "
+            f"{summary.max_seconds:.2f} s max, "
+            f"{summary.peak_growth_mb:.0f} MB peak growth, "
+            f"{summary.process_peak_mb:.0f} MB process peak"
+        )
@@ -1,10 +1,13 @@
 """Module with generic generator functions."""
 
-from collections.abc import Iterable
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor, Future
 from typing import TypeVar
 
 
 T: TypeVar = TypeVar("T")
+U: TypeVar = TypeVar("U")
 
 
 def generate_chunks(items: Iterable[T], max_size: int) -> Iterable[Iterable[T]]:
@@ -21,3 +24,25 @@ def generate_chunked_items(
         items[index : index + max_size]
         for index in range(0, len(items), max_size)
     ]
+
+
+def generate_prefetched(
+    items: Iterable[T],
+    function: Callable[[T], U],
+    executor: Executor,
+    depth: int,
+) -> Iterator[U]:
+    """Generates the results of applying a function to the items with an
+    executor, in the order of the items. At most depth items are submitted
+    ahead of the consumer, so that producer and consumer overlap while the
+    memory held by pending results stays bounded. Generators can be chained
+    to build a pipeline of stages with separate executors."""
+
+    pending: deque[Future] = deque()
+    for item in items:
+        pending.append(executor.submit(function, item))
+        if len(pending) >= depth:
+            yield pending.popleft().result()
+
+    while pending:
+        yield pending.popleft().result()
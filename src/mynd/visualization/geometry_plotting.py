@@ -75,7 +75,7 @@ def trace_registration_result(
     traces["correspondences"] = go.Bar(
         name=name,
         x=["Correspondences"],
-        y=[len(result.correspondence_set)],
+        y=[result.correspondence_count],
         marker_color=color,
         hoverinfo="x+y",
         legendgroup=legendgroup,
@@ -0,0 +1,53 @@
+"""Unit tests for mynds feature store."""
+
+import numpy as np
+import open3d
+import pytest
+
+from mynd.registration import FeatureStore
+from mynd.registration.feature_registrators import create_fpfh_extractor
+from mynd.registration.feature_store import create_feature_key
+
+
+@pytest.fixture
+def sample_cloud():
+    points = np.random.default_rng(0).random((500, 3))
+    cloud = open3d.geometry.PointCloud(open3d.utility.Vector3dVector(points))
+    cloud.estimate_normals()
+    return cloud
+
+
+def test_feature_key_depends_on_content_and_parameters(sample_cloud):
+    key = create_feature_key(sample_cloud, "fpfh", radius=0.1, neighbours=30)
+
+    assert key == create_feature_key(
+        sample_cloud, "fpfh", neighbours=30, radius=0.1
+    )
+    assert key != create_feature_key(
+        sample_cloud, "fpfh", radius=0.2, neighbours=30
+    )
+
+    moved = open3d.geometry.PointCloud(sample_cloud)
+    moved.translate([1.0, 0.0, 0.0])
+    assert key != create_feature_key(moved, "fpfh", radius=0.1, neighbours=30)
+
+
+def test_fpfh_extractor_uses_store(tmp_path, sample_cloud):
+    store = FeatureStore(tmp_path / "features")
+    extractor = create_fpfh_extractor(radius=0.2, neighbours=30, store=store)
+
+    computed = extractor(sample_cloud)
+    assert store.statistics.misses == 1
+    assert len(list(store.directory.glob("*.npz"))) == 1
+
+    loaded = extractor(sample_cloud)
+    assert store.statistics.hits == 1
+    np.testing.assert_array_equal(loaded.data, computed.data)
+
+
+def test_feature_store_ignores_corrupt_files(tmp_path):
+    store = FeatureStore(tmp_path)
+    store.path("corrupt").write_bytes(b"not an archive")
+
+    assert store.load("corrupt") is None
+    assert store.statistics.misses == 1
@@ -0,0 +1,55 @@
+"""Unit tests for mynds generator functionality."""
+
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+from mynd.utils.generators import generate_prefetched
+
+
+def test_generate_prefetched_preserves_order():
+    def delayed_square(value: int) -> int:
+        time.sleep(0.001 * (10 - value))
+        return value * value
+
+    with ThreadPoolExecutor(4) as executor:
+        results = list(
+            generate_prefetched(range(10), delayed_square, executor, depth=3)
+        )
+
+    assert results == [value * value for value in range(10)]
+
+
+def test_generate_prefetched_bounds_pending_items():
+    lock = threading.Lock()
+    started: list[int] = list()
+
+    def record(value: int) -> int:
+        with lock:
+            started.append(value)
+        return value
+
+    with ThreadPoolExecutor(2) as executor:
+        for consumed, value in enumerate(
+            generate_prefetched(range(20), record, executor, depth=4)
+        ):
+            assert value == consumed
+            with lock:
+                assert len(started) <= consumed + 4
+
+
+def test_generate_prefetched_chains_stages():
+    with (
+        ThreadPoolExecutor(2) as first,
+        ThreadPoolExecutor(1) as second,
+    ):
+        doubled = generate_prefetched(
+            range(8), lambda value: 2 * value, first, depth=2
+        )
+        shifted = generate_prefetched(
+            doubled, lambda value: value + 1, second, depth=2
+        )
+        results = list(shifted)
+
+    assert results == [2 * value + 1 for value in range(8)]
@@ -0,0 +1,171 @@
+"""Unit tests for mynds Hitnet stereo matching functionality."""
+
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import onnxruntime as onnxrt
+import pytest
+
+from mynd.geometry.hitnet import (
+    HitnetInputBuffer,
+    HitnetModel,
+    HitnetSessionConfig,
+    _compute_disparities,
+    _compute_disparity,
+    create_hitnet_session_options,
+    load_hitnet,
+)
+from mynd.image import Image, PixelFormat
+from mynd.utils.containers import Pair
+
+
+HEIGHT: int = 8
+WIDTH: int = 12
+
+MODEL_PATH: Path = (
+    Path(__file__).parents[1]
+    / "resources"
+    / "hitnet_models"
+    / "hitnet_eth3d_120x160.onnx"
+)
+
+
+class FakeSession:
+    """Session that returns the first input channel as disparity."""
+
+    def __init__(self, batch: int | str) -> None:
+        self.batch = batch
+        self.batches: list[int] = list()
+
+    def get_inputs(self):
+        return [
+            SimpleNamespace(
+                name="input",
+                shape=[self.batch, 2, HEIGHT, WIDTH],
+                type="tensor(float)",
+            )
+        ]
+
+    def get_outputs(self):
+        return [
+            SimpleNamespace(
+                name="reference_output_disparity",
+                shape=[self.batch, 1, HEIGHT, WIDTH],
+                type="tensor(float)",
+            )
+        ]
+
+    def run(self, names, feeds):
+        tensor = feeds.get("input")
+        self.batches.append(len(tensor))
+        return [tensor[:, :1].copy()]
+
+
+def _create_pair(seed: int) -> Pair[Image]:
+    generator = np.random.default_rng(seed)
+    left, right = [
+        Image.from_array(
+            generator.integers(0, 256, size=(HEIGHT, WIDTH), dtype=np.uint8),
+            PixelFormat.GRAY,
+        )
+        for _ in range(2)
+    ]
+    return Pair(first=left, second=right)
+
+
+def _expected(image: Image) -> np.ndarray:
+    return np.squeeze(image.to_array()).astype(np.float32) / 255.0
+
+
+@pytest.mark.parametrize("batch, runs", [("batch", [6]), (2, [2, 2, 2])])
+def test_compute_disparities_packs_pairs(batch, runs):
+    session = FakeSession(batch)
+    model = HitnetModel(session=session)
+    pairs = [_create_pair(seed) for seed in range(3)]
+
+    disparities = _compute_disparities(model, pairs)
+
+    assert session.batches == runs
+    for pair, disparity in zip(pairs, disparities):
+        np.testing.assert_allclose(
+            disparity.first, _expected(pair.first), atol=1e-6
+        )
+        np.testing.assert_allclose(
+            disparity.second, _expected(pair.second), atol=1e-6
+        )
+
+
+def test_compute_disparity_reuses_buffer():
+    model = HitnetModel(session=FakeSession("batch"))
+    buffer = HitnetInputBuffer()
+
+    _compute_disparities(model, [_create_pair(0), _create_pair(1)], buffer)
+    tensor = buffer.tensor
+
+    pair = _create_pair(2)
+    disparity = _compute_disparity(model, pair.first, pair.second, buffer)
+
+    assert buffer.tensor is tensor
+    np.testing.assert_allclose(
+        disparity.first, _expected(pair.first), atol=1e-6
+    )
+
+
+def test_create_session_options():
+    options = create_hitnet_session_options(
+        HitnetSessionConfig(
+            provider="cpu",
+            intra_op_threads=2,
+            inter_op_threads=2,
+            optimization="basic",
+            memory_arena=False,
+        )
+    )
+
+    assert options.intra_op_num_threads == 2
+    assert options.inter_op_num_threads == 2
+    assert (
+        options.graph_optimization_level
+        == onnxrt.GraphOptimizationLevel.ORT_ENABLE_BASIC
+    )
+    assert options.execution_mode == onnxrt.ExecutionMode.ORT_PARALLEL
+    assert not options.enable_cpu_mem_arena
+
+
+def test_load_hitnet_rejects_invalid_config():
+    assert load_hitnet(MODEL_PATH, HitnetSessionConfig(provider="tpu")).is_err()
+    assert load_hitnet(
+        MODEL_PATH, HitnetSessionConfig(optimization="maximum")
+    ).is_err()
+
+
+def test_load_hitnet_rejects_unavailable_provider(monkeypatch):
+    monkeypatch.setattr(
+        onnxrt, "get_available_providers", lambda: ["CPUExecutionProvider"]
+    )
+
+    result = load_hitnet(MODEL_PATH, HitnetSessionConfig(provider="cuda"))
+
+    assert result.is_err()
+    assert "CUDAExecutionProvider" in result.err()
+
+
+@pytest.mark.skipif(not MODEL_PATH.exists(), reason="missing bundled model")
+def test_load_hitnet_on_cpu_caches_optimized_model(tmp_path):
+    config = HitnetSessionConfig(
+        provider="cpu",
+        intra_op_threads=1,
+        optimized_model=tmp_path / "optimized.onnx",
+    )
+
+    model = load_hitnet(MODEL_PATH, config).unwrap()
+    assert model.input_size == (120, 160)
+    assert config.optimized_model.exists()
+
+    cached = load_hitnet(MODEL_PATH, config).unwrap()
+    pair = _create_pair(0)
+    disparity = _compute_disparity(cached, pair.first, pair.second)
+
+    assert disparity.first.shape == (HEIGHT, WIDTH)
+    assert disparity.second.shape == (HEIGHT, WIDTH)
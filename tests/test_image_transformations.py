@@ -0,0 +1,49 @@
+"""Unit tests for mynds geometric image transformations."""
+
+import numpy as np
+import pytest
+
+from mynd.geometry import PixelMap, remap_image_pixels
+from mynd.image import Image, PixelFormat
+
+
+HEIGHT: int = 48
+WIDTH: int = 64
+
+
+@pytest.fixture
+def pixel_map() -> PixelMap:
+    rows, columns = np.indices((HEIGHT, WIDTH), dtype=np.float32)
+    data = np.stack((columns * 0.9 + 2.3, rows * 0.95 + 1.7), axis=-1)
+    return PixelMap(data.astype(np.float32))
+
+
+@pytest.fixture
+def image() -> Image:
+    rows, columns = np.indices((HEIGHT, WIDTH), dtype=np.float32)
+    return Image.from_array(rows + 2.0 * columns, PixelFormat.X)
+
+
+def test_pixel_map_view_does_not_copy(pixel_map):
+    view = pixel_map.view()
+
+    assert np.shares_memory(view, pixel_map.data)
+    assert not view.flags.writeable
+
+
+def test_pixel_map_keeps_fixed_point_maps(pixel_map):
+    map1, map2 = pixel_map.to_fixed_point()
+
+    assert map1.dtype == np.int16
+    assert map1.shape == (HEIGHT, WIDTH, 2)
+    assert map2.shape == (HEIGHT, WIDTH)
+    assert pixel_map.to_fixed_point()[0] is map1
+
+
+def test_fixed_point_remap_matches_float_remap(pixel_map, image):
+    exact = remap_image_pixels(image, pixel_map).to_array()
+    fixed = remap_image_pixels(image, pixel_map, fixed_point=True).to_array()
+
+    # NOTE: Fixed-point maps quantize coordinates to 1/32 of a pixel, and the
+    # image gradient is at most 2 per pixel along each axis
+    np.testing.assert_allclose(fixed[:40, :50], exact[:40, :50], atol=0.15)
@@ -0,0 +1,122 @@
+"""Unit tests for mynds NumPy registrators."""
+
+from pathlib import Path
+
+import numpy as np
+import open3d
+import pytest
+
+from mynd.io import read_config
+from mynd.registration import NumpyICPCriteria, register_numpy_icp
+from mynd.registration.pipeline_builder import build_numpy_icp_registrator
+
+
+CONFIG_DIRECTORY: Path = Path(__file__).parents[1] / "config"
+
+
+def _create_surface() -> open3d.geometry.PointCloud:
+    generator = np.random.default_rng(0)
+    xy = generator.uniform(-2.0, 2.0, size=(20000, 2))
+    z = 0.3 * np.sin(2.0 * xy[:, 0]) * np.cos(1.5 * xy[:, 1])
+    points = np.column_stack([xy, z])
+
+    cloud = open3d.geometry.PointCloud(open3d.utility.Vector3dVector(points))
+    cloud.estimate_normals(
+        search_param=open3d.geometry.KDTreeSearchParamHybrid(
+            radius=0.2, max_nn=30
+        )
+    )
+    return cloud
+
+
+def _create_transformation() -> np.ndarray:
+    transformation = np.identity(4)
+    transformation[:3, :3] = open3d.geometry.get_rotation_matrix_from_xyz(
+        [0.02, -0.01, 0.04]
+    )
+    transformation[:3, 3] = [0.05, -0.03, 0.02]
+    return transformation
+
+
+@pytest.fixture
+def pair():
+    target = _create_surface()
+    transformation = _create_transformation()
+
+    # The source is moved away from the target, so registering the source to
+    # the target recovers the transformation
+    source = open3d.geometry.PointCloud(target)
+    source.transform(np.linalg.inv(transformation))
+    return source, target, transformation
+
+
+@pytest.mark.parametrize("sample_count", [None, 2000])
+def test_numpy_icp_recovers_transformation(pair, sample_count):
+    source, target, transformation = pair
+
+    result = register_numpy_icp(
+        source,
+        target,
+        np.identity(4),
+        distance_threshold=0.3,
+        criteria=NumpyICPCriteria(max_iteration=50),
+        sample_count=sample_count,
+    )
+
+    np.testing.assert_allclose(result.transformation, transformation, atol=1e-3)
+    assert result.fitness > 0.99
+    assert 1 <= result.iterations <= 50
+    assert len(result.correspondence_set) == len(source.points)
+
+
+def test_numpy_icp_requires_target_normals(pair):
+    source, target, _ = pair
+    target.normals = open3d.utility.Vector3dVector()
+
+    with pytest.raises(ValueError):
+        register_numpy_icp(
+            source, target, np.identity(4), distance_threshold=0.3
+        )
+
+
+def test_build_numpy_icp_registrator(pair):
+    source, target, transformation = pair
+
+    registrator = build_numpy_icp_registrator(
+        {
+            "distance_threshold": 0.3,
+            "huber_kernel": {"k": 0.1},
+            "convergence_criteria": {"max_iteration": 50},
+        }
+    )
+    result = registrator(source, target, np.identity(4))
+
+    np.testing.assert_allclose(result.transformation, transformation, atol=1e-3)
+
+
+def test_build_numpy_icp_registrator_from_shipped_config(pair):
+    source, target, transformation = pair
+
+    config: dict = read_config(
+        CONFIG_DIRECTORY / "register_highres.toml"
+    ).unwrap()
+    parameters: dict = config["registration"]["refiner"][0]["matcher"]
+
+    # NOTE: The shipped distance threshold is tuned for real data, so it is
+    # widened to cover the synthetic misalignment
+    registrator = build_numpy_icp_registrator(
+        parameters | {"distance_threshold": 0.3}
+    )
+    result = registrator(source, target, np.identity(4))
+
+    np.testing.assert_allclose(result.transformation, transformation, atol=1e-3)
+
+
+def test_build_numpy_icp_registrator_rejects_invalid_criteria():
+    with pytest.raises(ValueError):
+        build_numpy_icp_registrator(
+            {
+                "distance_threshold": 0.3,
+                "convergence_criteria": {"max_iterations": 50},
+            }
+        )
@@ -0,0 +1,80 @@
+"""Unit tests for mynds point cloud processors."""
+
+import numpy as np
+import open3d
+import pytest
+
+from mynd.geometry import downsample_point_cloud, estimate_point_cloud_normals
+from mynd.registration.pipeline_builder import build_point_cloud_processor
+
+
+@pytest.fixture
+def sample_cloud():
+    points = np.random.default_rng(0).random((1000, 3))
+    return open3d.geometry.PointCloud(open3d.utility.Vector3dVector(points))
+
+
+def test_downsample_returns_new_cloud(sample_cloud):
+    downsampled = downsample_point_cloud(sample_cloud, spacing=0.2)
+
+    assert downsampled is not sample_cloud
+    assert len(sample_cloud.points) == 1000
+    assert len(downsampled.points) < 1000
+
+
+def test_estimate_normals_copies_unless_inplace(sample_cloud):
+    estimated = estimate_point_cloud_normals(sample_cloud)
+    assert estimated is not sample_cloud
+    assert estimated.has_normals()
+    assert not sample_cloud.has_normals()
+
+    estimated = estimate_point_cloud_normals(sample_cloud, inplace=True)
+    assert estimated is sample_cloud
+    assert sample_cloud.has_normals()
+
+
+def _estimate_reference_normals(cloud, radius, neighbours):
+    reference = open3d.geometry.PointCloud(cloud)
+    reference.estimate_normals(
+        search_param=open3d.geometry.KDTreeSearchParamHybrid(
+            radius=radius, max_nn=neighbours
+        )
+    )
+    return np.asarray(reference.normals)
+
+
+@pytest.mark.parametrize(
+    "components",
+    [
+        {"estimate_normals": {}},
+        {"estimate_normals": {"radius": 0.3, "neighbours": 10}},
+    ],
+)
+def test_estimate_normals_keeps_legacy_search(sample_cloud, components):
+    # Legacy preprocessing always used a radius of 0.1 and 30 neighbours, and
+    # configured values must not change legacy normals
+    processed = build_point_cloud_processor(components)(sample_cloud)
+
+    np.testing.assert_allclose(
+        np.asarray(processed.normals),
+        _estimate_reference_normals(sample_cloud, 0.1, 30),
+    )
+
+
+@pytest.mark.parametrize(
+    "components",
+    [
+        {"estimate_normals": {"radius": 0.2, "neighbours": 30}},
+        {
+            "downsample": {"spacing": 0.2},
+            "estimate_normals": {"radius": 0.2, "neighbours": 30},
+        },
+    ],
+)
+def test_preprocessor_does_not_modify_input(sample_cloud, components):
+    processed = build_point_cloud_processor(components)(sample_cloud)
+
+    assert processed is not sample_cloud
+    assert processed.has_normals()
+    assert not sample_cloud.has_normals()
+    assert len(sample_cloud.points) == 1000
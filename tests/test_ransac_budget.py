@@ -0,0 +1,87 @@
+"""Unit tests for mynds time-budgeted RANSAC matching."""
+
+from types import SimpleNamespace
+
+import open3d.pipelines.registration as reg
+import pytest
+
+from mynd.registration.feature_registrators import (
+    RANSACBudget,
+    _run_ransac_with_budget,
+)
+
+
+def _create_runner(fitnesses: list[float], chunks: list[int]):
+    """Creates a RANSAC runner that returns results with the given fitness in
+    turn, and records the iteration cap of each call."""
+    values = iter(fitnesses)
+
+    def run_ransac(criteria):
+        chunks.append(criteria.max_iteration)
+        return SimpleNamespace(fitness=next(values, 0.0))
+
+    return run_ransac
+
+
+@pytest.fixture
+def criteria():
+    return reg.RANSACConvergenceCriteria(max_iteration=1000, confidence=1.0)
+
+
+def test_budget_runs_to_iteration_cap(criteria):
+    chunks = list()
+    runner = _create_runner([0.1, 0.2, 0.3], chunks)
+
+    result, iterations, termination = _run_ransac_with_budget(
+        runner, criteria, RANSACBudget(chunk=400)
+    )
+
+    assert chunks == [400, 400, 200]
+    assert iterations == 1000
+    assert termination == "completed"
+    assert result.fitness == 0.3
+
+
+def test_budget_stops_on_stagnation(criteria):
+    chunks = list()
+    runner = _create_runner([0.5, 0.4, 0.5, 0.3, 0.9], chunks)
+
+    result, iterations, termination = _run_ransac_with_budget(
+        runner, criteria, RANSACBudget(stagnation=300, chunk=100)
+    )
+
+    assert iterations == 400
+    assert termination == "stagnation"
+    assert result.fitness == 0.5
+
+
+def test_budget_stops_on_time_limit(criteria):
+    chunks = list()
+    runner = _create_runner([0.1, 0.2], chunks)
+
+    result, iterations, termination = _run_ransac_with_budget(
+        runner, criteria, RANSACBudget(seconds=0.0, chunk=100)
+    )
+
+    assert iterations == 100
+    assert termination == "time_budget"
+    assert result.fitness == 0.1
+
+
+def test_budget_stops_when_confidence_is_reached():
+    criteria = reg.RANSACConvergenceCriteria(
+        max_iteration=10000, confidence=0.99
+    )
+    chunks = list()
+    runner = _create_runner([0.1, 0.1, 0.5, 0.6], chunks)
+
+    result, iterations, termination = _run_ransac_with_budget(
+        runner, criteria, RANSACBudget(chunk=100), sample_count=3
+    )
+
+    # A fitness of 0.5 requires about 35 iterations at 99% confidence, while
+    # a fitness of 0.1 requires several thousand
+    assert chunks == [100, 100, 100]
+    assert iterations == 300
+    assert termination == "converged"
+    assert result.fitness == 0.5
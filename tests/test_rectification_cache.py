@@ -0,0 +1,87 @@
+"""Unit tests for mynds rectification cache."""
+
+import numpy as np
+import pytest
+
+from mynd.camera import CameraCalibration
+from mynd.geometry import RectificationCache, compute_calibration_hash
+from mynd.utils.containers import Pair
+
+
+def _create_calibration(location: list[float]) -> CameraCalibration:
+    return CameraCalibration(
+        camera_matrix=np.array(
+            [[60.0, 0.0, 32.0], [0.0, 60.0, 24.0], [0.0, 0.0, 1.0]]
+        ),
+        distortion=np.array([0.01, -0.002, 0.0, 0.0, 0.0]),
+        width=64,
+        height=48,
+        location=np.array(location),
+        rotation=np.eye(3),
+    )
+
+
+@pytest.fixture
+def calibrations() -> Pair[CameraCalibration]:
+    return Pair(
+        first=_create_calibration([0.0, 0.0, 0.0]),
+        second=_create_calibration([0.1, 0.0, 0.0]),
+    )
+
+
+def test_calibration_hash_depends_on_calibrations(calibrations):
+    key = compute_calibration_hash(calibrations)
+
+    assert key == compute_calibration_hash(
+        Pair(
+            first=_create_calibration([0.0, 0.0, 0.0]),
+            second=_create_calibration([0.1, 0.0, 0.0]),
+        )
+    )
+    assert key != compute_calibration_hash(
+        Pair(
+            first=calibrations.first,
+            second=_create_calibration([0.2, 0.0, 0.0]),
+        )
+    )
+
+
+def test_rectification_cache_memoizes_in_memory(calibrations):
+    cache = RectificationCache()
+
+    result = cache.rectify(calibrations)
+
+    assert cache.rectify(calibrations) is result
+    assert cache.statistics.misses == 1
+    assert cache.statistics.hits == 1
+
+
+def test_rectification_cache_persists_results(tmp_path, calibrations):
+    computed = RectificationCache(tmp_path).rectify(calibrations)
+    assert len(list(tmp_path.glob("*.npz"))) == 1
+
+    cache = RectificationCache(tmp_path)
+    loaded = cache.rectify(calibrations)
+
+    assert cache.statistics.loads == 1
+    assert cache.statistics.misses == 0
+    assert loaded.calibrations is calibrations
+    np.testing.assert_array_equal(
+        loaded.inverse_pixel_maps.first.data,
+        computed.inverse_pixel_maps.first.data,
+    )
+    np.testing.assert_array_equal(
+        loaded.rectified_calibrations.second.camera_matrix,
+        computed.rectified_calibrations.second.camera_matrix,
+    )
+    assert loaded.rectified_calibrations.first.width == 64
+
+
+def test_rectification_cache_ignores_corrupt_files(tmp_path, calibrations):
+    cache = RectificationCache(tmp_path)
+    cache.path(compute_calibration_hash(calibrations)).write_bytes(b"corrupt")
+
+    result = cache.rectify(calibrations)
+
+    assert cache.statistics.misses == 1
+    assert result.pixel_maps.first.shape == (48, 64, 2)
@@ -0,0 +1,212 @@
+"""Unit tests for mynds batch registration functionality."""
+
+import numpy as np
+import open3d
+import pytest
+
+from mynd.registration import (
+    RegistrationBatch,
+    RegistrationPipeline,
+    RegistrationResult,
+    ResultStore,
+    compute_file_fingerprint,
+    generate_indices_cascade,
+    order_indices_by_reuse,
+    register_batch,
+)
+from mynd.utils.result import Ok
+
+
+def _create_cloud(offset: float) -> open3d.geometry.PointCloud:
+    points: np.ndarray = np.random.default_rng(0).random((100, 3)) + offset
+    return open3d.geometry.PointCloud(open3d.utility.Vector3dVector(points))
+
+
+def _align_centroids(source, target) -> RegistrationResult:
+    transformation: np.ndarray = np.identity(4)
+    transformation[:3, 3] = target.get_center() - source.get_center()
+    return RegistrationResult(
+        fitness=1.0,
+        inlier_rmse=0.0,
+        correspondence_set=np.empty((0, 2), dtype=int),
+        transformation=transformation,
+        information=np.identity(6),
+    )
+
+
+@pytest.fixture
+def sample_pipeline():
+    return RegistrationPipeline(
+        initializer=RegistrationPipeline.AlignerModule(
+            preprocessor=lambda cloud: cloud,
+            registrator=_align_centroids,
+        )
+    )
+
+
+@pytest.fixture
+def sample_batch():
+    def create_loader(key: int):
+        def loader():
+            if key == 2:
+                raise RuntimeError("failed to read point cloud")
+            return Ok(_create_cloud(offset=float(key)))
+
+        return loader
+
+    return RegistrationBatch[int]({key: create_loader(key) for key in range(4)})
+
+
+@pytest.mark.parametrize("executor", ["sequential", "thread", "process"])
+def test_register_batch_executors(sample_batch, sample_pipeline, executor):
+    indices = generate_indices_cascade(sample_batch.keys())
+
+    completed = list()
+    results = register_batch(
+        sample_batch,
+        sample_pipeline,
+        indices,
+        callback=lambda target, source, result: completed.append(source),
+        executor=executor,
+        workers=2,
+    )
+
+    assert len(results) == len(indices)
+    for index, outcome in zip(indices, results):
+        if 2 in (index.target, index.source):
+            assert outcome.is_err()
+            continue
+
+        pairwise = outcome.unwrap()
+        assert (pairwise.target, pairwise.source) == (
+            index.target,
+            index.source,
+        )
+        np.testing.assert_allclose(
+            pairwise.result.transformation[:3, 3],
+            [index.target - index.source] * 3,
+        )
+
+    assert len(completed) == sum(outcome.is_ok() for outcome in results)
+
+
+def test_register_batch_invalid_executor(sample_batch, sample_pipeline):
+    with pytest.raises(NotImplementedError):
+        register_batch(sample_batch, sample_pipeline, [], executor="invalid")
+
+
+def test_register_batch_propagates_interrupts(sample_pipeline):
+    def interrupt():
+        raise KeyboardInterrupt
+
+    batch = RegistrationBatch[int](
+        {0: lambda: Ok(_create_cloud(offset=0.0)), 1: interrupt}
+    )
+
+    with pytest.raises(KeyboardInterrupt):
+        register_batch(
+            batch, sample_pipeline, generate_indices_cascade(batch.keys())
+        )
+
+
+def test_register_batch_resumes_from_store(tmp_path, sample_pipeline):
+    clouds = {key: _create_cloud(offset=float(key)) for key in range(3)}
+    loads = list()
+
+    def create_loader(key: int):
+        def loader():
+            loads.append(key)
+            return Ok(clouds[key])
+
+        return loader
+
+    def create_batch(pipeline: str, fingerprints: dict):
+        return RegistrationBatch[int](
+            {key: create_loader(key) for key in clouds},
+            store=ResultStore(tmp_path / "results", pipeline=pipeline),
+            fingerprints=fingerprints,
+        )
+
+    fingerprints = {key: f"cloud-{key}" for key in clouds}
+    indices = generate_indices_cascade(clouds.keys())
+
+    first = register_batch(
+        create_batch("a", fingerprints), sample_pipeline, indices
+    )
+    assert len(loads) == 2 * len(indices)
+
+    loads.clear()
+    resumed = register_batch(
+        create_batch("a", fingerprints), sample_pipeline, indices
+    )
+    assert loads == []
+    for original, restored in zip(first, resumed):
+        np.testing.assert_allclose(
+            original.unwrap().result.transformation,
+            restored.unwrap().result.transformation,
+        )
+        np.testing.assert_allclose(
+            original.unwrap().result.information,
+            restored.unwrap().result.information,
+        )
+
+    # Pairs with changed inputs or pipeline configs are registered again
+    changed = {**fingerprints, 0: "cloud-0-changed"}
+    register_batch(create_batch("a", changed), sample_pipeline, indices)
+    assert len(loads) == 2 * sum(0 in (i.target, i.source) for i in indices)
+
+    loads.clear()
+    register_batch(create_batch("b", fingerprints), sample_pipeline, indices)
+    assert len(loads) == 2 * len(indices)
+
+    # Stored results are ignored without resume
+    loads.clear()
+    batch = create_batch("a", fingerprints)
+    batch.store.resume = False
+    register_batch(batch, sample_pipeline, indices)
+    assert len(loads) == 2 * len(indices)
+
+
+def test_file_fingerprint_ignores_modification_time(tmp_path):
+    content = np.random.default_rng(0).bytes(1 << 23)
+    first = tmp_path / "first.ply"
+    second = tmp_path / "second.ply"
+    first.write_bytes(content)
+    second.write_bytes(content)
+
+    assert compute_file_fingerprint(first) == compute_file_fingerprint(second)
+
+    # NOTE: A change anywhere in the file must change the fingerprint
+    for position in (0, 3 * (1 << 16) + 12345, len(content) - 1):
+        changed = bytearray(content)
+        changed[position] ^= 0xFF
+        second.write_bytes(bytes(changed))
+        assert compute_file_fingerprint(first) != compute_file_fingerprint(
+            second
+        )
+
+
+def test_order_indices_by_reuse():
+    indices = generate_indices_cascade(range(4))
+    ordered = order_indices_by_reuse(indices)
+
+    assert len(ordered) == len(indices)
+    for previous, current in zip(ordered, ordered[1:]):
+        shared = {previous.target, previous.source} & {
+            current.target,
+            current.source,
+        }
+        assert shared
+
+
+def test_order_indices_by_reuse_with_window():
+    indices = generate_indices_cascade(range(12))
+    ordered = order_indices_by_reuse(indices, window=2)
+
+    assert sorted((i.target, i.source) for i in ordered) == sorted(
+        (i.target, i.source) for i in indices
+    )
+    assert {ordered[0].target, ordered[0].source} & {
+        ordered[1].target,
+        ordered[1].source,
+    }
@@ -0,0 +1,202 @@
+"""Unit tests for mynds point cloud cache."""
+
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import open3d
+import pytest
+
+from mynd.registration import PointCloudCache, PreprocessingCache
+from mynd.registration.cache import estimate_point_cloud_bytes
+from mynd.utils.result import Ok, Err
+
+
+POINT_COUNT: int = 1000
+
+
+def _create_cloud() -> open3d.geometry.PointCloud:
+    points: np.ndarray = np.random.default_rng(0).random((POINT_COUNT, 3))
+    return open3d.geometry.PointCloud(open3d.utility.Vector3dVector(points))
+
+
+@pytest.fixture
+def loads():
+    return list()
+
+
+@pytest.fixture
+def create_loader(loads):
+    def factory(key: str):
+        def loader():
+            loads.append(key)
+            return Ok(_create_cloud())
+
+        return loader
+
+    return factory
+
+
+def test_estimate_point_cloud_bytes():
+    cloud = _create_cloud()
+    assert estimate_point_cloud_bytes(cloud) == POINT_COUNT * 24
+
+    cloud.colors = open3d.utility.Vector3dVector(np.zeros((POINT_COUNT, 3)))
+    assert estimate_point_cloud_bytes(cloud) == POINT_COUNT * 48
+
+
+def test_cache_hits_and_misses(create_loader, loads):
+    cache = PointCloudCache[str](budget=10 * POINT_COUNT * 24)
+
+    first = cache.load("a", create_loader("a")).unwrap()
+    second = cache.load("a", create_loader("a")).unwrap()
+
+    assert first is second
+    assert loads == ["a"]
+    assert cache.statistics.hits == 1
+    assert cache.statistics.misses == 1
+    assert cache.statistics.hit_rate == 0.5
+
+
+def test_cache_evicts_least_recently_used(create_loader, loads):
+    cache = PointCloudCache[str](budget=2 * POINT_COUNT * 24)
+
+    cache.load("a", create_loader("a"))
+    cache.load("b", create_loader("b"))
+    cache.load("a", create_loader("a"))
+    cache.load("c", create_loader("c"))
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert cache.size <= cache.budget
+    assert cache.statistics.evictions == 1
+    assert cache.statistics.evicted_bytes == POINT_COUNT * 24
+    assert loads == ["a", "b", "c"]
+
+
+def test_cache_skips_clouds_above_budget(create_loader):
+    cache = PointCloudCache[str](budget=POINT_COUNT)
+
+    assert cache.load("a", create_loader("a")).is_ok()
+    assert len(cache) == 0
+
+
+def test_cache_does_not_store_errors():
+    cache = PointCloudCache[str](budget=POINT_COUNT)
+
+    assert cache.load("a", lambda: Err("missing file")).is_err()
+    assert "a" not in cache
+
+
+def test_preprocessing_cache_reuses_results():
+    cache = PreprocessingCache()
+    cloud = _create_cloud()
+    calls = list()
+
+    def preprocessor(input):
+        calls.append(input)
+        return input.voxel_down_sample(voxel_size=0.1)
+
+    first = cache.preprocess(cloud, preprocessor, parameters=("spacing", 0.1))
+    second = cache.preprocess(cloud, preprocessor, parameters=("spacing", 0.1))
+    third = cache.preprocess(cloud, preprocessor, parameters=("spacing", 0.2))
+
+    assert first is second
+    assert third is not first
+    assert len(calls) == 2
+    assert cache.statistics.hits == 1
+    assert cache.statistics.misses == 2
+
+
+def test_preprocessing_cache_discards_deleted_clouds():
+    cache = PreprocessingCache()
+
+    def preprocessor(input):
+        return input.voxel_down_sample(voxel_size=0.1)
+
+    cloud = _create_cloud()
+    cache.preprocess(cloud, preprocessor, parameters=None)
+    for _ in range(3):
+        cache.preprocess(_create_cloud(), preprocessor, parameters=None)
+
+    # NOTE: Entries are discarded as soon as their input is deleted
+    assert len(cache) == 1
+    assert cache.statistics.hits == 0
+
+    del cloud
+    assert len(cache) == 0
+
+
+def test_preprocessing_cache_evicts_least_recently_used():
+    clouds = [_create_cloud() for _ in range(3)]
+    size = estimate_point_cloud_bytes(clouds[0])
+    cache = PreprocessingCache(budget=2 * size)
+
+    def preprocessor(input):
+        return open3d.geometry.PointCloud(input)
+
+    first = cache.preprocess(clouds[0], preprocessor, parameters=None)
+    cache.preprocess(clouds[1], preprocessor, parameters=None)
+    assert cache.preprocess(clouds[0], preprocessor, parameters=None) is first
+    cache.preprocess(clouds[2], preprocessor, parameters=None)
+
+    assert len(cache) == 2
+    assert cache.size <= cache.budget
+    assert cache.statistics.evictions == 1
+    assert cache.statistics.evicted_bytes == size
+    assert cache.preprocess(clouds[0], preprocessor, parameters=None) is first
+
+
+def test_cache_waits_for_concurrent_loads():
+    cache = PointCloudCache[str](budget=10 * POINT_COUNT * 24)
+    started = threading.Event()
+    release = threading.Event()
+    loads: list[str] = list()
+
+    def slow_loader():
+        loads.append("a")
+        started.set()
+        release.wait(timeout=5.0)
+        return Ok(_create_cloud())
+
+    with ThreadPoolExecutor(2) as executor:
+        first = executor.submit(cache.load, "a", slow_loader)
+        started.wait(timeout=5.0)
+        second = executor.submit(cache.load, "a", slow_loader)
+        while cache.statistics.waits == 0:
+            time.sleep(0.001)
+        release.set()
+
+        assert first.result().unwrap() is second.result().unwrap()
+
+    assert loads == ["a"]
+    assert cache.statistics.misses == 1
+    assert cache.statistics.waits == 1
+    assert cache.statistics.hit_rate == 0.5
+
+
+def test_cache_propagates_failed_concurrent_loads():
+    cache = PointCloudCache[str](budget=10 * POINT_COUNT * 24)
+    started = threading.Event()
+    release = threading.Event()
+
+    def failing_loader():
+        started.set()
+        release.wait(timeout=5.0)
+        return Err("failed to read")
+
+    with ThreadPoolExecutor(2) as executor:
+        first = executor.submit(cache.load, "a", failing_loader)
+        started.wait(timeout=5.0)
+        second = executor.submit(cache.load, "a", failing_loader)
+        while cache.statistics.waits == 0:
+            time.sleep(0.001)
+        release.set()
+
+        assert first.result().is_err()
+        assert second.result().is_err()
+
+    assert len(cache) == 0
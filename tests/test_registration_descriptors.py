@@ -0,0 +1,45 @@
+"""Unit tests for mynds global descriptor retrieval."""
+
+import numpy as np
+
+from mynd.registration import (
+    build_descriptor_index,
+    generate_indices_descriptor,
+)
+
+
+# Descriptors of two clusters of similar items
+DESCRIPTORS: dict = {
+    "a": np.array([1.0, 0.0, 0.0]),
+    "b": np.array([0.9, 0.1, 0.0]),
+    "c": np.array([0.0, 1.0, 0.1]),
+    "d": np.array([0.0, 0.9, 0.2]),
+    "e": np.array([0.8, 0.2, 0.0]),
+}
+
+
+def test_query_returns_most_similar_items():
+    index = build_descriptor_index(DESCRIPTORS)
+
+    matches = index.query(np.array([2.0, 0.0, 0.0]), count=3)
+
+    assert [key for key, _ in matches] == ["a", "b", "e"]
+    assert matches[0][1] == 0.0
+
+
+def test_query_with_max_distance():
+    index = build_descriptor_index(DESCRIPTORS)
+
+    matches = index.query(DESCRIPTORS["c"], count=5, max_distance=0.5)
+
+    assert sorted(key for key, _ in matches) == ["c", "d"]
+
+
+def test_generate_indices_descriptor():
+    indices = generate_indices_descriptor(DESCRIPTORS, count=1)
+
+    assert [(index.target, index.source) for index in indices] == [
+        ("a", "b"),
+        ("b", "e"),
+        ("c", "d"),
+    ]
@@ -0,0 +1,105 @@
+"""Unit tests for mynds registration pipeline instrumentation."""
+
+import numpy as np
+import open3d
+
+from mynd.registration import (
+    PipelineRecord,
+    RegistrationPipeline,
+    RegistrationResult,
+    StageRecord,
+    aggregate_pipeline_records,
+    apply_registration_pipeline,
+)
+
+
+def _create_cloud(count: int) -> open3d.geometry.PointCloud:
+    points: np.ndarray = np.random.default_rng(0).random((count, 3))
+    return open3d.geometry.PointCloud(open3d.utility.Vector3dVector(points))
+
+
+def _create_result(iterations: int | None = None) -> RegistrationResult:
+    return RegistrationResult(
+        fitness=0.9,
+        inlier_rmse=0.01,
+        correspondence_set=np.zeros((10, 2), dtype=int),
+        transformation=np.identity(4),
+        information=np.identity(6),
+        iterations=iterations,
+    )
+
+
+def _downsample(cloud):
+    return cloud.uniform_down_sample(2)
+
+
+def test_pipeline_records_each_stage():
+    pipeline = RegistrationPipeline(
+        RegistrationPipeline.AlignerModule(
+            _downsample,
+            lambda source, target: _create_result(),
+            name="coarse",
+        ),
+        [
+            RegistrationPipeline.RefinerModule(
+                lambda cloud: cloud,
+                lambda source, target, transformation: _create_result(7),
+                name="fine",
+            )
+        ],
+    )
+
+    result = apply_registration_pipeline(
+        pipeline, source=_create_cloud(100), target=_create_cloud(60)
+    )
+
+    record = result.record
+    assert [stage.name for stage in record.stages] == ["coarse", "fine"]
+    assert [stage.kind for stage in record.stages] == ["aligner", "refiner"]
+
+    coarse, fine = record.stages
+    assert (coarse.source_points, coarse.target_points) == (50, 30)
+    assert (fine.source_points, fine.target_points) == (100, 60)
+    assert coarse.iterations is None
+    assert fine.iterations == 7
+
+    assert record.seconds >= sum(stage.seconds for stage in record.stages)
+    assert record.process_peak_mb > 0.0
+    assert all(stage.peak_growth_mb >= 0.0 for stage in record.stages)
+    assert all(
+        stage.process_peak_mb <= record.process_peak_mb
+        for stage in record.stages
+    )
+
+
+def test_aggregate_pipeline_records():
+    first = PipelineRecord(
+        stages=[
+            StageRecord("coarse", "aligner", 1.0, 2.0, iterations=None),
+            StageRecord("fine", "refiner", 0.5, 1.0, iterations=10),
+        ]
+    )
+    second = PipelineRecord(
+        stages=[
+            StageRecord(
+                "coarse",
+                "aligner",
+                3.0,
+                4.0,
+                process_peak_mb=8.0,
+                peak_growth_mb=2.0,
+            ),
+            StageRecord("fine", "refiner", 0.5, 0.5, iterations=5),
+        ]
+    )
+
+    summaries = aggregate_pipeline_records([first, None, second])
+
+    coarse, fine = summaries
+    assert coarse.name == "coarse" and coarse.count == 2
+    assert coarse.seconds == 10.0
+    assert coarse.max_seconds == 7.0
+    assert coarse.mean_seconds == 5.0
+    assert coarse.process_peak_mb == 8.0
+    assert coarse.peak_growth_mb == 2.0
+    assert fine.iterations == 15
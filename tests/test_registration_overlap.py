@@ -0,0 +1,68 @@
+"""Unit tests for mynds registration overlap functionality."""
+
+import numpy as np
+import open3d
+
+from mynd.registration import (
+    compute_overlap_ratio,
+    compute_overlap_summary,
+    generate_indices_overlap,
+)
+
+
+def _create_strip(
+    start: float, stop: float, offset: tuple = (0.0, 0.0, 0.0)
+) -> open3d.geometry.PointCloud:
+    generator = np.random.default_rng(0)
+    points = generator.uniform(0.0, 1.0, size=(5000, 3)) * [
+        stop - start,
+        4,
+        0.2,
+    ]
+    points[:, 0] += start
+    points += offset
+    return open3d.geometry.PointCloud(open3d.utility.Vector3dVector(points))
+
+
+def test_overlap_ratio():
+    first = compute_overlap_summary(_create_strip(0.0, 10.0), voxel_size=1.0)
+    second = compute_overlap_summary(_create_strip(5.0, 15.0), voxel_size=1.0)
+    third = compute_overlap_summary(_create_strip(30.0, 40.0), voxel_size=1.0)
+
+    assert compute_overlap_ratio(first, first) == 1.0
+    assert 0.4 <= compute_overlap_ratio(first, second) <= 0.6
+    assert compute_overlap_ratio(first, third) == 0.0
+
+
+def test_generate_indices_overlap():
+    # Strips along a survey line, where only neighbouring strips overlap
+    summaries = {
+        key: compute_overlap_summary(
+            _create_strip(8.0 * key, 8.0 * key + 10.0), voxel_size=1.0
+        )
+        for key in range(6)
+    }
+
+    indices = generate_indices_overlap(summaries, threshold=0.1)
+
+    assert [(index.target, index.source) for index in indices] == [
+        (key, key + 1) for key in range(5)
+    ]
+
+
+def test_overlap_ratio_with_world_scale_coordinates():
+    # UTM-like coordinates exceed the packed field range without an origin
+    offset = (6.5e6, 7.2e6, 120.0)
+    first = compute_overlap_summary(
+        _create_strip(0.0, 10.0, offset), voxel_size=1.0
+    )
+    second = compute_overlap_summary(
+        _create_strip(5.0, 15.0, offset), voxel_size=1.0
+    )
+    third = compute_overlap_summary(
+        _create_strip(30.0, 40.0, offset), voxel_size=1.0
+    )
+
+    assert compute_overlap_ratio(first, first) == 1.0
+    assert 0.4 <= compute_overlap_ratio(first, second) <= 0.6
+    assert compute_overlap_ratio(first, third) == 0.0
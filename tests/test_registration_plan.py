@@ -0,0 +1,94 @@
+"""Unit tests for mynds registration plan functionality."""
+
+import numpy as np
+import open3d
+
+from mynd.registration import (
+    PyramidCache,
+    build_plan_processors,
+    compile_registration_plan,
+)
+
+
+CONFIG: dict = {
+    "aligner": {
+        "type": "feature_ransac",
+        "preprocessor": {
+            "downsample": {"spacing": 0.1},
+            "estimate_normals": {"radius": 0.2, "neighbours": 10},
+        },
+    },
+    "refiner": [
+        {
+            "name": "coarse",
+            "type": "regular_icp",
+            "preprocessor": {
+                "downsample": {"spacing": 0.1},
+                "estimate_normals": {"radius": 0.2, "neighbours": 10},
+            },
+        },
+        {
+            "name": "fine",
+            "type": "regular_icp",
+            "preprocessor": {
+                "downsample": {"spacing": 0.1},
+                "estimate_normals": {"radius": 0.3, "neighbours": 10},
+            },
+        },
+    ],
+}
+
+
+def _create_cloud() -> open3d.geometry.PointCloud:
+    points: np.ndarray = np.random.default_rng(0).random((5000, 3))
+    return open3d.geometry.PointCloud(open3d.utility.Vector3dVector(points))
+
+
+def test_compile_plan_merges_identical_steps():
+    plan = compile_registration_plan(CONFIG)
+
+    assert [step.operation for step in plan.steps.values()] == [
+        "downsample",
+        "estimate_normals",
+        "estimate_normals",
+    ]
+    assert [module.step for module in plan.modules] == ["s1", "s1", "s2"]
+    assert [module.name for module in plan.modules] == [
+        "aligner",
+        "coarse",
+        "fine",
+    ]
+
+    assert plan.is_shared("s0")
+    assert plan.is_shared("s1")
+    assert not plan.is_shared("s2")
+
+    description = plan.describe()
+    assert "s0: downsample(spacing=0.1) <- input [shared]" in description
+    assert "refiner 'fine': regular_icp <- s2" in description
+
+
+def test_plan_processors_execute_shared_steps_once():
+    plan = compile_registration_plan(CONFIG)
+    aligner, coarse, fine = build_plan_processors(plan)
+
+    cloud = _create_cloud()
+
+    assert aligner(cloud) is coarse(cloud)
+    assert fine(cloud) is not coarse(cloud)
+    assert fine(cloud).has_normals()
+    assert not cloud.has_normals()
+    assert len(fine(cloud).points) == len(coarse(cloud).points)
+
+
+def test_plan_processors_draw_from_pyramids():
+    plan = compile_registration_plan(CONFIG)
+    pyramids = PyramidCache(spacings=(0.1,))
+    aligner, coarse, fine = build_plan_processors(plan, pyramids=pyramids)
+
+    cloud = _create_cloud()
+
+    assert aligner(cloud) is coarse(cloud)
+    assert fine(cloud).has_normals()
+    assert not pyramids.pyramid(cloud).level(0.1).has_normals()
+    assert pyramids.statistics.misses == 1
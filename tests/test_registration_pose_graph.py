@@ -0,0 +1,80 @@
+"""Unit tests for mynds incremental pose graph."""
+
+import numpy as np
+import open3d
+
+from mynd.registration import IncrementalPoseGraph
+
+
+def _create_transformation(angle: float, translation: list[float]):
+    transformation = np.identity(4)
+    transformation[:3, :3] = open3d.geometry.get_rotation_matrix_from_xyz(
+        [0.0, 0.0, angle]
+    )
+    transformation[:3, 3] = translation
+    return transformation
+
+
+def _register(poses: dict, source: str, target: str) -> np.ndarray:
+    """Returns the transformation that registers the source to the target."""
+    return np.linalg.inv(poses[target]) @ poses[source]
+
+
+POSES: dict = {
+    "a": np.identity(4),
+    "b": _create_transformation(0.1, [1.0, 0.0, 0.0]),
+    "c": _create_transformation(0.2, [2.0, 0.5, 0.0]),
+    "d": _create_transformation(-0.1, [0.0, 3.0, 1.0]),
+}
+
+
+def _add(graph: IncrementalPoseGraph, source: str, target: str) -> None:
+    graph.add_edge(source, target, _register(POSES, source, target), np.eye(6))
+
+
+def test_nodes_are_initialized_from_edges():
+    graph = IncrementalPoseGraph[str]()
+    _add(graph, "b", "a")
+    _add(graph, "c", "b")
+
+    assert len(graph) == 3
+    for key in ["a", "b", "c"]:
+        np.testing.assert_allclose(graph.pose(key), POSES[key], atol=1e-9)
+
+    assert [edge.uncertain for edge in graph.edges] == [False, False]
+
+
+def test_edges_within_a_component_are_loop_closures():
+    graph = IncrementalPoseGraph[str]()
+    _add(graph, "b", "a")
+    _add(graph, "c", "b")
+    _add(graph, "c", "a")
+
+    assert [edge.uncertain for edge in graph.edges] == [False, False, True]
+
+
+def test_joined_components_are_aligned_to_the_first():
+    graph = IncrementalPoseGraph[str]()
+    _add(graph, "b", "a")
+    _add(graph, "d", "c")
+    assert len(graph.components()) == 2
+
+    _add(graph, "c", "b")
+
+    assert graph.components() == [["a", "b", "c", "d"]]
+    for key in POSES:
+        np.testing.assert_allclose(graph.pose(key), POSES[key], atol=1e-9)
+
+
+def test_optimize_only_changed_components():
+    graph = IncrementalPoseGraph[str]()
+    _add(graph, "b", "a")
+    _add(graph, "d", "c")
+
+    assert sorted(graph.optimize(correspondence_distance=0.1)) == list("abcd")
+    assert graph.optimize(correspondence_distance=0.1) == list()
+
+    _add(graph, "d", "c")
+    assert sorted(graph.optimize(correspondence_distance=0.1)) == ["c", "d"]
+
+    np.testing.assert_allclose(graph.pose("b"), POSES["b"], atol=1e-6)
@@ -0,0 +1,126 @@
+"""Unit tests for mynds registration results."""
+
+import dataclasses
+import pickle
+
+import numpy as np
+import pytest
+
+from mynd.registration import RegistrationResult
+
+
+@pytest.fixture
+def estimator_calls():
+    return list()
+
+
+@pytest.fixture
+def lazy_result(estimator_calls):
+    def estimator():
+        estimator_calls.append(None)
+        return np.identity(6)
+
+    return RegistrationResult(
+        fitness=0.9,
+        inlier_rmse=0.01,
+        correspondence_set=np.zeros((10, 2), dtype=int),
+        transformation=np.identity(4),
+        information=estimator,
+    )
+
+
+def test_information_is_computed_on_first_access(lazy_result, estimator_calls):
+    assert not lazy_result.has_information
+    assert not estimator_calls
+
+    np.testing.assert_array_equal(lazy_result.information, np.identity(6))
+    np.testing.assert_array_equal(lazy_result.information, np.identity(6))
+
+    assert lazy_result.has_information
+    assert len(estimator_calls) == 1
+
+
+def test_information_given_as_array():
+    result = RegistrationResult(
+        fitness=0.9,
+        inlier_rmse=0.01,
+        correspondence_set=np.zeros((10, 2), dtype=int),
+        transformation=np.identity(4),
+        information=np.identity(6),
+    )
+
+    assert result.has_information
+    np.testing.assert_array_equal(result.information, np.identity(6))
+
+
+def test_replace_copies_information(lazy_result, estimator_calls):
+    transformation = np.diag([2.0, 2.0, 2.0, 1.0])
+    replaced = dataclasses.replace(lazy_result, transformation=transformation)
+
+    assert replaced.has_information
+    assert replaced.information is lazy_result.information
+    np.testing.assert_array_equal(replaced.transformation, transformation)
+    assert len(estimator_calls) == 1
+    assert "information=" in repr(replaced)
+    assert "information" in [
+        field.name for field in dataclasses.fields(RegistrationResult)
+    ]
+
+
+def test_lazy_result_can_be_pickled(lazy_result, estimator_calls):
+    restored = pickle.loads(pickle.dumps(lazy_result))
+
+    assert len(estimator_calls) == 1
+    assert restored.has_information
+    assert restored.fitness == lazy_result.fitness
+    np.testing.assert_array_equal(restored.information, np.identity(6))
+
+
+def test_compact_keeps_correspondence_count(lazy_result, estimator_calls):
+    lazy_result.compact(subsample=4)
+
+    assert lazy_result.is_compact
+    assert lazy_result.correspondence_count == 10
+    assert lazy_result.correspondence_set.shape == (4, 2)
+    assert len(estimator_calls) == 1
+
+
+def test_compact_without_subsample(lazy_result):
+    lazy_result.compact()
+
+    assert lazy_result.correspondence_set.shape == (0, 2)
+    assert lazy_result.correspondence_count == 10
+
+
+def test_result_array_round_trip(lazy_result):
+    lazy_result.iterations = 12
+    lazy_result.termination = "stagnation"
+
+    arrays = lazy_result.to_arrays(subsample=3)
+    restored = RegistrationResult.from_arrays(arrays)
+
+    assert restored.fitness == lazy_result.fitness
+    assert restored.inlier_rmse == lazy_result.inlier_rmse
+    assert restored.correspondence_count == 10
+    assert restored.correspondence_set.shape == (3, 2)
+    assert restored.iterations == 12
+    assert restored.termination == "stagnation"
+    np.testing.assert_array_equal(restored.information, np.identity(6))
+    np.testing.assert_array_equal(
+        restored.transformation, lazy_result.transformation
+    )
+
+
+def test_result_from_arrays_with_missing_optional_arrays():
+    restored = RegistrationResult.from_arrays(
+        {
+            "fitness": np.asarray(0.5),
+            "inlier_rmse": np.asarray(0.1),
+            "transformation": np.identity(4),
+            "information": np.identity(6),
+        }
+    )
+
+    assert restored.correspondence_count == 0
+    assert restored.iterations is None
+    assert restored.termination is None
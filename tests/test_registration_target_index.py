@@ -0,0 +1,104 @@
+"""Unit tests for mynds registration target index functionality."""
+
+import numpy as np
+import open3d
+import open3d.pipelines.registration as reg
+
+from mynd.registration import (
+    RegistrationBatch,
+    RegistrationPipeline,
+    RegistrationResult,
+    TargetIndexCache,
+    build_target_index,
+    compute_information_matrix,
+    create_numpy_icp_registrator,
+    register_one_to_many,
+)
+from mynd.utils.result import Ok
+
+
+def _create_cloud(seed: int = 0) -> open3d.geometry.PointCloud:
+    generator = np.random.default_rng(seed)
+    points = generator.uniform(-1.0, 1.0, size=(500, 3))
+    points[:, 2] = 0.2 * np.sin(points[:, 0]) * np.cos(points[:, 1])
+    return open3d.geometry.PointCloud(open3d.utility.Vector3dVector(points))
+
+
+def _estimate_normals(cloud):
+    processed = open3d.geometry.PointCloud(cloud)
+    processed.estimate_normals(
+        open3d.geometry.KDTreeSearchParamHybrid(radius=0.3, max_nn=30)
+    )
+    return processed
+
+
+def _identity_aligner(source, target) -> RegistrationResult:
+    return RegistrationResult(
+        fitness=1.0,
+        inlier_rmse=0.0,
+        correspondence_set=np.empty((0, 2), dtype=int),
+        transformation=np.identity(4),
+        information=np.identity(6),
+    )
+
+
+def test_compute_information_matrix_matches_open3d():
+    source = _create_cloud(seed=1)
+    target = _create_cloud(seed=2)
+
+    transformation = np.identity(4)
+    transformation[:3, 3] = [0.01, -0.02, 0.0]
+
+    expected = reg.get_information_matrix_from_point_clouds(
+        source, target, 0.1, transformation
+    )
+    information = compute_information_matrix(
+        source, build_target_index(target), 0.1, transformation
+    )
+
+    np.testing.assert_allclose(information, expected, rtol=1e-6, atol=1e-6)
+
+
+def test_target_index_cache_reuses_indices():
+    cache = TargetIndexCache()
+    target = _estimate_normals(_create_cloud())
+
+    first = cache.index(target)
+    second = cache.index(target)
+
+    assert first is second
+    assert len(first) == len(target.points)
+    assert first.normals.shape == (len(target.points), 3)
+    assert cache.statistics.misses == 1
+    assert cache.statistics.hits == 1
+
+
+def test_register_one_to_many_builds_target_index_once():
+    indices = TargetIndexCache()
+    pipeline = RegistrationPipeline(
+        RegistrationPipeline.AlignerModule(
+            preprocessor=lambda cloud: cloud,
+            registrator=_identity_aligner,
+        ),
+        [
+            RegistrationPipeline.RefinerModule(
+                preprocessor=_estimate_normals,
+                registrator=create_numpy_icp_registrator(
+                    distance_threshold=0.1, indices=indices
+                ),
+                parameters="normals",
+            )
+        ],
+    )
+
+    batch = RegistrationBatch[int](
+        {key: (lambda: Ok(_create_cloud())) for key in range(4)}
+    )
+
+    outcomes = register_one_to_many(batch, pipeline, target=0)
+
+    assert len(outcomes) == 3
+    assert all(outcome.is_ok() for outcome in outcomes)
+    assert [outcome.ok().source for outcome in outcomes] == [1, 2, 3]
+    assert indices.statistics.misses == 1
+    assert indices.statistics.hits == 2
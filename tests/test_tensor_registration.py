@@ -0,0 +1,109 @@
+"""Unit tests for mynds tensor registration backend."""
+
+import numpy as np
+import open3d
+import pytest
+
+from mynd.geometry import TensorPointCloud
+from mynd.registration import (
+    LegacyConversionCache,
+    RegistrationPipeline,
+    RegistrationResult,
+    apply_registration_pipeline,
+)
+from mynd.registration.pipeline_builder import (
+    build_point_cloud_processor,
+    build_tensor_multi_scale_icp_registrator,
+    build_tensor_regular_icp_registrator,
+)
+from mynd.registration.tensor_registrators import create_tensor_aligner
+
+
+def _create_surface(offset: np.ndarray) -> open3d.geometry.PointCloud:
+    generator = np.random.default_rng(0)
+    points = generator.uniform(0.0, 4.0, size=(20000, 3))
+    points[:, 2] = np.sin(points[:, 0]) + np.cos(points[:, 1])
+    return open3d.geometry.PointCloud(
+        open3d.utility.Vector3dVector(points + offset)
+    )
+
+
+def _identity_aligner(source, target) -> RegistrationResult:
+    return RegistrationResult(
+        fitness=0.0,
+        inlier_rmse=0.0,
+        correspondence_set=np.empty((0, 2), dtype=int),
+        transformation=np.identity(4),
+        information=np.identity(6),
+    )
+
+
+@pytest.mark.parametrize(
+    "builder, parameters",
+    [
+        (
+            build_tensor_regular_icp_registrator,
+            {"distance_threshold": 0.2},
+        ),
+        (
+            build_tensor_multi_scale_icp_registrator,
+            {"voxel_sizes": [0.1, 0.05], "distance_thresholds": [0.2, 0.1]},
+        ),
+    ],
+)
+def test_tensor_refiner_recovers_translation(builder, parameters):
+    preprocessor = build_point_cloud_processor(
+        {"estimate_normals": {"radius": 0.2, "neighbours": 30}}
+    )
+    pipeline = RegistrationPipeline(
+        initializer=RegistrationPipeline.AlignerModule(
+            preprocessor, _identity_aligner
+        ),
+        incrementors=[
+            RegistrationPipeline.RefinerModule(
+                preprocessor, builder(parameters)
+            )
+        ],
+        backend="tensor",
+    )
+
+    stages = list()
+    result = apply_registration_pipeline(
+        pipeline,
+        source=_create_surface(np.array([0.05, -0.03, 0.0])),
+        target=_create_surface(np.zeros(3)),
+        callback=lambda source, target, result: stages.append(source),
+    )
+
+    assert all(isinstance(cloud, TensorPointCloud) for cloud in stages)
+    np.testing.assert_allclose(
+        result.transformation[:3, 3], [-0.05, 0.03, 0.0], atol=5e-3
+    )
+    assert result.information.shape == (6, 6)
+    assert result.correspondence_set.shape[1] == 2
+
+
+def test_tensor_aligner_converts_each_cloud_once():
+    target = TensorPointCloud.from_legacy(_create_surface(np.zeros(3)))
+    sources = [
+        TensorPointCloud.from_legacy(_create_surface(np.full(3, offset)))
+        for offset in (0.1, 0.2)
+    ]
+
+    received = list()
+
+    def record_aligner(source, target) -> RegistrationResult:
+        received.append(target)
+        return _identity_aligner(source, target)
+
+    conversions = LegacyConversionCache()
+    aligner = create_tensor_aligner(record_aligner, conversions)
+    for source in sources:
+        aligner(source, target)
+
+    assert received[0] is received[1]
+    assert conversions.statistics.misses == 3
+    assert conversions.statistics.hits == 1
+
+    del sources, source
+    assert len(conversions) == 1
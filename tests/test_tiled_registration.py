@@ -0,0 +1,116 @@
+"""Unit tests for mynds tiled registration functionality."""
+
+import numpy as np
+import open3d
+import pytest
+
+from mynd.io import read_point_cloud_vertices
+from mynd.registration import (
+    RegistrationPipeline,
+    RegistrationResult,
+    read_tiled_point_cloud,
+    register_tiled,
+    tile_point_cloud,
+)
+
+
+POINT_COUNT: int = 5000
+
+
+def _create_cloud() -> open3d.geometry.PointCloud:
+    generator = np.random.default_rng(0)
+    points = generator.uniform(0.0, 10.0, size=(POINT_COUNT, 3))
+    points[:, 2] *= 0.1
+
+    cloud = open3d.geometry.PointCloud(open3d.utility.Vector3dVector(points))
+    cloud.colors = open3d.utility.Vector3dVector(
+        generator.uniform(0.0, 1.0, size=(POINT_COUNT, 3))
+    )
+    return cloud
+
+
+@pytest.fixture
+def vertices(tmp_path):
+    path = tmp_path / "cloud.ply"
+    open3d.io.write_point_cloud(str(path), _create_cloud(), write_ascii=False)
+    return read_point_cloud_vertices(path).unwrap()
+
+
+def test_read_point_cloud_vertices(vertices):
+    assert len(vertices) == POINT_COUNT
+    assert {"x", "y", "z", "red", "green", "blue"}.issubset(
+        vertices.dtype.names
+    )
+
+    points = np.asarray(_create_cloud().points)
+    np.testing.assert_allclose(vertices["x"], points[:, 0], rtol=1e-6)
+
+
+def test_read_point_cloud_vertices_rejects_ascii(tmp_path):
+    path = tmp_path / "cloud.ply"
+    open3d.io.write_point_cloud(str(path), _create_cloud(), write_ascii=True)
+
+    assert read_point_cloud_vertices(path).is_err()
+
+
+def test_tile_point_cloud(vertices, tmp_path):
+    tiled = tile_point_cloud(
+        vertices, tmp_path / "tiles", tile_size=4.0, spacing=1.0, chunk_size=999
+    )
+
+    assert len(tiled.tiles) == 9
+    assert sum(tile.count for tile in tiled.tiles.values()) == POINT_COUNT
+
+    restored = read_tiled_point_cloud(tmp_path / "tiles").unwrap()
+    assert restored.tiles.keys() == tiled.tiles.keys()
+    assert restored.dtype == tiled.dtype
+
+    tile = restored.load_tile((0, 0))
+    assert len(tile.points) == tiled.tiles.get((0, 0)).count
+    assert tile.has_colors()
+
+    region = restored.load_region(np.array([3, 3, -1]), np.array([5, 5, 2]))
+    points = np.asarray(region.points)
+    assert len(points) > 0
+    assert np.all((points[:, :2] >= 3) & (points[:, :2] <= 5))
+
+    assert len(restored.load_downsample().points) < POINT_COUNT
+
+
+def _create_result(transformation: np.ndarray) -> RegistrationResult:
+    return RegistrationResult(
+        fitness=1.0,
+        inlier_rmse=0.0,
+        correspondence_set=np.zeros((10, 2), dtype=int),
+        transformation=transformation,
+        information=np.identity(6),
+    )
+
+
+def test_register_tiled_fuses_tile_results(vertices, tmp_path):
+    tiled = tile_point_cloud(
+        vertices, tmp_path / "tiles", tile_size=4.0, spacing=1.0
+    )
+
+    refined = np.identity(4)
+    refined[:3, 3] = [0.1, -0.2, 0.05]
+
+    calls = list()
+
+    def refiner(source, target, transformation):
+        calls.append(len(source.points))
+        return _create_result(refined)
+
+    pipeline = RegistrationPipeline(
+        RegistrationPipeline.AlignerModule(
+            lambda cloud: cloud,
+            lambda source, target: _create_result(np.identity(4)),
+        ),
+        [RegistrationPipeline.RefinerModule(lambda cloud: cloud, refiner)],
+    )
+
+    result = register_tiled(pipeline, tiled, tiled, margin=0.5)
+
+    assert len(calls) == len(tiled.tiles)
+    assert result.correspondence_count == 10 * len(tiled.tiles)
+    np.testing.assert_allclose(result.transformation, refined, atol=1e-9)
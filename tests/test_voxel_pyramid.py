@@ -0,0 +1,60 @@
+"""Unit tests for mynds voxel pyramids."""
+
+import numpy as np
+import open3d
+import pytest
+
+from mynd.geometry import build_voxel_pyramid
+from mynd.registration import (
+    PyramidCache,
+    build_plan_processors,
+    compile_registration_plan,
+)
+
+
+def _create_cloud() -> open3d.geometry.PointCloud:
+    points: np.ndarray = np.random.default_rng(0).random((20000, 3))
+    return open3d.geometry.PointCloud(open3d.utility.Vector3dVector(points))
+
+
+def test_pyramid_levels_are_ordered_by_spacing():
+    pyramid = build_voxel_pyramid(_create_cloud(), [0.2, 0.05, 0.1, 0.05])
+
+    assert pyramid.spacings == [0.05, 0.1, 0.2]
+
+    counts = [len(pyramid.level(spacing).points) for spacing in [0.05, 0.1]]
+    assert counts[0] > counts[1] > len(pyramid.level(0.2).points)
+
+    with pytest.raises(KeyError):
+        pyramid.level(0.3)
+
+
+def test_plan_processors_build_pyramid_once():
+    cache = PyramidCache(spacings=(0.05, 0.1))
+    plan = compile_registration_plan(
+        {
+            "aligner": {
+                "type": "feature_ransac",
+                "preprocessor": {
+                    "downsample": {"spacing": 0.1},
+                    "estimate_normals": {"radius": 0.2, "neighbours": 10},
+                },
+            },
+            "refiner": [
+                {
+                    "type": "regular_icp",
+                    "preprocessor": {"downsample": {"spacing": 0.05}},
+                },
+            ],
+        }
+    )
+    coarse, fine = build_plan_processors(plan, pyramids=cache)
+
+    cloud = _create_cloud()
+    assert coarse(cloud).has_normals()
+    assert coarse(cloud) is coarse(cloud)
+    assert not cache.pyramid(cloud).level(0.1).has_normals()
+    assert len(fine(cloud).points) > len(coarse(cloud).points)
+
+    assert len(cache) == 1
+    assert cache.statistics.misses == 1